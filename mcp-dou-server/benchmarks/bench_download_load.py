@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Teste de carga dos downloads contra o INLABS local.
+
+Sobe o servidor de benchmarks/fake_inlabs.py, aponta o servidor MCP para
+ele (INLABS_BASE_URL) e baixa várias edições concorrentemente com
+download_dou_sections, relatando vazão, falhas e logins. Com
+--session-ttl menor que a duração do teste, exercita a renovação da sessão.
+
+Uso:
+    python benchmarks/bench_download_load.py --days 10 --concurrency 5 --latency 0.05
+    python benchmarks/bench_download_load.py --error-rate 0.05 --max-concurrent 3
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+# Adiciona o diretório raiz ao path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from benchmarks.fake_inlabs import FakeINLABSServer  # noqa: E402
+
+
+async def run(args: argparse.Namespace) -> int:
+    """Executa os downloads e imprime o resultado; retorna o total de falhas."""
+    
+    from src.models.dou_models import DOUSection, FileFormat
+    from src.tools.download import download_dou_sections
+    from src.tools.http_client import close_http_client
+    
+    sections = [DOUSection(section) for section in args.sections]
+    file_format = FileFormat[args.format]
+    
+    # Dias úteis terminando em --end-date
+    days = []
+    current = date.fromisoformat(args.end_date)
+    while len(days) < args.days:
+        if current.weekday() < 5:
+            days.append(current)
+        current -= timedelta(days=1)
+    
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(download_dou_sections(day, sections, file_format, force_download=True) for day in days)
+    )
+    elapsed = time.perf_counter() - start
+    await close_http_client()
+    
+    file_infos = [info for day_results in results for info in day_results]
+    downloaded = [info for info in file_infos if not isinstance(info, Exception) and info.file_path]
+    errors = [info for info in file_infos if isinstance(info, Exception)]
+    total_bytes = sum(info.file_size or 0 for info in downloaded)
+    
+    print(f"Arquivos pedidos: {len(file_infos)} ({len(days)} dias x {len(sections)} seções)")
+    print(f"Baixados: {len(downloaded)} | Falhas: {len(file_infos) - len(downloaded)} (exceções: {len(errors)})")
+    print(f"Tempo total: {elapsed:.2f}s ({len(downloaded) / elapsed:.1f} arquivos/s, "
+          f"{total_bytes / 1024 / 1024 / elapsed:.1f} MB/s)")
+    for error in errors[:5]:
+        print(f"  ❌ {error}")
+    
+    return len(file_infos) - len(downloaded)
+
+
+def main() -> None:
+    """Ponto de entrada do teste de carga."""
+    
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--days", type=int, default=10, help="Dias úteis a baixar")
+    parser.add_argument("--end-date", default="2024-09-20", help="Último dia (AAAA-MM-DD)")
+    parser.add_argument("--sections", nargs="+", default=["DO1", "DO2", "DO3"], help="Seções")
+    parser.add_argument("--format", default="XML", choices=["XML", "PDF"], help="Formato")
+    parser.add_argument("--articles", type=int, default=200, help="Matérias por edição")
+    parser.add_argument("--concurrency", type=int, default=5, help="DOU_MAX_CONCURRENT_DOWNLOADS")
+    parser.add_argument("--latency", type=float, default=0.02, help="Atraso por resposta (s)")
+    parser.add_argument("--bandwidth", type=int, default=0, help="Bytes/s por download (0 = sem limite)")
+    parser.add_argument("--max-concurrent", type=int, default=0, help="Downloads no servidor antes de 429")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probabilidade de rajada de 5xx")
+    parser.add_argument("--error-burst", type=int, default=1, help="Tamanho das rajadas de 5xx")
+    parser.add_argument("--session-ttl", type=float, default=0.0, help="Validade das sessões no servidor (s)")
+    parser.add_argument(
+        "--session-max-age", type=int, default=None,
+        help="INLABS_SESSION_MAX_AGE do cliente (padrão: metade de --session-ttl)"
+    )
+    args = parser.parse_args()
+    
+    server = FakeINLABSServer(
+        articles=args.articles,
+        latency=args.latency,
+        bandwidth=args.bandwidth,
+        max_concurrent=args.max_concurrent,
+        error_rate=args.error_rate,
+        error_burst=args.error_burst,
+        session_ttl=args.session_ttl
+    )
+    
+    with server, tempfile.TemporaryDirectory() as tmp_dir:
+        os.environ["INLABS_BASE_URL"] = server.url
+        os.environ["INLABS_EMAIL"] = "carga@example.com"
+        os.environ["INLABS_PASSWORD"] = "carga"
+        os.environ["DOU_CACHE_DIR"] = str(Path(tmp_dir) / "cache")
+        os.environ["DOU_MAX_CONCURRENT_DOWNLOADS"] = str(args.concurrency)
+        os.environ["DOU_PARSE_WORKERS"] = "1"
+        if args.session_max_age is not None or args.session_ttl:
+            max_age = args.session_max_age if args.session_max_age is not None else int(args.session_ttl / 2)
+            os.environ["INLABS_SESSION_MAX_AGE"] = str(max_age)
+        
+        print(f"INLABS local em {server.url}")
+        failures = asyncio.run(run(args))
+        
+        stats = server.stats
+        print(
+            f"Servidor: {stats['requests']} requisições, {stats['logins']} logins, "
+            f"{stats['downloads']} downloads, pico de {stats['max_in_flight']} simultâneos"
+        )
+        print(
+            f"  429: {stats['throttled']} | 5xx: {stats['errors']} | 404: {stats['not_found']} | "
+            f"sessões expiradas: {stats['expired_sessions']}"
+        )
+    
+    if failures:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
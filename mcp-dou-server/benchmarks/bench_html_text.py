@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark da conversão HTML -> texto do conteúdo dos artigos.
+
+Verifica a paridade entre html_to_text e a implementação de referência
+com BeautifulSoup na edição sintética (os casos fixos ficam em
+tests/test_text.py) e mede a vazão do parsing em artigos/s com cada uma delas.
+
+Uso:
+    python benchmarks/bench_html_text.py --articles 2000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+# Adiciona o diretório raiz ao path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from benchmarks.synthetic import generate_edition  # noqa: E402
+
+
+def check_parity(texts) -> int:
+    """Compara as duas implementações e retorna o número de divergências."""
+    
+    from src.tools.text import html_to_text, html_to_text_reference
+    
+    mismatches = 0
+    for html_text in texts:
+        fast = html_to_text(html_text)
+        reference = html_to_text_reference(html_text)
+        if fast != reference:
+            mismatches += 1
+            print(f"DIVERGÊNCIA: {html_text[:80]!r}\n  rápido:     {fast[:80]!r}\n  referência: {reference[:80]!r}")
+    return mismatches
+
+
+def time_parse(members, converter) -> float:
+    """Mede o tempo de parse_xml de todos os membros com o conversor indicado."""
+    
+    from src.tools import parser as parser_module
+    
+    original = parser_module.html_to_text
+    parser_module.html_to_text = converter
+    try:
+        xml_parser = parser_module.DOUXMLParser()
+        start = time.perf_counter()
+        for xml_content in members:
+            xml_parser.parse_xml(xml_content)
+        return time.perf_counter() - start
+    finally:
+        parser_module.html_to_text = original
+
+
+def main() -> None:
+    """Ponto de entrada do benchmark."""
+    
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--articles", type=int, default=2000, help="Matérias na edição sintética")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetições (usa o melhor tempo)")
+    args = parser.parse_args()
+    
+    from lxml import etree
+    from src.tools.text import html_to_text, html_to_text_reference
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        zip_path = generate_edition(Path(tmp_dir) / "2024-09-17-DO3.zip", articles=args.articles)
+        with zipfile.ZipFile(zip_path) as zip_file:
+            members = [zip_file.read(name).decode("utf-8") for name in zip_file.namelist()]
+    
+    textos = [
+        etree.fromstring(xml_content.encode("utf-8")).findtext(".//Texto") or ""
+        for xml_content in members
+    ]
+    
+    mismatches = check_parity(textos)
+    print(f"Paridade: {len(textos)} textos, {mismatches} divergências")
+    if mismatches:
+        raise SystemExit(1)
+    
+    results = {}
+    for label, converter in (("BeautifulSoup", html_to_text_reference), ("rápido", html_to_text)):
+        best = min(time_parse(members, converter) for _ in range(args.repeat))
+        results[label] = best
+        print(f"{label:>13}: {best * 1000:9.1f} ms  ({len(members) / best:,.0f} artigos/s)")
+    
+    print(f"      speedup: {results['BeautifulSoup'] / results['rápido']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark do parsing paralelo de edições do DOU.
+
+Gera uma edição sintética grande e compara DOUXMLParser.parse_zip_file
+processando no próprio processo e no pool de processos.
+
+Uso:
+    python benchmarks/bench_parse_parallel.py --articles 5000 --workers 4
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Adiciona o diretório raiz ao path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from benchmarks.synthetic import generate_edition  # noqa: E402
+
+
+async def run(articles: int, repeat: int) -> None:
+    """Executa o benchmark e imprime os tempos."""
+    
+    from src.tools.parser import DOUXMLParser, get_parse_pool, get_parse_worker_count
+    
+    parser = DOUXMLParser()
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        zip_path = generate_edition(Path(tmp_dir) / "2024-09-17-DO3.zip", articles=articles)
+        size_mb = zip_path.stat().st_size / 1024 / 1024
+        print(f"Edição sintética: {articles} matérias, {size_mb:.1f} MB")
+        print(f"Processos no pool: {get_parse_worker_count()} (CPUs: {os.cpu_count()})")
+        
+        # Aquece o pool para não medir a criação dos processos
+        get_parse_pool()
+        await parser.parse_zip_file(str(zip_path), use_cache=False, parallel=True)
+        
+        timings = {}
+        results = {}
+        for label, parallel in (("serial", False), ("paralelo", True)):
+            best = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                result = await parser.parse_zip_file(
+                    str(zip_path), use_cache=False, parallel=parallel
+                )
+                best = min(best, time.perf_counter() - start)
+            timings[label] = best
+            results[label] = result
+            print(
+                f"{label:>9}: {best * 1000:9.1f} ms  "
+                f"({len(result) / best:,.0f} artigos/s, {len(result)} artigos)"
+            )
+        
+        # O pool deve produzir os mesmos artigos, na mesma ordem
+        serial_ids = [a.metadata.id for a in results["serial"]]
+        parallel_ids = [a.metadata.id for a in results["paralelo"]]
+        if serial_ids != parallel_ids:
+            raise SystemExit("ERRO: ordem dos artigos difere entre serial e paralelo")
+        
+        print(f"  speedup: {timings['serial'] / timings['paralelo']:.2f}x (ordem idêntica)")
+
+
+def main() -> None:
+    """Ponto de entrada do benchmark."""
+    
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--articles", type=int, default=5000, help="Matérias na edição sintética")
+    parser.add_argument("--workers", type=int, default=0, help="Processos do pool (0 = CPUs)")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetições (usa o melhor tempo)")
+    args = parser.parse_args()
+    
+    os.environ["DOU_PARSE_WORKERS"] = str(args.workers)
+    asyncio.run(run(args.articles, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
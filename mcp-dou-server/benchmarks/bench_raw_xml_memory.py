@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark de memória do parsing com e sem retenção do XML original.
+
+Mede o pico de memória (tracemalloc) de parse_zip_file numa edição
+sintética com retain_raw_xml desligado e ligado, e confere que o XML
+pode ser relido do ZIP sob demanda.
+
+Uso:
+    python benchmarks/bench_raw_xml_memory.py --articles 3000
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import tracemalloc
+import zipfile
+from pathlib import Path
+
+# Adiciona o diretório raiz ao path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from benchmarks.synthetic import generate_edition  # noqa: E402
+
+
+async def measure(zip_path: Path, retain_raw_xml: bool):
+    """Executa o parsing e retorna (artigos, pico de memória em bytes)."""
+    
+    from src.tools import parser as parser_module
+    
+    # parse_zip_members usa um parser próprio do módulo
+    parser_module._member_parser = parser_module.DOUXMLParser()
+    parser_module._member_parser.retain_raw_xml = retain_raw_xml
+    
+    tracemalloc.start()
+    articles = await parser_module.DOUXMLParser().parse_zip_file(
+        str(zip_path), use_cache=False, parallel=False
+    )
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return articles, peak
+
+
+async def run(articles: int) -> None:
+    """Executa o benchmark e imprime os resultados."""
+    
+    from src.tools.parser import DOUXMLParser
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        zip_path = generate_edition(Path(tmp_dir) / "2024-09-17-DO3.zip", articles=articles)
+        
+        peaks = {}
+        for label, retain in (("sob demanda", False), ("retido", True)):
+            result, peak = await measure(zip_path, retain)
+            peaks[label] = peak
+            print(f"{label:>12}: pico de {peak / 1024 / 1024:7.1f} MB ({len(result)} artigos)")
+        
+        # O XML relido do ZIP deve ser o conteúdo original do membro
+        article = result[len(result) // 2]
+        article.raw_xml = None
+        with zipfile.ZipFile(zip_path) as zip_file:
+            expected = zip_file.read(article.source_member).decode("utf-8")
+        if DOUXMLParser().load_raw_xml(article) != expected:
+            raise SystemExit("ERRO: XML carregado sob demanda difere do original")
+        
+        print(f"    redução: {1 - peaks['sob demanda'] / peaks['retido']:.0%} (XML sob demanda conferido)")
+
+
+def main() -> None:
+    """Ponto de entrada do benchmark."""
+    
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--articles", type=int, default=3000, help="Matérias na edição sintética")
+    args = parser.parse_args()
+    
+    asyncio.run(run(args.articles))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Tempo de inicialização do servidor MCP no transporte STDIO.
+
+Inicia `python -m src.server` como um cliente MCP faria e mede, a partir
+do início do processo, quanto tempo leva até a resposta do initialize e
+até a resposta do primeiro tools/list, que é quando o assistente passa a
+enxergar as ferramentas. Mede também o tempo de importar src.server.
+
+Uso:
+    python benchmarks/bench_startup.py --runs 10
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, IO, List, Optional
+
+# Adiciona o diretório raiz ao path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+# Versão do protocolo anunciada no initialize
+PROTOCOL_VERSION = "2025-06-18"
+
+
+def _send(stream: IO[bytes], message: Dict[str, Any]) -> None:
+    """Envia uma mensagem JSON-RPC (uma por linha, como no STDIO do MCP)."""
+    
+    stream.write(json.dumps(message).encode("utf-8") + b"\n")
+    stream.flush()
+
+
+def _receive(stream: IO[bytes], request_id: int) -> Dict[str, Any]:
+    """Lê mensagens até a resposta de request_id."""
+    
+    while True:
+        line = stream.readline()
+        if not line:
+            raise RuntimeError("O servidor encerrou antes de responder")
+        message = json.loads(line)
+        if message.get("id") == request_id:
+            if "error" in message:
+                raise RuntimeError(f"Erro do servidor: {message['error']}")
+            return message
+
+
+def measure_startup(env: Optional[Dict[str, str]] = None) -> Dict[str, float]:
+    """
+    Inicia o servidor uma vez e mede o handshake.
+    
+    Args:
+        env: Ambiente do processo (padrão: o atual)
+    
+    Returns:
+        Dict[str, float]: Segundos até o initialize, até o tools/list e
+        número de ferramentas listadas
+    """
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "src.server", "--transport", "stdio"],
+        cwd=ROOT_DIR,
+        env=env,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL
+    )
+    
+    try:
+        _send(process.stdin, {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "initialize",
+            "params": {
+                "protocolVersion": PROTOCOL_VERSION,
+                "capabilities": {},
+                "clientInfo": {"name": "bench-startup", "version": "1.0"},
+            },
+        })
+        _receive(process.stdout, 1)
+        initialize = time.perf_counter() - start
+        
+        _send(process.stdin, {"jsonrpc": "2.0", "method": "notifications/initialized"})
+        _send(process.stdin, {"jsonrpc": "2.0", "id": 2, "method": "tools/list"})
+        tools = _receive(process.stdout, 2)["result"]["tools"]
+        tools_list = time.perf_counter() - start
+    finally:
+        process.stdin.close()
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+    
+    return {"initialize": initialize, "tools_list": tools_list, "tools": len(tools)}
+
+
+def measure_import(env: Optional[Dict[str, str]] = None) -> float:
+    """
+    Mede o tempo de `import src.server` num interpretador novo.
+    
+    Args:
+        env: Ambiente do processo (padrão: o atual)
+    
+    Returns:
+        float: Segundos gastos no import
+    """
+    code = "import time; s = time.perf_counter(); import src.server; print(time.perf_counter() - s)"
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT_DIR, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def _describe(name: str, timings: List[float]) -> str:
+    """Linha de resumo de uma medida."""
+    
+    return (
+        f"{name:<12} mediana {statistics.median(timings) * 1000:8.1f} ms  "
+        f"(mín {min(timings) * 1000:.1f}, máx {max(timings) * 1000:.1f})"
+    )
+
+
+def main() -> None:
+    """Ponto de entrada do benchmark de inicialização."""
+    
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10, help="Inicializações medidas")
+    parser.add_argument("--warmup", type=int, default=1, help="Inicializações descartadas (bytecode, cache do SO)")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        env = dict(os.environ, DOU_CACHE_DIR=str(Path(tmp_dir) / "cache"))
+        
+        for _ in range(args.warmup):
+            measure_startup(env)
+        
+        imports = [measure_import(env) for _ in range(args.runs)]
+        runs = [measure_startup(env) for _ in range(args.runs)]
+    
+    print(f"Ferramentas listadas: {runs[0]['tools']}")
+    print(_describe("import", imports))
+    print(_describe("initialize", [run["initialize"] for run in runs]))
+    print(_describe("tools/list", [run["tools_list"] for run in runs]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,504 @@
+#!/usr/bin/env python3
+"""
+Servidor INLABS local para testes de carga e de falhas.
+
+Imita os endpoints usados pelo servidor MCP: o login (POST /logar.php, que
+emite o cookie inlabs_session_cookie) e o download
+(GET/HEAD /index.php?p=AAAA-MM-DD&dl=ARQUIVO), servindo edições ZIP
+sintéticas e PDFs gerados sob demanda, com suporte a Range,
+If-Range (ETag ou Last-Modified) e If-Modified-Since. Latência, limite de banda, respostas 429 por excesso de
+downloads simultâneos, rajadas de 5xx e expiração de sessão são
+configuráveis.
+
+Para apontar o servidor MCP para ele:
+    
+    python benchmarks/fake_inlabs.py --port 8080 --latency 0.05 --session-ttl 60
+    INLABS_BASE_URL=http://127.0.0.1:8080 python -m src.server
+"""
+
+import argparse
+import email.utils
+import random
+import secrets
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from datetime import date, datetime, time as dt_time, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+# Adiciona o diretório raiz ao path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from benchmarks.synthetic import generate_edition  # noqa: E402
+
+
+COOKIE_NAME = "inlabs_session_cookie"
+
+DEFAULT_SECTIONS = ("DO1", "DO2", "DO3")
+
+
+class FakeINLABSServer:
+    """
+    Servidor HTTP (stdlib) que se comporta como o INLABS.
+    
+    Os arquivos são gerados na primeira requisição e mantidos num diretório
+    temporário; o conteúdo de cada edição é determinístico (semente derivada
+    da data e da seção).
+    """
+    
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        email: Optional[str] = None,
+        password: Optional[str] = None,
+        sections: Sequence[str] = DEFAULT_SECTIONS,
+        include_weekends: bool = False,
+        articles: int = 200,
+        pdf_size: int = 256 * 1024,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        bandwidth: int = 0,
+        max_concurrent: int = 0,
+        retry_after: int = 1,
+        error_rate: float = 0.0,
+        error_burst: int = 1,
+        error_status: int = 503,
+        session_ttl: float = 0.0,
+        seed: int = 42
+    ):
+        """
+        Configura o servidor (que só começa a atender em start()).
+        
+        Args:
+            host: Endereço de escuta
+            port: Porta (0 = escolhida pelo sistema)
+            email: Email aceito no login (None = qualquer)
+            password: Senha aceita no login (None = qualquer)
+            sections: Seções publicadas (as demais respondem 404)
+            include_weekends: Se há edições em sábados e domingos
+            articles: Matérias por edição ZIP
+            pdf_size: Tamanho aproximado dos PDFs em bytes
+            latency: Atraso (s) antes de cada resposta
+            jitter: Variação aleatória (s) somada à latência
+            bandwidth: Limite de envio por download em bytes/s (0 = sem limite)
+            max_concurrent: Downloads simultâneos antes de responder 429 (0 = sem limite)
+            retry_after: Valor do cabeçalho Retry-After das respostas 429
+            error_rate: Probabilidade de uma requisição iniciar uma rajada de erros
+            error_burst: Requisições consecutivas que falham em cada rajada
+            error_status: Status HTTP das falhas (5xx)
+            session_ttl: Validade (s) das sessões (0 = não expiram)
+            seed: Semente das falhas aleatórias
+        """
+        self.email = email
+        self.password = password
+        self.sections = {section.upper() for section in sections}
+        self.include_weekends = include_weekends
+        self.articles = articles
+        self.pdf_size = pdf_size
+        self.latency = latency
+        self.jitter = jitter
+        self.bandwidth = bandwidth
+        self.max_concurrent = max_concurrent
+        self.retry_after = retry_after
+        self.error_rate = error_rate
+        self.error_burst = max(1, error_burst)
+        self.error_status = error_status
+        self.session_ttl = session_ttl
+        
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, float] = {}
+        self._files: Dict[str, Path] = {}
+        self._file_locks: Dict[str, threading.Lock] = {}
+        self._burst_remaining = 0
+        self._in_flight = 0
+        self._tmp_dir = tempfile.TemporaryDirectory(prefix="fake_inlabs_")
+        self._thread: Optional[threading.Thread] = None
+        
+        self.stats: Dict[str, int] = {
+            "requests": 0,
+            "logins": 0,
+            "login_failures": 0,
+            "downloads": 0,
+            "heads": 0,
+            "partial": 0,
+            "not_modified": 0,
+            "not_found": 0,
+            "throttled": 0,
+            "errors": 0,
+            "expired_sessions": 0,
+            "bytes_sent": 0,
+            "max_in_flight": 0,
+        }
+        
+        self.httpd = ThreadingHTTPServer((host, port), _make_handler(self))
+        self.httpd.daemon_threads = True
+    
+    @property
+    def url(self) -> str:
+        """Endereço base, para usar em INLABS_BASE_URL."""
+        
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def start(self) -> "FakeINLABSServer":
+        """Começa a atender numa thread em segundo plano."""
+        
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self) -> None:
+        """Encerra o servidor e remove os arquivos gerados."""
+        
+        if self._thread is not None:
+            self.httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.httpd.server_close()
+        self._tmp_dir.cleanup()
+    
+    def __enter__(self) -> "FakeINLABSServer":
+        return self.start()
+    
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+    
+    def count(self, name: str, amount: int = 1) -> None:
+        """Incrementa um contador de estatísticas."""
+        
+        with self._lock:
+            self.stats[name] += amount
+    
+    def expire_sessions(self) -> None:
+        """Invalida todas as sessões abertas (simula expiração no servidor)."""
+        
+        with self._lock:
+            self._sessions.clear()
+    
+    def login(self, email: str, password: str) -> Optional[str]:
+        """Valida as credenciais e abre uma sessão, retornando o token."""
+        
+        if (self.email is not None and email != self.email) or (
+            self.password is not None and password != self.password
+        ):
+            self.count("login_failures")
+            return None
+        
+        token = secrets.token_hex(16)
+        with self._lock:
+            self._sessions[token] = time.monotonic()
+            self.stats["logins"] += 1
+        return token
+    
+    def session_valid(self, token: Optional[str]) -> bool:
+        """Indica se o token pertence a uma sessão aberta e não expirada."""
+        
+        with self._lock:
+            created = self._sessions.get(token) if token else None
+            if created is None:
+                return False
+            if self.session_ttl and time.monotonic() - created > self.session_ttl:
+                del self._sessions[token]
+                self.stats["expired_sessions"] += 1
+                return False
+            return True
+    
+    def should_fail(self) -> bool:
+        """Sorteia (ou continua) uma rajada de erros 5xx."""
+        
+        with self._lock:
+            if self._burst_remaining:
+                self._burst_remaining -= 1
+                return True
+            if self.error_rate and self._rng.random() < self.error_rate:
+                self._burst_remaining = self.error_burst - 1
+                return True
+            return False
+    
+    def acquire_slot(self) -> bool:
+        """Reserva uma vaga de download; False se o limite foi atingido."""
+        
+        with self._lock:
+            if self.max_concurrent and self._in_flight >= self.max_concurrent:
+                return False
+            self._in_flight += 1
+            self.stats["max_in_flight"] = max(self.stats["max_in_flight"], self._in_flight)
+            return True
+    
+    def release_slot(self) -> None:
+        """Libera uma vaga reservada com acquire_slot()."""
+        
+        with self._lock:
+            self._in_flight -= 1
+    
+    def resolve(self, day: str, filename: str) -> Optional[Tuple[Path, float]]:
+        """
+        Localiza (gerando se preciso) o arquivo pedido.
+        
+        Args:
+            day: Parâmetro p (AAAA-MM-DD)
+            filename: Parâmetro dl, no padrão do INLABS
+        
+        Returns:
+            Optional[Tuple[Path, float]]: Arquivo e data de modificação, ou None (404)
+        """
+        try:
+            pub_date = date.fromisoformat(day)
+        except ValueError:
+            return None
+        
+        if pub_date > date.today() or (pub_date.weekday() >= 5 and not self.include_weekends):
+            return None
+        
+        if filename == f"{day}-{filename[11:-4]}.zip":
+            section = filename[11:-4].upper()
+        elif filename.startswith(f"{pub_date:%Y_%m_%d}_ASSINADO_") and filename.endswith(".pdf"):
+            section = filename[len("AAAA_MM_DD_ASSINADO_"):-4].upper()
+        else:
+            return None
+        
+        if section not in self.sections:
+            return None
+        
+        with self._lock:
+            file_lock = self._file_locks.setdefault(filename, threading.Lock())
+        
+        with file_lock:
+            path = self._files.get(filename)
+            if path is None:
+                path = Path(self._tmp_dir.name) / filename
+                seed = zlib.crc32(filename.encode())
+                if filename.endswith(".zip"):
+                    generate_edition(
+                        path, articles=self.articles, section=section, pub_date=pub_date, seed=seed
+                    )
+                else:
+                    path.write_bytes(_fake_pdf(self.pdf_size, seed))
+                self._files[filename] = path
+        
+        published = datetime.combine(pub_date, dt_time(6, 0), tzinfo=timezone.utc).timestamp()
+        return path, published
+
+
+def _fake_pdf(size: int, seed: int) -> bytes:
+    """Gera bytes com cabeçalho de PDF e o tamanho pedido."""
+    
+    header = b"%PDF-1.4\n% DOU sintetico\n"
+    filler = random.Random(seed).randbytes(max(0, size - len(header) - 6))
+    return header + filler + b"\n%%EOF"
+
+
+def _make_handler(server: FakeINLABSServer):
+    """Cria a classe de handler ligada à instância do servidor."""
+    
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        
+        def log_message(self, format, *args):
+            pass
+        
+        def _delay(self) -> None:
+            delay = server.latency + (server.jitter * server._rng.random() if server.jitter else 0)
+            if delay > 0:
+                time.sleep(delay)
+        
+        def _reply(self, status: int, body: bytes = b"", headers: Optional[Dict[str, str]] = None) -> None:
+            self.send_response(status)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if body and self.command != "HEAD":
+                self.wfile.write(body)
+        
+        def _cookie(self) -> Optional[str]:
+            for part in self.headers.get("Cookie", "").split(";"):
+                name, _, value = part.strip().partition("=")
+                if name == COOKIE_NAME:
+                    return value
+            return None
+        
+        def do_POST(self):
+            server.count("requests")
+            length = int(self.headers.get("Content-Length") or 0)
+            form = parse_qs(self.rfile.read(length).decode("utf-8"))
+            self._delay()
+            
+            if urlsplit(self.path).path != "/logar.php":
+                return self._reply(404)
+            if server.should_fail():
+                server.count("errors")
+                return self._reply(server.error_status)
+            
+            token = server.login(form.get("email", [""])[0], form.get("password", [""])[0])
+            
+            if token is None:
+                # Como o INLABS: devolve a página de login, sem cookie
+                return self._reply(200, b"<html><body>Login ou senha incorretos</body></html>")
+            
+            self._reply(302, headers={
+                "Location": "/",
+                "Set-Cookie": f"{COOKIE_NAME}={token}; Path=/; HttpOnly",
+            })
+        
+        def do_GET(self):
+            server.count("requests")
+            self._delay()
+            
+            url = urlsplit(self.path)
+            if url.path == "/":
+                return self._reply(200, b"<html><body>INLABS</body></html>")
+            if url.path != "/index.php":
+                return self._reply(404)
+            
+            query = parse_qs(url.query)
+            day, filename = query.get("p", [""])[0], query.get("dl", [""])[0]
+            if not filename:
+                return self._reply(200, b"<html><body>Listagem</body></html>")
+            
+            if not server.session_valid(self._cookie()):
+                # Sessão ausente ou expirada: redireciona para a página de login
+                return self._reply(302, headers={"Location": "/"})
+            
+            if server.should_fail():
+                server.count("errors")
+                return self._reply(server.error_status)
+            
+            resolved = server.resolve(day, filename)
+            if resolved is None:
+                server.count("not_found")
+                return self._reply(404)
+            
+            if self.command == "HEAD":
+                server.count("heads")
+                return self._send_file(*resolved)
+            
+            if not server.acquire_slot():
+                server.count("throttled")
+                return self._reply(429, headers={"Retry-After": str(server.retry_after)})
+            
+            try:
+                server.count("downloads")
+                self._send_file(*resolved)
+            finally:
+                server.release_slot()
+        
+        def do_HEAD(self):
+            self.do_GET()
+        
+        def _send_file(self, path: Path, published: float) -> None:
+            size = path.stat().st_size
+            headers = {
+                "ETag": f'"{int(published)}-{size}"',
+                "Last-Modified": email.utils.formatdate(published, usegmt=True),
+                "Accept-Ranges": "bytes",
+                "Content-Type": "application/zip" if path.suffix == ".zip" else "application/pdf",
+            }
+            
+            since = self.headers.get("If-Modified-Since")
+            if since and self.command == "GET":
+                try:
+                    if email.utils.parsedate_to_datetime(since).timestamp() >= published:
+                        server.count("not_modified")
+                        return self._reply(304, headers=headers)
+                except (TypeError, ValueError):
+                    pass
+            
+            start, status = 0, 200
+            range_header = self.headers.get("Range", "")
+            # If-Range: só atende o Range se o arquivo não mudou desde a primeira parte
+            if_range = self.headers.get("If-Range")
+            if if_range and if_range not in (headers["ETag"], headers["Last-Modified"]):
+                range_header = ""
+            if range_header.startswith("bytes=") and self.command == "GET":
+                start = int(range_header[6:].split("-")[0] or 0)
+                if start >= size:
+                    return self._reply(416, headers={"Content-Range": f"bytes */{size}"})
+                status = 206
+                headers["Content-Range"] = f"bytes {start}-{size - 1}/{size}"
+                server.count("partial")
+            
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(size - start))
+            self.end_headers()
+            if self.command == "HEAD":
+                return
+            
+            chunk_size = 64 * 1024
+            with open(path, "rb") as f:
+                f.seek(start)
+                while chunk := f.read(chunk_size):
+                    try:
+                        self.wfile.write(chunk)
+                    except (BrokenPipeError, ConnectionResetError):
+                        # Cliente desistiu (timeout ou cancelamento)
+                        self.close_connection = True
+                        return
+                    server.count("bytes_sent", len(chunk))
+                    if server.bandwidth:
+                        time.sleep(len(chunk) / server.bandwidth)
+    
+    return Handler
+
+
+def main() -> None:
+    """Ponto de entrada: executa o servidor até Ctrl+C."""
+    
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1", help="Endereço de escuta")
+    parser.add_argument("--port", type=int, default=8080, help="Porta")
+    parser.add_argument("--email", help="Email aceito (padrão: qualquer)")
+    parser.add_argument("--password", help="Senha aceita (padrão: qualquer)")
+    parser.add_argument("--sections", nargs="+", default=list(DEFAULT_SECTIONS), help="Seções publicadas")
+    parser.add_argument("--include-weekends", action="store_true", help="Publica em fins de semana")
+    parser.add_argument("--articles", type=int, default=200, help="Matérias por edição")
+    parser.add_argument("--latency", type=float, default=0.0, help="Atraso por resposta (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Variação aleatória do atraso (s)")
+    parser.add_argument("--bandwidth", type=int, default=0, help="Bytes/s por download (0 = sem limite)")
+    parser.add_argument("--max-concurrent", type=int, default=0, help="Downloads simultâneos antes de 429")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probabilidade de rajada de 5xx")
+    parser.add_argument("--error-burst", type=int, default=1, help="Tamanho das rajadas de 5xx")
+    parser.add_argument("--error-status", type=int, default=503, help="Status das falhas")
+    parser.add_argument("--session-ttl", type=float, default=0.0, help="Validade das sessões (s)")
+    args = parser.parse_args()
+    
+    server = FakeINLABSServer(
+        host=args.host,
+        port=args.port,
+        email=args.email,
+        password=args.password,
+        sections=args.sections,
+        include_weekends=args.include_weekends,
+        articles=args.articles,
+        latency=args.latency,
+        jitter=args.jitter,
+        bandwidth=args.bandwidth,
+        max_concurrent=args.max_concurrent,
+        error_rate=args.error_rate,
+        error_burst=args.error_burst,
+        error_status=args.error_status,
+        session_ttl=args.session_ttl
+    )
+    
+    print(f"INLABS local em {server.url} (INLABS_BASE_URL={server.url})")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print(f"Estatísticas: {server.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Suíte de benchmarks do servidor MCP DOU com resultados em JSON.
+
+Popula um cache temporário com edições sintéticas e mede o parsing
+(DOUXMLParser.parse_zip_file), a localização de arquivos
+(DOUSearchEngine._find_zip_files), a busca (DOUSearchEngine.search_content),
+o download (download_file_from_url contra um servidor HTTP local) e a
+inicialização do servidor até o primeiro tools/list. O JSON
+gerado pode ser comparado com o de outra versão para detectar regressões.
+
+Uso:
+    python benchmarks/run_benchmarks.py --output resultados.json
+    python benchmarks/run_benchmarks.py --compare base.json --fail-on-regression
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, datetime
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+# Adiciona o diretório raiz ao path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from benchmarks.bench_startup import measure_startup  # noqa: E402
+from benchmarks.synthetic import generate_cache  # noqa: E402
+
+
+# Versão do formato do JSON de resultados
+RESULTS_VERSION = 1
+
+START_DATE = date(2024, 9, 16)
+
+SEARCH_QUERIES = {
+    "search_simple": "licitação",
+    "search_phrase": "pregão eletrônico",
+    "search_plan": 'ementa:licitação AND (orgao:saúde OR orgao:educação) NOT tipo:portaria',
+}
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    """Servidor de arquivos sem log de cada requisição."""
+    
+    def log_message(self, format, *args):
+        pass
+
+
+def _summarize(timings: List[float], items: Optional[int] = None) -> Dict[str, Any]:
+    """Resume os tempos (em segundos) de um benchmark."""
+    
+    median = statistics.median(timings)
+    result = {
+        "iterations": len(timings),
+        "min_ms": round(min(timings) * 1000, 3),
+        "median_ms": round(median * 1000, 3),
+        "mean_ms": round(statistics.mean(timings) * 1000, 3),
+        "max_ms": round(max(timings) * 1000, 3),
+    }
+    if items is not None:
+        result["items"] = items
+        result["items_per_s"] = round(items / median, 1) if median else None
+    return result
+
+
+async def _measure(
+    func: Callable[[], Awaitable[Any]],
+    repeat: int,
+    before: Optional[Callable[[], None]] = None
+) -> List[float]:
+    """Executa func repeat vezes e retorna os tempos em segundos."""
+    
+    timings = []
+    for _ in range(repeat):
+        if before is not None:
+            before()
+        start = time.perf_counter()
+        await func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _git_commit() -> Optional[str]:
+    """Commit atual do repositório, se disponível."""
+    
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args: argparse.Namespace, cache_dir: Path) -> Dict[str, Any]:
+    """Gera os dados sintéticos, executa os benchmarks e retorna os resultados."""
+    
+    # Importados depois de configurar o ambiente (a configuração é lida no primeiro get_config)
+    from src.config.settings import get_config
+    from src.tools.cache_manager import get_cache_manager
+    from src.tools.download import download_file_from_url
+    from src.tools.http_client import close_http_client
+    from src.tools.parser import DOUXMLParser, shutdown_parse_pool
+    from src.tools.parse_cache import DOUParseCache
+    from src.tools.search import DOUSearchEngine, DOUSearchResultCache
+    
+    selected = set(args.only or [])
+    
+    def enabled(name: str) -> bool:
+        return not selected or any(name.startswith(prefix) for prefix in selected)
+    
+    start = time.perf_counter()
+    zip_files = generate_cache(
+        cache_dir,
+        START_DATE,
+        days=args.days,
+        sections=args.sections,
+        articles=args.articles,
+        paragraphs=args.paragraphs,
+        sentences=args.sentences,
+        table_ratio=args.table_ratio
+    )
+    total_mb = sum(path.stat().st_size for path in zip_files) / 1024 / 1024
+    print(
+        f"Dados sintéticos: {len(zip_files)} edições x {args.articles} matérias "
+        f"({total_mb:.1f} MB) em {time.perf_counter() - start:.1f}s"
+    )
+    
+    results: Dict[str, Dict[str, Any]] = {}
+    
+    def report(name: str, summary: Dict[str, Any]) -> None:
+        results[name] = summary
+        rate = f"  {summary['items_per_s']:>12,.0f} itens/s" if summary.get("items_per_s") else ""
+        print(f"{name:<24} mediana {summary['median_ms']:>10.2f} ms  (mín {summary['min_ms']:.2f}){rate}")
+    
+    sample_zip = zip_files[0]
+    parser = DOUXMLParser()
+    parse_cache = DOUParseCache()
+    
+    # Parsing de uma edição: XML (sem sidecar) e a partir do sidecar
+    if enabled("parse_zip_file"):
+        articles = await parser.parse_zip_file(str(sample_zip), use_cache=False, parallel=False)
+        timings = await _measure(
+            lambda: parser.parse_zip_file(str(sample_zip), use_cache=False, parallel=False),
+            args.repeat
+        )
+        report("parse_zip_file", _summarize(timings, len(articles)))
+        
+        await parser.parse_zip_file(str(sample_zip))
+        timings = await _measure(lambda: parser.parse_zip_file(str(sample_zip)), args.repeat)
+        report("parse_zip_file_sidecar", _summarize(timings, len(articles)))
+        parse_cache.invalidate(sample_zip)
+    
+    # Manifesto do cache e índice de busca
+    await asyncio.to_thread(get_cache_manager().reconcile)
+    engine = DOUSearchEngine()
+    end_date = max(path.name[:10] for path in zip_files)
+    
+    if enabled("index_build"):
+        start = time.perf_counter()
+        totals = await engine.index.rebuild()
+        report("index_build", _summarize([time.perf_counter() - start], totals["documents"]))
+    else:
+        await engine.index.sync(zip_files)
+    
+    if enabled("find_zip_files"):
+        async def find_files():
+            return await asyncio.to_thread(
+                engine._find_zip_files, START_DATE.isoformat(), end_date, args.sections
+            )
+        found = await find_files()
+        timings = await _measure(find_files, args.repeat * 10)
+        report("find_zip_files", _summarize(timings, len(found)))
+    
+    # Buscas sem cache de resultados (o ambiente define DOU_SEARCH_CACHE_SIZE=0)
+    for name, query in SEARCH_QUERIES.items():
+        if not enabled(name):
+            continue
+        search = partial(engine.search_content, query, None, None, None, max_results=50)
+        _, stats = await search()
+        if stats.get("error"):
+            raise SystemExit(f"ERRO em {name}: {stats['error']}")
+        timings = await _measure(search, args.repeat)
+        report(name, _summarize(timings, stats["matches_found"]))
+    
+    if enabled("search_filters"):
+        search = partial(
+            engine.search_content, "", None, None, None,
+            publication_type="Portaria", organ="Saúde", max_results=50
+        )
+        _, stats = await search()
+        timings = await _measure(search, args.repeat)
+        report("search_filters", _summarize(timings, stats["matches_found"]))
+    
+    if enabled("search_cached"):
+        engine.result_cache = DOUSearchResultCache(16)
+        search = partial(engine.search_content, SEARCH_QUERIES["search_simple"], max_results=50)
+        await search()
+        timings = await _measure(search, args.repeat * 10)
+        report("search_cached", _summarize(timings))
+    
+    # Download de uma edição a partir de um servidor HTTP local
+    if enabled("download"):
+        server = ThreadingHTTPServer(
+            ("127.0.0.1", 0), partial(_QuietHandler, directory=str(sample_zip.parent))
+        )
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        
+        url = f"http://127.0.0.1:{server.server_address[1]}/{sample_zip.name}"
+        target = cache_dir / "download" / sample_zip.name
+        
+        async def download():
+            if not await download_file_from_url(url, target, {}, timeout=60):
+                raise SystemExit(f"ERRO: download de {url} falhou")
+        
+        try:
+            timings = await _measure(
+                download, args.repeat, before=lambda: target.unlink(missing_ok=True)
+            )
+        finally:
+            server.shutdown()
+            server.server_close()
+        
+        summary = _summarize(timings, sample_zip.stat().st_size)
+        summary["mb_per_s"] = round(sample_zip.stat().st_size / 1024 / 1024 / (summary["median_ms"] / 1000), 1)
+        report("download", summary)
+    
+    # Processo novo do servidor até a resposta do primeiro tools/list
+    if enabled("startup"):
+        runs = [measure_startup() for _ in range(args.repeat)]
+        report("startup_tools_list", _summarize([run["tools_list"] for run in runs]))
+    
+    await close_http_client()
+    shutdown_parse_pool()
+    
+    return {
+        "version": RESULTS_VERSION,
+        "server_version": get_config().server_version,
+        "git_commit": _git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "parameters": {
+            "days": args.days,
+            "sections": args.sections,
+            "articles": args.articles,
+            "paragraphs": args.paragraphs,
+            "sentences": args.sentences,
+            "table_ratio": args.table_ratio,
+            "repeat": args.repeat,
+            "files": len(zip_files),
+            "total_mb": round(total_mb, 2),
+        },
+        "results": results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Compara as medianas com as de uma execução anterior.
+    
+    Args:
+        current: Resultados desta execução
+        baseline: Resultados de referência
+        threshold: Aumento relativo tolerado (0.15 = 15%)
+    
+    Returns:
+        List[str]: Benchmarks que ficaram mais lentos que o tolerado
+    """
+    if baseline.get("parameters") != current.get("parameters"):
+        print("⚠️ Parâmetros diferentes da referência; a comparação é apenas indicativa")
+    
+    regressions = []
+    print(f"\nComparação com {baseline.get('git_commit') or 'referência'} ({baseline.get('timestamp')}):")
+    for name, result in current["results"].items():
+        reference = baseline.get("results", {}).get(name)
+        if not reference or not reference.get("median_ms"):
+            continue
+        
+        change = result["median_ms"] / reference["median_ms"] - 1
+        flag = ""
+        if change > threshold:
+            flag = "  ❌ REGRESSÃO"
+            regressions.append(name)
+        elif change < -threshold:
+            flag = "  ✅ melhora"
+        print(
+            f"{name:<24} {reference['median_ms']:>10.2f} -> {result['median_ms']:>10.2f} ms "
+            f"({change:+.1%}){flag}"
+        )
+    
+    return regressions
+
+
+def main() -> None:
+    """Ponto de entrada da suíte de benchmarks."""
+    
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--days", type=int, default=5, help="Dias corridos de edições sintéticas")
+    parser.add_argument("--sections", nargs="+", default=["DO1", "DO2", "DO3"], help="Seções")
+    parser.add_argument("--articles", type=int, default=500, help="Matérias por edição")
+    parser.add_argument("--paragraphs", type=int, default=6, help="Parágrafos por matéria")
+    parser.add_argument("--sentences", type=int, default=2, help="Frases por parágrafo")
+    parser.add_argument("--table-ratio", type=float, default=0.1, help="Fração com tabela HTML")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetições de cada medida")
+    parser.add_argument("--workers", type=int, default=1, help="Processos do pool de parsing (0 = CPUs)")
+    parser.add_argument("--only", nargs="+", help="Executa apenas os benchmarks com estes prefixos")
+    parser.add_argument("--output", help="Arquivo JSON de resultados")
+    parser.add_argument("--compare", help="JSON de uma execução anterior para comparação")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Piora tolerada na comparação")
+    parser.add_argument(
+        "--fail-on-regression", action="store_true", help="Sai com código 1 se houver regressão"
+    )
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_dir = Path(tmp_dir) / "cache"
+        os.environ["DOU_CACHE_DIR"] = str(cache_dir)
+        os.environ["DOU_SEARCH_CACHE_SIZE"] = "0"
+        os.environ["DOU_PARSE_WORKERS"] = str(args.workers)
+        
+        results = asyncio.run(run(args, cache_dir))
+    
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"\nResultados gravados em {args.output}")
+    else:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+    
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        regressions = compare(results, baseline, args.threshold)
+        if regressions and args.fail_on_regression:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""
+Gerador de edições sintéticas do DOU no formato INLABS.
+
+Produz arquivos ZIP com um XML por matéria, seguindo a estrutura dos
+arquivos distribuídos pelo INLABS (elemento article com atributos de
+metadados e body com Identifica, Ementa, Texto etc.), para uso nos
+benchmarks sem depender do servidor real.
+
+Também pode popular um diretório de cache completo (cache/AAAA/MM/...):
+
+    python benchmarks/synthetic.py --cache-dir /tmp/dou --days 5 --articles 500
+"""
+
+import argparse
+import random
+import zipfile
+from datetime import date, timedelta
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+
+ART_TYPES = [
+    "Portaria", "Decreto", "Resolução", "Instrução Normativa", "Aviso de Licitação",
+    "Extrato de Contrato", "Edital", "Despacho", "Ato", "Termo Aditivo",
+]
+
+ORGANS = [
+    "Ministério da Fazenda/Secretaria Especial da Receita Federal do Brasil",
+    "Ministério da Saúde/Agência Nacional de Vigilância Sanitária",
+    "Ministério da Educação/Universidade Federal de Minas Gerais",
+    "Ministério da Gestão e da Inovação em Serviços Públicos",
+    "Presidência da República/Casa Civil",
+    "Ministério da Defesa/Comando do Exército",
+    "Ministério da Justiça e Segurança Pública/Polícia Federal",
+    "Poder Judiciário/Tribunal Regional Federal da 1ª Região",
+]
+
+WORDS = (
+    "licitação pregão eletrônico contratação serviços fornecimento aquisição material "
+    "portaria nomeação exoneração servidor cargo comissão federal receita tributária "
+    "imposto renda pessoa jurídica fiscalização saúde vigilância sanitária registro "
+    "medicamento educação universidade ensino pesquisa bolsa processo administrativo "
+    "prazo vigência valor global dotação orçamentária empenho contrato aditivo "
+    "prorrogação objeto execução unidade gestora art parágrafo inciso alínea disposto "
+    "resolve publicar tornar público homologar resultado julgamento propostas"
+).split()
+
+
+def _sentence(rng: random.Random, min_words: int = 8, max_words: int = 25) -> str:
+    """Gera uma frase aleatória com o vocabulário do DOU."""
+    words = [rng.choice(WORDS) for _ in range(rng.randint(min_words, max_words))]
+    return " ".join(words).capitalize() + "."
+
+
+def _money(cents: int) -> str:
+    """Formata um valor em centavos no padrão brasileiro (1.234,56)."""
+    return f"{cents // 100:,}".replace(",", ".") + f",{cents % 100:02d}"
+
+
+def _table_html(rng: random.Random, rows: int) -> str:
+    """Gera uma tabela HTML como as de extratos e resultados de licitação."""
+    header = "".join(f"<td><p>{word.upper()}</p></td>" for word in ("item", "descrição", "valor"))
+    body = "".join(
+        f"<tr><td><p>{i + 1}</p></td>"
+        f"<td><p>{_sentence(rng, 3, 8)}</p></td>"
+        f"<td><p>R$ {_money(rng.randint(10000, 99999999))}</p></td></tr>"
+        for i in range(rows)
+    )
+    return f'<table class="dou-table"><tbody><tr>{header}</tr>{body}</tbody></table>'
+
+
+def _texto_html(
+    rng: random.Random,
+    paragraphs: int,
+    sentences: int = 2,
+    table_rows: int = 0
+) -> str:
+    """Gera o HTML do elemento Texto de uma matéria."""
+    parts = [
+        f'<p class="identifica">{rng.choice(ART_TYPES).upper()} Nº {rng.randint(1, 9999)}</p>'
+    ]
+    for _ in range(paragraphs):
+        parts.append(
+            '<p class="dou-paragraph">'
+            + " ".join(_sentence(rng) for _ in range(sentences))
+            + "</p>"
+        )
+    if table_rows:
+        parts.append(_table_html(rng, table_rows))
+    parts.append(f'<p class="assina">{rng.choice(WORDS).upper()} {rng.choice(WORDS).upper()}</p>')
+    return "".join(parts)
+
+
+def generate_article_xml(
+    rng: random.Random,
+    article_id: int,
+    section: str,
+    pub_date: date,
+    paragraphs: int = 6,
+    sentences: int = 2,
+    table_rows: int = 0
+) -> str:
+    """
+    Gera o XML de uma matéria no formato INLABS.
+    
+    Args:
+        rng: Gerador de números aleatórios
+        article_id: Identificador da matéria
+        section: Seção (DO1, DO2, DO3...)
+        pub_date: Data de publicação
+        paragraphs: Quantidade de parágrafos do Texto
+        sentences: Frases por parágrafo (controla o tamanho do Texto)
+        table_rows: Linhas de uma tabela HTML no Texto (0 = sem tabela)
+    
+    Returns:
+        str: XML da matéria
+    """
+    art_type = rng.choice(ART_TYPES)
+    organ = rng.choice(ORGANS)
+    number = rng.randint(1, 9999)
+    
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        "<xml><article "
+        f'id="{article_id}" name="{art_type} {number}" idOficio="{article_id + 7000}" '
+        f'pubName="{section}" artType="{art_type}" pubDate="{pub_date:%d/%m/%Y}" '
+        f'artClass="00001:00002:00003" artCategory="{organ}" artSize="12" artNotes="" '
+        f'numberPage="{rng.randint(1, 300)}" '
+        f'pdfPage="http://pesquisa.in.gov.br/imprensa/jsp/visualiza/index.jsp?data={pub_date:%d/%m/%Y}" '
+        f'editionNumber="{rng.randint(100, 250)}" highlightType="" highlightPriority="" '
+        f'highlight="" highlightimage="" highlightimagename="" idMateria="{article_id + 3000000}">'
+        "<body>"
+        f"<Identifica><![CDATA[{art_type.upper()} Nº {number}, DE {pub_date:%d/%m/%Y}]]></Identifica>"
+        "<Data><![CDATA[]]></Data>"
+        f"<Ementa><![CDATA[{_sentence(rng, 10, 30)}]]></Ementa>"
+        "<Titulo><![CDATA[]]></Titulo>"
+        "<SubTitulo><![CDATA[]]></SubTitulo>"
+        f"<Texto><![CDATA[{_texto_html(rng, paragraphs, sentences, table_rows)}]]></Texto>"
+        "</body><Midias/></article></xml>"
+    )
+
+
+def generate_edition(
+    zip_path: Path,
+    articles: int = 1000,
+    section: str = "DO3",
+    pub_date: Optional[date] = None,
+    paragraphs: int = 6,
+    seed: int = 42,
+    sentences: int = 2,
+    table_ratio: float = 0.0
+) -> Path:
+    """
+    Gera um ZIP sintético de uma edição do DOU.
+    
+    Args:
+        zip_path: Caminho do ZIP a criar
+        articles: Quantidade de matérias
+        section: Seção da edição
+        pub_date: Data de publicação (padrão: hoje)
+        paragraphs: Parágrafos por matéria
+        seed: Semente para resultados reprodutíveis
+        sentences: Frases por parágrafo
+        table_ratio: Fração das matérias com tabela HTML (0 a 1)
+    
+    Returns:
+        Path: Caminho do ZIP criado
+    """
+    rng = random.Random(seed)
+    pub_date = pub_date or date.today()
+    zip_path = Path(zip_path)
+    zip_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zip_file:
+        for i in range(articles):
+            article_id = 30000000 + i
+            # O sorteio da tabela só consome o gerador quando habilitado,
+            # preservando as edições geradas com os parâmetros padrão
+            table_rows = rng.randint(3, 12) if table_ratio and rng.random() < table_ratio else 0
+            zip_file.writestr(
+                f"{pub_date:%Y-%m-%d}-{section}-{article_id}.xml",
+                generate_article_xml(
+                    rng, article_id, section, pub_date, paragraphs, sentences, table_rows
+                )
+            )
+    
+    return zip_path
+
+
+def generate_cache(
+    cache_dir: Path,
+    start_date: date,
+    days: int = 1,
+    sections: Sequence[str] = ("DO1", "DO2", "DO3"),
+    articles: int = 500,
+    include_weekends: bool = False,
+    seed: int = 42,
+    **edition_options
+) -> List[Path]:
+    """
+    Popula um diretório de cache com edições sintéticas (cache/AAAA/MM/AAAA-MM-DD-SEÇÃO.zip).
+    
+    Args:
+        cache_dir: Diretório de cache
+        start_date: Primeira data
+        days: Quantidade de dias corridos a partir de start_date
+        sections: Seções geradas para cada dia
+        articles: Matérias por edição
+        include_weekends: Se gera edições aos sábados e domingos
+        seed: Semente base (cada edição usa uma semente derivada)
+        **edition_options: Repassados a generate_edition (paragraphs, sentences, table_ratio)
+    
+    Returns:
+        List[Path]: ZIPs criados, em ordem de data e seção
+    """
+    created = []
+    for offset in range(days):
+        pub_date = start_date + timedelta(days=offset)
+        if not include_weekends and pub_date.weekday() >= 5:
+            continue
+        
+        for index, section in enumerate(sections):
+            zip_path = (
+                Path(cache_dir) / str(pub_date.year) / f"{pub_date.month:02d}"
+                / f"{pub_date:%Y-%m-%d}-{section}.zip"
+            )
+            created.append(generate_edition(
+                zip_path,
+                articles=articles,
+                section=section,
+                pub_date=pub_date,
+                seed=seed + offset * 100 + index,
+                **edition_options
+            ))
+    
+    return created
+
+
+def main() -> None:
+    """Gera edições sintéticas a partir da linha de comando."""
+    
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cache-dir", required=True, help="Diretório de cache a popular")
+    parser.add_argument("--start-date", default="2024-09-16", help="Primeira data (AAAA-MM-DD)")
+    parser.add_argument("--days", type=int, default=5, help="Dias corridos")
+    parser.add_argument("--sections", nargs="+", default=["DO1", "DO2", "DO3"], help="Seções")
+    parser.add_argument("--articles", type=int, default=500, help="Matérias por edição")
+    parser.add_argument("--paragraphs", type=int, default=6, help="Parágrafos por matéria")
+    parser.add_argument("--sentences", type=int, default=2, help="Frases por parágrafo")
+    parser.add_argument("--table-ratio", type=float, default=0.1, help="Fração com tabela HTML")
+    parser.add_argument("--include-weekends", action="store_true", help="Gera sábados e domingos")
+    parser.add_argument("--seed", type=int, default=42, help="Semente")
+    args = parser.parse_args()
+    
+    created = generate_cache(
+        Path(args.cache_dir),
+        date.fromisoformat(args.start_date),
+        days=args.days,
+        sections=args.sections,
+        articles=args.articles,
+        include_weekends=args.include_weekends,
+        seed=args.seed,
+        paragraphs=args.paragraphs,
+        sentences=args.sentences,
+        table_ratio=args.table_ratio
+    )
+    
+    size_mb = sum(path.stat().st_size for path in created) / 1024 / 1024
+    print(f"{len(created)} edições geradas em {args.cache_dir} ({size_mb:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
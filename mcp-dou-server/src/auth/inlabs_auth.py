@@ -5,16 +5,20 @@ Este módulo gerencia a autenticação segura com o sistema INLABS,
 incluindo login, gerenciamento de sessão e renovação de tokens.
 """
 
+import asyncio
 import logging
 import time
 from typing import Dict, Optional
 
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+import httpx
 
 from ..models.dou_models import DOUCredentials, MCPToolResult
 from ..config.settings import get_config
+from ..tools.http_client import get_http_client
+
+
+# Status HTTP que justificam nova tentativa de login
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
 
 
 class INLABSAuthenticationError(Exception):
@@ -31,6 +35,7 @@ class INLABSAuth:
     - Retry automático em caso de falhas
     - Validação de credenciais
     - Cache de sessão
+    - Reuso do cliente HTTP compartilhado (keep-alive)
     """
     
     def __init__(self, credentials: Optional[DOUCredentials] = None):
@@ -38,8 +43,8 @@ class INLABSAuth:
         self.logger = logging.getLogger(__name__)
         
         # URLs do sistema INLABS
-        self.login_url = "https://inlabs.in.gov.br/logar.php"
-        self.base_url = "https://inlabs.in.gov.br"
+        self.base_url = self.config.inlabs_base_url.rstrip("/")
+        self.login_url = f"{self.base_url}/logar.php"
         
         # Credenciais
         if credentials:
@@ -50,40 +55,21 @@ class INLABSAuth:
                 password=self.config.inlabs_password
             )
         
-        # Configuração da sessão HTTP
-        self.session = requests.Session()
-        self._setup_session()
-        
         # Estado da autenticação
         self._authenticated = False
         self._auth_time = 0
         self._session_cookie = None
         
-    def _setup_session(self) -> None:
-        """Configura a sessão HTTP com retry e timeouts."""
+        # Login em andamento, compartilhado entre chamadas concorrentes
+        self._login_task: Optional[asyncio.Task] = None
         
-        # Headers padrão
-        self.session.headers.update({
-            "Content-Type": "application/x-www-form-urlencoded",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-            "User-Agent": "Mozilla/5.0 (compatible; MCP-DOU-Server/1.0)"
-        })
-        
-        # Configuração de retry
-        retry_strategy = Retry(
-            total=self.config.retry_attempts,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
-        )
-        
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
-    
     async def authenticate(self, force_refresh: bool = False) -> bool:
         """
         Realiza autenticação no sistema INLABS.
         
+        Chamadas concorrentes que encontram a sessão expirada aguardam o
+        mesmo login em andamento, em vez de cada uma enviar seu próprio POST.
+        
         Args:
             force_refresh: Força nova autenticação mesmo se já autenticado
             
@@ -99,6 +85,28 @@ class INLABSAuth:
             self.logger.debug("Já autenticado, usando sessão existente")
             return True
         
+        loop = asyncio.get_running_loop()
+        login_task = self._login_task
+        
+        if login_task is None or login_task.done() or login_task.get_loop() is not loop:
+            login_task = loop.create_task(self._login())
+            self._login_task = login_task
+        else:
+            self.logger.debug("Aguardando login INLABS já em andamento")
+        
+        # shield: o cancelamento de um chamador não cancela o login dos demais
+        return await asyncio.shield(login_task)
+    
+    async def _login(self) -> bool:
+        """
+        Executa o login no INLABS e atualiza o estado da sessão.
+        
+        Returns:
+            bool: True se autenticação foi bem-sucedida
+            
+        Raises:
+            INLABSAuthenticationError: Se a autenticação falhar
+        """
         self.logger.info("Iniciando autenticação INLABS")
         
         try:
@@ -109,16 +117,14 @@ class INLABSAuth:
             }
             
             # Realiza login
-            response = self.session.post(
-                self.login_url,
-                data=payload,
-                timeout=self.config.download_timeout
-            )
+            response = await self._post_login(payload)
             
             response.raise_for_status()
             
-            # Verifica se obteve o cookie de sessão
-            session_cookie = self.session.cookies.get('inlabs_session_cookie')
+            # Verifica se obteve o cookie de sessão (inclusive em redirecionamentos)
+            session_cookie = None
+            for step in [*response.history, response]:
+                session_cookie = step.cookies.get('inlabs_session_cookie') or session_cookie
             
             if not session_cookie:
                 self.logger.error("Falha na autenticação: cookie de sessão não encontrado")
@@ -134,7 +140,7 @@ class INLABSAuth:
             self.logger.info("Autenticação INLABS realizada com sucesso")
             return True
             
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             self.logger.error(f"Erro de rede durante autenticação: {e}")
             raise INLABSAuthenticationError(f"Erro de conexão: {e}")
         
@@ -142,13 +148,51 @@ class INLABSAuth:
             self.logger.error(f"Erro inesperado durante autenticação: {e}")
             raise INLABSAuthenticationError(f"Erro de autenticação: {e}")
     
+    async def _post_login(self, payload: Dict[str, str]) -> httpx.Response:
+        """
+        Envia o formulário de login com retry e backoff exponencial.
+        
+        Args:
+            payload: Dados do formulário de login
+            
+        Returns:
+            httpx.Response: Resposta final do login
+        """
+        http_client = get_http_client()
+        attempts = self.config.retry_attempts + 1
+        
+        for attempt in range(attempts):
+            is_last = attempt == attempts - 1
+            
+            try:
+                response = await http_client.request(
+                    "POST",
+                    self.login_url,
+                    data=payload,
+                    follow_redirects=True
+                )
+            except httpx.TransportError as e:
+                if is_last:
+                    raise
+                self.logger.warning(f"Falha de rede no login (tentativa {attempt + 1}): {e}")
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or is_last:
+                    # O cookie é lido da resposta; não deve ficar no cliente compartilhado
+                    http_client.get_client().cookies.clear()
+                    return response
+                self.logger.warning(
+                    f"HTTP {response.status_code} no login (tentativa {attempt + 1})"
+                )
+            
+            await asyncio.sleep(min(2 ** attempt, 30))
+        
+        raise INLABSAuthenticationError("Número máximo de tentativas de login excedido")
+    
     def _needs_refresh(self) -> bool:
         """Verifica se a sessão precisa ser renovada."""
         
-        # Considera que a sessão expira em 4 horas (conservador)
-        session_max_age = 4 * 3600  # 4 horas em segundos
-        
-        return (time.time() - self._auth_time) > session_max_age
+        # Por padrão considera que a sessão expira em 4 horas (conservador)
+        return (time.time() - self._auth_time) > self.config.inlabs_session_max_age
     
     async def test_connection(self) -> MCPToolResult:
         """
@@ -196,21 +240,6 @@ class INLABSAuth:
                 execution_time_ms=execution_time
             )
     
-    def get_authenticated_session(self) -> requests.Session:
-        """
-        Retorna uma sessão HTTP autenticada.
-        
-        Returns:
-            requests.Session: Sessão HTTP configurada e autenticada
-            
-        Raises:
-            INLABSAuthenticationError: Se não estiver autenticado
-        """
-        if not self._authenticated or not self._session_cookie:
-            raise INLABSAuthenticationError("Não autenticado. Execute authenticate() primeiro.")
-        
-        return self.session
-    
     def get_session_headers(self) -> Dict[str, str]:
         """
         Retorna headers HTTP com cookie de sessão.
@@ -243,7 +272,6 @@ class INLABSAuth:
         self._authenticated = False
         self._session_cookie = None
         self._auth_time = 0
-        self.session.cookies.clear()
         self.logger.info("Logout realizado")
 
 
@@ -21,17 +21,54 @@ class Settings(BaseSettings):
     # Credenciais INLABS
     inlabs_email: str = "email@dominio.com"
     inlabs_password: str = "senha_exemplo"
+    inlabs_base_url: str = "https://inlabs.in.gov.br"
+    inlabs_session_max_age: int = 4 * 3600
     
     # Cache
     dou_cache_dir: str = "./cache"
     dou_max_cache_size: int = 1000
+    dou_max_cache_mb: int = 0
     dou_cache_ttl_hours: int = 24
+    dou_cache_revalidate_days: int = 3
+    dou_cache_eviction_interval: int = 300
     
     # Download
     dou_download_timeout: int = 30
+    dou_availability_ttl: int = 3600
+    dou_availability_negative_ttl: int = 30 * 24 * 3600
     dou_max_concurrent_downloads: int = 5
     dou_retry_attempts: int = 3
     
+    # Parsing
+    dou_parse_workers: int = 0
+    dou_parse_parallel_min_members: int = 300
+    dou_retain_raw_xml: bool = False
+    
+    # Busca
+    dou_search_cache_size: int = 128
+    
+    # HTTP
+    dou_http2_enabled: bool = False
+    dou_http_keepalive_expiry: float = 30.0
+    
+    # Métricas
+    dou_metrics_file: Optional[str] = None
+    dou_metrics_interval: int = 60
+    dou_metrics_host: str = "127.0.0.1"
+    dou_metrics_port: int = 0
+    
+    # Tracing
+    dou_trace_enabled: bool = False
+    dou_trace_format: str = "jsonl"
+    dou_trace_dir: Optional[str] = None
+    dou_trace_min_duration_ms: float = 0.0
+    
+    # Prefetch
+    dou_prefetch_enabled: bool = False
+    dou_prefetch_schedule: str = "05:00-10:00=300,10:00-22:00=1800"
+    dou_prefetch_sections: str = "DO1 DO2 DO3 DO1E DO2E DO3E"
+    dou_prefetch_concurrency: int = 2
+    
     # Logging
     log_level: str = "INFO"
     log_file: Optional[str] = None
@@ -39,6 +76,12 @@ class Settings(BaseSettings):
     # Server
     mcp_server_name: str = "dou"
     mcp_server_version: str = "0.1.0"
+    mcp_transport: str = "stdio"
+    mcp_http_host: str = "127.0.0.1"
+    mcp_http_port: int = 8000
+    mcp_http_max_sessions: int = 100
+    mcp_http_max_connections: int = 0
+    dou_max_concurrent_tools: int = 0
     
     class Config:
         env_file = ".env"
@@ -71,31 +114,70 @@ def load_config() -> DOUServerConfig:
     return DOUServerConfig(
         inlabs_email=settings.inlabs_email,
         inlabs_password=settings.inlabs_password,
+        inlabs_base_url=settings.inlabs_base_url.rstrip("/"),
+        inlabs_session_max_age=settings.inlabs_session_max_age,
         cache_dir=str(cache_dir.absolute()),
         max_cache_size=settings.dou_max_cache_size,
+        max_cache_mb=settings.dou_max_cache_mb,
         cache_ttl_hours=settings.dou_cache_ttl_hours,
+        cache_revalidate_days=settings.dou_cache_revalidate_days,
+        cache_eviction_interval=settings.dou_cache_eviction_interval,
         download_timeout=settings.dou_download_timeout,
+        availability_ttl=settings.dou_availability_ttl,
+        availability_negative_ttl=settings.dou_availability_negative_ttl,
         max_concurrent_downloads=settings.dou_max_concurrent_downloads,
         retry_attempts=settings.dou_retry_attempts,
+        parse_workers=settings.dou_parse_workers,
+        parse_parallel_min_members=settings.dou_parse_parallel_min_members,
+        retain_raw_xml=settings.dou_retain_raw_xml,
+        search_cache_size=settings.dou_search_cache_size,
+        http2_enabled=settings.dou_http2_enabled,
+        http_keepalive_expiry=settings.dou_http_keepalive_expiry,
+        metrics_file=settings.dou_metrics_file,
+        metrics_interval=settings.dou_metrics_interval,
+        metrics_host=settings.dou_metrics_host,
+        metrics_port=settings.dou_metrics_port,
+        trace_enabled=settings.dou_trace_enabled,
+        trace_format=settings.dou_trace_format,
+        trace_dir=settings.dou_trace_dir,
+        trace_min_duration_ms=settings.dou_trace_min_duration_ms,
+        prefetch_enabled=settings.dou_prefetch_enabled,
+        prefetch_schedule=settings.dou_prefetch_schedule,
+        prefetch_sections=settings.dou_prefetch_sections,
+        prefetch_concurrency=settings.dou_prefetch_concurrency,
         log_level=settings.log_level,
         log_file=settings.log_file,
         server_name=settings.mcp_server_name,
         server_version=settings.mcp_server_version,
+        transport=settings.mcp_transport,
+        http_host=settings.mcp_http_host,
+        http_port=settings.mcp_http_port,
+        http_max_sessions=settings.mcp_http_max_sessions,
+        http_max_connections=settings.mcp_http_max_connections,
+        max_concurrent_tools=settings.dou_max_concurrent_tools,
     )
 
 
-# Configuração global
-config = load_config()
+# Configuração global (carregada no primeiro uso, e não no import do módulo)
+_config_instance: Optional[DOUServerConfig] = None
 
 
 def get_config() -> DOUServerConfig:
     """
     Obtém a configuração global do servidor.
     
+    Na primeira chamada lê o .env e as variáveis de ambiente e cria os
+    diretórios de cache e de log.
+    
     Returns:
         DOUServerConfig: Configuração do servidor
     """
-    return config
+    global _config_instance
+    
+    if _config_instance is None:
+        _config_instance = load_config()
+    
+    return _config_instance
 
 
 def update_config(**kwargs) -> DOUServerConfig:
@@ -108,8 +190,8 @@ def update_config(**kwargs) -> DOUServerConfig:
     Returns:
         DOUServerConfig: Nova configuração
     """
-    global config
-    current_dict = config.dict()
+    global _config_instance
+    current_dict = get_config().dict()
     current_dict.update(kwargs)
-    config = DOUServerConfig(**current_dict)
-    return config
\ No newline at end of file
+    _config_instance = DOUServerConfig(**current_dict)
+    return _config_instance
\ No newline at end of file
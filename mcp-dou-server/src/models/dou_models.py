@@ -130,7 +130,14 @@ class DOUArticle(BaseModel):
     
     metadata: DOUArticleMetadata
     content: DOUArticleContent
-    raw_xml: Optional[str] = Field(None, description="XML original da matéria")
+    raw_xml: Optional[str] = Field(
+        None, description="XML original da matéria (apenas com retain_raw_xml)"
+    )
+    source_zip: Optional[str] = Field(None, description="Arquivo ZIP de origem")
+    source_member: Optional[str] = Field(None, description="Membro XML de origem no ZIP")
+    search_text: Optional[str] = Field(
+        None, description="Campos textuais normalizados para busca (sem caixa e acentos)"
+    )
     extracted_at: datetime = Field(
         default_factory=datetime.now,
         description="Timestamp da extração"
@@ -178,6 +185,55 @@ class DOUStatistics(BaseModel):
     cache_stats: Dict[str, Any] = Field(..., description="Estatísticas do cache")
 
 
+class BackfillJobStatus(str, Enum):
+    """Estados de um job de backfill."""
+    
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    INTERRUPTED = "interrupted"
+    CANCELLED = "cancelled"
+    FAILED = "failed"
+
+
+class DOUBackfillJob(BaseModel):
+    """Job de download de um intervalo de datas (backfill)."""
+    
+    job_id: str = Field(..., description="Identificador do job")
+    start_date: Date = Field(..., description="Data inicial")
+    end_date: Date = Field(..., description="Data final")
+    sections: List[DOUSection] = Field(..., description="Seções a baixar")
+    file_format: FileFormat = Field(default=FileFormat.XML, description="Formato dos arquivos")
+    include_weekends: bool = Field(default=False, description="Se inclui sábados e domingos")
+    status: BackfillJobStatus = Field(default=BackfillJobStatus.PENDING, description="Estado do job")
+    planned: List[str] = Field(
+        default_factory=list, description="Arquivos planejados (YYYY-MM-DD:SEÇÃO)"
+    )
+    completed: List[str] = Field(default_factory=list, description="Arquivos baixados")
+    missing: List[str] = Field(default_factory=list, description="Arquivos indisponíveis no INLABS")
+    failed: Dict[str, str] = Field(default_factory=dict, description="Arquivos com erro")
+    already_cached: int = Field(default=0, description="Arquivos que já estavam em cache")
+    error: Optional[str] = Field(None, description="Erro que interrompeu o job")
+    created_at: datetime = Field(default_factory=datetime.now, description="Criação do job")
+    updated_at: datetime = Field(default_factory=datetime.now, description="Última atualização")
+
+
+class DOUAvailability(BaseModel):
+    """Resultado da verificação de disponibilidade de um arquivo no INLABS."""
+    
+    date: Date = Field(..., description="Data da publicação")
+    section: DOUSection = Field(..., description="Seção do DOU")
+    file_format: FileFormat = Field(..., description="Formato do arquivo")
+    available: Optional[bool] = Field(
+        None, description="Se o arquivo existe (None quando a resposta foi inconclusiva)"
+    )
+    status_code: Optional[int] = Field(None, description="Status HTTP da verificação")
+    file_size: Optional[int] = Field(None, description="Tamanho informado pelo servidor")
+    checked_at: datetime = Field(default_factory=datetime.now, description="Momento da verificação")
+    expires_at: Optional[datetime] = Field(None, description="Validade do resultado em cache")
+    from_cache: bool = Field(default=False, description="Se o resultado veio do cache")
+
+
 class MCPToolResult(BaseModel):
     """Resultado de uma ferramenta MCP."""
     
@@ -194,23 +250,120 @@ class DOUServerConfig(BaseModel):
     # Credenciais
     inlabs_email: str = Field(..., description="Email INLABS")
     inlabs_password: str = Field(..., description="Senha INLABS")
+    inlabs_base_url: str = Field(
+        default="https://inlabs.in.gov.br", description="Endereço base do INLABS"
+    )
+    inlabs_session_max_age: int = Field(
+        default=4 * 3600, description="Idade (s) a partir da qual a sessão INLABS é renovada"
+    )
     
     # Cache
     cache_dir: str = Field(default="./cache", description="Diretório de cache")
     max_cache_size: int = Field(default=1000, description="Tamanho máximo do cache")
+    max_cache_mb: int = Field(default=0, description="Espaço máximo do cache em MB, incluindo o índice de busca (0 = sem limite)")
     cache_ttl_hours: int = Field(default=24, description="TTL do cache em horas")
+    cache_revalidate_days: int = Field(
+        default=3, description="Só edições dos últimos N dias são revalidadas; as anteriores são imutáveis"
+    )
+    cache_eviction_interval: int = Field(
+        default=300, description="Intervalo da verificação dos limites do cache em segundos"
+    )
     
     # Download
     download_timeout: int = Field(default=30, description="Timeout de download")
+    availability_ttl: int = Field(
+        default=3600, description="Validade (s) de verificações positivas e de datas recentes"
+    )
+    availability_negative_ttl: int = Field(
+        default=30 * 24 * 3600,
+        description="Validade (s) de um 404 para datas passadas"
+    )
     max_concurrent_downloads: int = Field(
         default=5, description="Downloads simultâneos máximos"
     )
     retry_attempts: int = Field(default=3, description="Tentativas de retry")
     
+    # Parsing
+    parse_workers: int = Field(
+        default=0, description="Processos do pool de parsing (0 = número de CPUs)"
+    )
+    parse_parallel_min_members: int = Field(
+        default=300, description="Membros mínimos no ZIP para usar o pool de parsing"
+    )
+    retain_raw_xml: bool = Field(
+        default=False, description="Manter o XML original em memória em cada artigo"
+    )
+    
+    # Busca
+    search_cache_size: int = Field(
+        default=128, description="Buscas mantidas no cache de resultados (0 = desativado)"
+    )
+    
+    # HTTP
+    http2_enabled: bool = Field(default=False, description="Usar HTTP/2 (requer o pacote h2)")
+    http_keepalive_expiry: float = Field(
+        default=30.0, description="Tempo máximo (s) de conexões ociosas no pool"
+    )
+    
+    # Métricas
+    metrics_file: Optional[str] = Field(
+        default=None, description="Arquivo com as métricas no formato Prometheus"
+    )
+    metrics_interval: int = Field(
+        default=60, description="Intervalo (s) de atualização do arquivo de métricas"
+    )
+    metrics_host: str = Field(default="127.0.0.1", description="Endereço do endpoint /metrics")
+    metrics_port: int = Field(
+        default=0, description="Porta do endpoint /metrics do Prometheus (0 = desativado)"
+    )
+    
+    # Tracing
+    trace_enabled: bool = Field(
+        default=False, description="Gravar spans das etapas de download, parsing e busca"
+    )
+    trace_format: str = Field(default="jsonl", description="Formato dos traces: jsonl ou chrome")
+    trace_dir: Optional[str] = Field(
+        default=None, description="Diretório dos traces (padrão: diretório do log)"
+    )
+    trace_min_duration_ms: float = Field(
+        default=0.0, description="Só grava árvores cujo span raiz durou ao menos isso (ms)"
+    )
+    
+    # Pré-carga da edição do dia
+    prefetch_enabled: bool = Field(
+        default=False, description="Baixar e indexar em segundo plano a edição do dia"
+    )
+    prefetch_schedule: str = Field(
+        default="05:00-10:00=300,10:00-22:00=1800",
+        description="Janelas de verificação no formato HH:MM-HH:MM=intervalo_s, separadas por vírgula"
+    )
+    prefetch_sections: str = Field(
+        default="DO1 DO2 DO3 DO1E DO2E DO3E", description="Seções pré-carregadas, separadas por espaço"
+    )
+    prefetch_concurrency: int = Field(
+        default=2, description="Downloads simultâneos da pré-carga"
+    )
+    
     # Logging
     log_level: str = Field(default="INFO", description="Nível de log")
     log_file: Optional[str] = Field(None, description="Arquivo de log")
     
     # Server
     server_name: str = Field(default="dou", description="Nome do servidor MCP")
-    server_version: str = Field(default="0.1.0", description="Versão do servidor")
\ No newline at end of file
+    server_version: str = Field(default="0.1.0", description="Versão do servidor")
+    
+    # Transporte
+    transport: str = Field(
+        default="stdio", description="Transporte MCP: stdio, streamable-http ou sse"
+    )
+    http_host: str = Field(default="127.0.0.1", description="Endereço do servidor HTTP")
+    http_port: int = Field(default=8000, description="Porta do servidor HTTP")
+    http_max_sessions: int = Field(
+        default=100, description="Sessões MCP simultâneas no modo HTTP (0 = sem limite)"
+    )
+    http_max_connections: int = Field(
+        default=0, description="Conexões HTTP simultâneas antes de responder 503 (0 = sem limite)"
+    )
+    max_concurrent_tools: int = Field(
+        default=0, description="Ferramentas executando ao mesmo tempo (0 = sem limite)"
+    )
\ No newline at end of file
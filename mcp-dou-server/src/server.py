@@ -5,16 +5,28 @@ Este servidor permite que assistentes de IA como Claude consultem,
 baixem e analisem publicações do DOU de forma natural e eficiente.
 """
 
+import argparse
 import asyncio
 import logging
 import sys
-from typing import Any, Dict
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 from mcp.server.fastmcp import FastMCP
+from starlette.requests import Request
+from starlette.responses import JSONResponse
 
-from .config.settings import get_config
+from .config.settings import get_config, update_config
+from .tools.backfill import register_backfill_tools, shutdown_backfill_scheduler
+from .tools.cache_manager import get_cache_manager, register_cache_tools, shutdown_cache_manager
 from .tools.download import register_download_tools
+from .tools.http_client import close_http_client
+from .tools.metrics import get_metrics, shutdown_metrics
+from .tools.parser import shutdown_parse_pool
+from .tools.prefetch import register_prefetch_tools, shutdown_prefetcher, start_prefetcher
 from .tools.search import register_search_tools
+from .tools.tracing import shutdown_tracer
 from .tools.parser import register_parser_tools
 from .tools.utils import register_utility_tools
 
@@ -46,6 +58,111 @@ def setup_logging(config) -> None:
     logger.info(f"Servidor MCP DOU iniciado - Versão {config.server_version}")
 
 
+# Transportes aceitos por --transport / MCP_TRANSPORT
+TRANSPORTS = ("stdio", "streamable-http", "sse")
+
+# Usuários dos recursos compartilhados (o servidor HTTP e cada sessão MCP)
+_resource_users = 0
+
+# Sessões MCP abertas
+_active_sessions = 0
+
+# Início do servidor, usado pelo /health
+_started_at = time.time()
+
+
+@asynccontextmanager
+async def shared_resources() -> AsyncIterator[None]:
+    """
+    Mantém os recursos compartilhados do processo enquanto houver usuários.
+    
+    No modo STDIO o único usuário é a sessão; no modo HTTP o lifespan do
+    MCP roda uma vez por sessão, então o servidor HTTP também segura os
+    recursos e eles só são liberados ao encerrar o processo, não ao fechar
+    cada sessão.
+    """
+    global _resource_users
+    
+    _resource_users += 1
+    if _resource_users == 1:
+        # Aplica os limites do cache periodicamente em segundo plano
+        get_cache_manager().start()
+        
+        # Exporta as métricas no formato Prometheus, se configurado
+        get_metrics().start()
+        
+        # Pré-carrega a edição do dia, se habilitado
+        start_prefetcher()
+    
+    try:
+        yield
+    finally:
+        _resource_users -= 1
+        if _resource_users == 0:
+            await _release_shared_resources()
+
+
+async def _release_shared_resources() -> None:
+    """Encerra as tarefas em segundo plano e libera conexões e processos."""
+    
+    # Interrompe a pré-carga (downloads em andamento são retomados depois)
+    await shutdown_prefetcher()
+    
+    # Interrompe a verificação dos limites do cache
+    await shutdown_cache_manager()
+    
+    # Interrompe backfills em andamento (o progresso fica persistido)
+    await shutdown_backfill_scheduler()
+    
+    # Grava as métricas uma última vez e fecha o endpoint
+    await shutdown_metrics()
+    
+    # Fecha as conexões HTTP mantidas em keep-alive
+    await close_http_client()
+    
+    # Encerra os processos de parsing paralelo
+    shutdown_parse_pool()
+    
+    # Fecha o arquivo de traces
+    shutdown_tracer()
+
+
+@asynccontextmanager
+async def server_lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """Gerencia os recursos compartilhados durante cada sessão MCP."""
+    
+    global _active_sessions
+    
+    async with shared_resources():
+        _active_sessions += 1
+        try:
+            yield
+        finally:
+            _active_sessions -= 1
+
+
+def get_health() -> Dict[str, Any]:
+    """
+    Resume o estado do servidor para o endpoint /health.
+    
+    Returns:
+        Dict[str, Any]: Estado, sessões abertas e ferramentas em execução
+    """
+    config = get_config()
+    
+    return {
+        "status": "ok" if _resource_users > 0 else "starting",
+        "server": config.server_name,
+        "version": config.server_version,
+        "transport": config.transport,
+        "uptime_seconds": round(time.time() - _started_at, 1),
+        "active_sessions": _active_sessions,
+        "max_sessions": config.http_max_sessions or None,
+        "tools_running": get_metrics().get_running_tools(),
+        "max_concurrent_tools": config.max_concurrent_tools or None,
+    }
+
+
 def create_server() -> FastMCP:
     """
     Cria e configura o servidor MCP DOU.
@@ -58,14 +175,31 @@ def create_server() -> FastMCP:
     # Configura logging
     setup_logging(config)
     
-    # Cria instância do servidor
-    mcp = FastMCP(config.server_name)
+    # Cria instância do servidor (host, porta e sessões valem para o modo HTTP)
+    mcp = FastMCP(
+        config.server_name,
+        lifespan=server_lifespan,
+        host=config.http_host,
+        port=config.http_port,
+        log_level=config.log_level.upper(),
+        max_sessions=config.http_max_sessions or None
+    )
+    
+    # Verificação de saúde/prontidão para balanceadores e orquestradores
+    @mcp.custom_route("/health", methods=["GET"])
+    async def health(request: Request) -> JSONResponse:
+        health_data = get_health()
+        status_code = 200 if health_data["status"] == "ok" else 503
+        return JSONResponse(health_data, status_code=status_code)
     
     # Registra todas as ferramentas
     register_download_tools(mcp)
     register_search_tools(mcp)
     register_parser_tools(mcp)
     register_utility_tools(mcp)
+    register_backfill_tools(mcp)
+    register_cache_tools(mcp)
+    register_prefetch_tools(mcp)
     
     logger = logging.getLogger(__name__)
     logger.info(f"Servidor '{config.server_name}' criado com sucesso")
@@ -73,13 +207,89 @@ def create_server() -> FastMCP:
     return mcp
 
 
+async def run_http_server(mcp: FastMCP) -> None:
+    """
+    Executa o servidor nos transportes HTTP (streamable HTTP ou SSE).
+    
+    Os recursos compartilhados ficam abertos durante toda a execução, e não
+    por sessão, e são liberados uma única vez quando o uvicorn encerra.
+    
+    Args:
+        mcp: Servidor MCP configurado
+    """
+    import uvicorn
+    
+    config = get_config()
+    logger = logging.getLogger(__name__)
+    
+    if config.transport == "sse":
+        app = mcp.sse_app()
+        endpoint = mcp.settings.sse_path
+    else:
+        app = mcp.streamable_http_app()
+        endpoint = mcp.settings.streamable_http_path
+    
+    uvicorn_config = uvicorn.Config(
+        app,
+        host=config.http_host,
+        port=config.http_port,
+        log_level=config.log_level.lower(),
+        limit_concurrency=config.http_max_connections or None
+    )
+    
+    logger.info(
+        f"Servidor HTTP ({config.transport}) em http://{config.http_host}:{config.http_port}{endpoint}"
+    )
+    
+    async with shared_resources():
+        await uvicorn.Server(uvicorn_config).serve()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Lê as opções de linha de comando (sobrepõem MCP_TRANSPORT e afins).
+    
+    Args:
+        argv: Argumentos (padrão: sys.argv)
+        
+    Returns:
+        argparse.Namespace: Opções informadas
+    """
+    parser = argparse.ArgumentParser(description="Servidor MCP do Diário Oficial da União")
+    parser.add_argument("--transport", choices=TRANSPORTS, help="Transporte MCP (padrão: stdio)")
+    parser.add_argument("--host", help="Endereço do servidor HTTP")
+    parser.add_argument("--port", type=int, help="Porta do servidor HTTP")
+    return parser.parse_args(argv)
+
+
 def main() -> None:
     """Função principal do servidor."""
+    args = parse_args()
+    
+    overrides = {
+        key: value
+        for key, value in (
+            ("transport", args.transport),
+            ("http_host", args.host),
+            ("http_port", args.port),
+        )
+        if value is not None
+    }
+    if overrides:
+        update_config(**overrides)
+    
     try:
         server = create_server()
+        transport = get_config().transport
         
-        # Executa o servidor usando STDIO (padrão para MCP)
-        server.run(transport='stdio')
+        if transport == "stdio":
+            # Um processo por cliente (padrão para MCP)
+            server.run(transport='stdio')
+        elif transport in TRANSPORTS:
+            # Um processo compartilhado por vários clientes
+            asyncio.run(run_http_server(server))
+        else:
+            raise ValueError(f"Transporte desconhecido: {transport} (use {', '.join(TRANSPORTS)})")
         
     except KeyboardInterrupt:
         logger = logging.getLogger(__name__)
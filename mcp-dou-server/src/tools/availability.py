@@ -0,0 +1,243 @@
+"""
+Cache das verificações de disponibilidade de arquivos no INLABS.
+
+Cada verificação (HEAD) é guardada com uma validade que depende do
+resultado: arquivos encontrados e datas recentes expiram rápido, enquanto
+um 404 para uma data passada (fim de semana, feriado, edição extra que não
+houve) praticamente não muda e é mantido por muito mais tempo. As entradas
+são persistidas em cache/.state/availability.json para sobreviver a
+reinicializações do servidor.
+"""
+
+import json
+import logging
+import os
+import threading
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Optional
+
+from ..config.settings import get_config
+from ..models.dou_models import DOUAvailability, DOUSection, FileFormat
+
+
+logger = logging.getLogger(__name__)
+
+# Versão do formato do arquivo persistido
+AVAILABILITY_VERSION = 1
+
+
+def _key(base_date: date, section: DOUSection, file_format: FileFormat) -> str:
+    """Chave de uma verificação (data, seção e formato)."""
+    
+    return f"{base_date.isoformat()}:{section.value}:{file_format.value}"
+
+
+class DOUAvailabilityCache:
+    """Cache com TTL dos resultados de verificação de disponibilidade."""
+    
+    def __init__(self):
+        self.config = get_config()
+        self.path = Path(self.config.cache_dir) / ".state" / "availability.json"
+        self._entries: Dict[str, DOUAvailability] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._hits = 0
+        self._misses = 0
+        self._load()
+    
+    def _load(self) -> None:
+        """Carrega as entradas persistidas que ainda são válidas."""
+        
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Cache de disponibilidade ilegível, ignorando: {e}")
+            return
+        
+        if data.get("version") != AVAILABILITY_VERSION:
+            return
+        
+        now = datetime.now()
+        for item in data.get("entries", []):
+            try:
+                entry = DOUAvailability.model_validate(item)
+            except ValueError:
+                continue
+            if entry.expires_at and entry.expires_at > now:
+                self._entries[_key(entry.date, entry.section, entry.file_format)] = entry
+    
+    def ttl_for(self, base_date: date, available: bool) -> int:
+        """
+        Calcula a validade de um resultado.
+        
+        Args:
+            base_date: Data da publicação verificada
+            available: Se o arquivo foi encontrado
+        
+        Returns:
+            int: Validade em segundos
+        """
+        # Edições extras podem surgir ao longo do dia: só datas passadas ganham o TTL longo
+        if not available and base_date < date.today():
+            return self.config.availability_negative_ttl
+        return self.config.availability_ttl
+    
+    def get(
+        self,
+        base_date: date,
+        section: DOUSection,
+        file_format: FileFormat
+    ) -> Optional[DOUAvailability]:
+        """
+        Obtém um resultado ainda válido do cache.
+        
+        Args:
+            base_date: Data da publicação
+            section: Seção do DOU
+            file_format: Formato do arquivo
+        
+        Returns:
+            Optional[DOUAvailability]: Resultado em cache, ou None se ausente/expirado
+        """
+        key = _key(base_date, section, file_format)
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at and entry.expires_at <= datetime.now():
+                del self._entries[key]
+                self._dirty = True
+                entry = None
+            
+            if entry is None:
+                self._misses += 1
+                return None
+            
+            self._hits += 1
+            return entry.model_copy(update={"from_cache": True})
+    
+    def is_known_missing(
+        self,
+        base_date: date,
+        section: DOUSection,
+        file_format: FileFormat
+    ) -> bool:
+        """Indica se há um 404 ainda válido para o arquivo."""
+        
+        entry = self.get(base_date, section, file_format)
+        return entry is not None and entry.available is False
+    
+    def put(self, result: DOUAvailability) -> DOUAvailability:
+        """
+        Guarda um resultado conclusivo (200 ou 404) no cache.
+        
+        Respostas inconclusivas (erros, outros status HTTP) não são guardadas
+        para que a próxima consulta tente de novo.
+        
+        Args:
+            result: Resultado da verificação
+        
+        Returns:
+            DOUAvailability: O resultado com a validade preenchida
+        """
+        if result.available is None:
+            return result
+        
+        ttl = self.ttl_for(result.date, result.available)
+        result = result.model_copy(
+            update={"expires_at": result.checked_at + timedelta(seconds=ttl), "from_cache": False}
+        )
+        
+        with self._lock:
+            self._entries[_key(result.date, result.section, result.file_format)] = result
+            self._dirty = True
+        
+        return result
+    
+    def record(
+        self,
+        base_date: date,
+        section: DOUSection,
+        file_format: FileFormat,
+        available: bool,
+        file_size: Optional[int] = None
+    ) -> None:
+        """
+        Registra a disponibilidade observada fora de uma verificação HEAD.
+        
+        Args:
+            base_date: Data da publicação
+            section: Seção do DOU
+            file_format: Formato do arquivo
+            available: Se o arquivo existe no INLABS
+            file_size: Tamanho do arquivo, se conhecido
+        """
+        self.put(DOUAvailability(
+            date=base_date,
+            section=section,
+            file_format=file_format,
+            available=available,
+            status_code=200 if available else 404,
+            file_size=file_size
+        ))
+    
+    def save(self) -> None:
+        """Persiste as entradas válidas de forma atômica, se houver mudanças."""
+        
+        now = datetime.now()
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = [
+                entry.model_dump(mode="json", exclude={"from_cache"})
+                for entry in self._entries.values()
+                if entry.expires_at and entry.expires_at > now
+            ]
+            self._dirty = False
+        
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            tmp_path.write_text(
+                json.dumps({"version": AVAILABILITY_VERSION, "entries": entries}),
+                encoding="utf-8"
+            )
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Falha ao salvar cache de disponibilidade: {e}")
+    
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Obtém estatísticas do cache.
+        
+        Returns:
+            Dict[str, int]: Entradas (total e negativas), acertos e falhas
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "missing": sum(1 for e in self._entries.values() if e.available is False),
+                "hits": self._hits,
+                "misses": self._misses,
+            }
+
+
+# Instância global do cache de disponibilidade
+_availability_instance: Optional[DOUAvailabilityCache] = None
+
+
+def get_availability_cache() -> DOUAvailabilityCache:
+    """
+    Obtém a instância global do cache de disponibilidade.
+    
+    Returns:
+        DOUAvailabilityCache: Cache de disponibilidade
+    """
+    global _availability_instance
+    
+    if _availability_instance is None:
+        _availability_instance = DOUAvailabilityCache()
+    
+    return _availability_instance
@@ -0,0 +1,459 @@
+"""
+Ferramentas MCP para download de intervalos de datas (backfill) do DOU.
+
+Este módulo planeja os arquivos ausentes do cache para um intervalo de
+datas, executa os downloads com um pool limitado de workers e persiste o
+progresso de cada job, permitindo retomar um backfill interrompido.
+"""
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from mcp.server.fastmcp import FastMCP
+
+from ..auth.inlabs_auth import get_auth_instance
+from ..config.settings import get_config
+from ..models.dou_models import BackfillJobStatus, DOUBackfillJob, DOUSection, FileFormat
+from .availability import get_availability_cache
+from .download import download_dou_file, get_local_file_path
+from .metrics import instrument
+
+
+logger = logging.getLogger(__name__)
+
+
+def _task_key(base_date: date, section: DOUSection) -> str:
+    """Chave de um arquivo planejado (ex: 2024-09-17:DO1)."""
+    return f"{base_date.isoformat()}:{section.value}"
+
+
+def _parse_task_key(key: str) -> Tuple[date, DOUSection]:
+    """Converte a chave de um arquivo planejado em data e seção."""
+    date_str, section = key.split(":")
+    return date.fromisoformat(date_str), DOUSection(section)
+
+
+class DOUBackfillScheduler:
+    """
+    Planejador e executor de jobs de backfill.
+    
+    Cada job é gravado em cache/.state/jobs/<job_id>.json a cada arquivo
+    concluído; jobs que estavam em execução quando o processo terminou são
+    marcados como interrompidos e podem ser retomados.
+    """
+    
+    def __init__(self, jobs_dir: Optional[Path] = None):
+        self.config = get_config()
+        self.jobs_dir = jobs_dir or Path(self.config.cache_dir) / ".state" / "jobs"
+        self.jobs: Dict[str, DOUBackfillJob] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._shutting_down = False
+        self._load_jobs()
+    
+    def _load_jobs(self) -> None:
+        """Carrega os jobs persistidos."""
+        
+        if not self.jobs_dir.exists():
+            return
+        
+        for job_file in self.jobs_dir.glob("*.json"):
+            try:
+                job = DOUBackfillJob.model_validate_json(job_file.read_text(encoding="utf-8"))
+            except Exception as e:
+                logger.warning(f"Job de backfill inválido {job_file}: {e}")
+                continue
+            
+            # Jobs em execução no processo anterior foram interrompidos
+            if job.status in (BackfillJobStatus.PENDING, BackfillJobStatus.RUNNING):
+                job.status = BackfillJobStatus.INTERRUPTED
+            
+            self.jobs[job.job_id] = job
+    
+    def _save_job(self, job: DOUBackfillJob) -> None:
+        """Persiste o estado de um job de forma atômica."""
+        
+        job.updated_at = datetime.now()
+        self.jobs_dir.mkdir(parents=True, exist_ok=True)
+        
+        job_path = self.jobs_dir / f"{job.job_id}.json"
+        tmp_path = job_path.with_name(job_path.name + ".tmp")
+        tmp_path.write_text(job.model_dump_json(indent=2), encoding="utf-8")
+        os.replace(tmp_path, job_path)
+    
+    def plan(
+        self,
+        start_date: date,
+        end_date: date,
+        sections: List[DOUSection],
+        file_format: FileFormat,
+        include_weekends: bool = False
+    ) -> Tuple[List[str], int]:
+        """
+        Planeja os arquivos do intervalo que ainda não estão no cache.
+        
+        Args:
+            start_date: Data inicial
+            end_date: Data final
+            sections: Seções desejadas
+            file_format: Formato dos arquivos
+            include_weekends: Se inclui sábados e domingos
+        
+        Returns:
+            Tuple[List[str], int]: Arquivos a baixar e quantidade já em cache
+        """
+        planned = []
+        already_cached = 0
+        
+        current = start_date
+        while current <= end_date:
+            if include_weekends or current.weekday() < 5:
+                for section in sections:
+                    local_path = get_local_file_path(
+                        current, section, file_format, self.config.cache_dir
+                    )
+                    if local_path.exists():
+                        already_cached += 1
+                    else:
+                        planned.append(_task_key(current, section))
+            current += timedelta(days=1)
+        
+        return planned, already_cached
+    
+    def create_job(
+        self,
+        start_date: date,
+        end_date: date,
+        sections: List[DOUSection],
+        file_format: FileFormat,
+        include_weekends: bool = False
+    ) -> DOUBackfillJob:
+        """
+        Cria um job de backfill e inicia sua execução em segundo plano.
+        
+        Args:
+            start_date: Data inicial
+            end_date: Data final
+            sections: Seções desejadas
+            file_format: Formato dos arquivos
+            include_weekends: Se inclui sábados e domingos
+        
+        Returns:
+            DOUBackfillJob: Job criado
+        """
+        planned, already_cached = self.plan(
+            start_date, end_date, sections, file_format, include_weekends
+        )
+        
+        job = DOUBackfillJob(
+            job_id=uuid.uuid4().hex[:12],
+            start_date=start_date,
+            end_date=end_date,
+            sections=sections,
+            file_format=file_format,
+            include_weekends=include_weekends,
+            planned=planned,
+            already_cached=already_cached
+        )
+        self.jobs[job.job_id] = job
+        self._save_job(job)
+        
+        self._start(job)
+        return job
+    
+    def resume_job(self, job_id: str) -> DOUBackfillJob:
+        """
+        Retoma um job interrompido, cancelado ou com falhas.
+        
+        Args:
+            job_id: Identificador do job
+        
+        Returns:
+            DOUBackfillJob: Job retomado
+        
+        Raises:
+            KeyError: Se o job não existir
+            ValueError: Se o job já estiver em execução
+        """
+        job = self.jobs[job_id]
+        
+        if job_id in self._tasks and not self._tasks[job_id].done():
+            raise ValueError(f"Job {job_id} já está em execução")
+        
+        # Arquivos com erro voltam para a fila
+        job.failed = {}
+        job.error = None
+        self._start(job)
+        return job
+    
+    def cancel_job(self, job_id: str) -> bool:
+        """
+        Cancela a execução de um job.
+        
+        Args:
+            job_id: Identificador do job
+        
+        Returns:
+            bool: True se havia uma execução em andamento
+        """
+        task = self._tasks.get(job_id)
+        if task is None or task.done():
+            return False
+        task.cancel()
+        return True
+    
+    def _start(self, job: DOUBackfillJob) -> None:
+        """Agenda a execução de um job no loop atual."""
+        
+        job.status = BackfillJobStatus.PENDING
+        self._save_job(job)
+        self._tasks[job.job_id] = asyncio.create_task(self._run(job))
+    
+    def _pending_tasks(self, job: DOUBackfillJob) -> List[str]:
+        """Arquivos do job que ainda não foram resolvidos."""
+        
+        done = set(job.completed) | set(job.missing) | set(job.failed)
+        return [key for key in job.planned if key not in done]
+    
+    async def _run(self, job: DOUBackfillJob) -> None:
+        """Executa os downloads pendentes de um job com um pool de workers."""
+        
+        job.status = BackfillJobStatus.RUNNING
+        self._save_job(job)
+        
+        queue: asyncio.Queue = asyncio.Queue()
+        for key in self._pending_tasks(job):
+            queue.put_nowait(key)
+        
+        logger.info(f"Backfill {job.job_id}: {queue.qsize()} arquivos pendentes")
+        
+        async def worker() -> None:
+            while True:
+                try:
+                    key = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                
+                base_date, section = _parse_task_key(key)
+                try:
+                    file_info = await download_dou_file(base_date, section, job.file_format)
+                    if file_info.file_path:
+                        job.completed.append(key)
+                    elif get_availability_cache().is_known_missing(base_date, section, job.file_format):
+                        # Só um 404 confirmado torna o arquivo indisponível em definitivo
+                        job.missing.append(key)
+                    else:
+                        # Erros HTTP, 429, timeouts e falhas de rede: retomar tenta de novo
+                        logger.warning(f"Backfill {job.job_id}: download de {key} falhou")
+                        job.failed[key] = "download falhou (erro HTTP, timeout ou falha de rede)"
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"Backfill {job.job_id}: erro em {key}: {e}")
+                    job.failed[key] = str(e)
+                
+                self._save_job(job)
+        
+        try:
+            await get_auth_instance().authenticate()
+            
+            workers = max(1, self.config.max_concurrent_downloads)
+            await asyncio.gather(*(worker() for _ in range(workers)))
+            
+            job.status = BackfillJobStatus.COMPLETED
+            logger.info(
+                f"Backfill {job.job_id} concluído: {len(job.completed)} baixados, "
+                f"{len(job.missing)} indisponíveis, {len(job.failed)} com erro"
+            )
+        
+        except asyncio.CancelledError:
+            # Encerramento do servidor interrompe; cancelamento explícito cancela
+            if self._shutting_down:
+                job.status = BackfillJobStatus.INTERRUPTED
+            else:
+                job.status = BackfillJobStatus.CANCELLED
+            logger.info(f"Backfill {job.job_id}: {job.status.value}")
+        
+        except Exception as e:
+            job.status = BackfillJobStatus.FAILED
+            job.error = str(e)
+            logger.error(f"Backfill {job.job_id} falhou: {e}")
+        
+        finally:
+            self._save_job(job)
+    
+    async def shutdown(self) -> None:
+        """Interrompe os jobs em execução, preservando o progresso."""
+        
+        self._shutting_down = True
+        
+        running = [task for task in self._tasks.values() if not task.done()]
+        for task in running:
+            task.cancel()
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+
+
+# Instância global do agendador
+_scheduler_instance: Optional[DOUBackfillScheduler] = None
+
+
+def get_backfill_scheduler() -> DOUBackfillScheduler:
+    """
+    Obtém a instância global do agendador de backfill.
+    
+    Returns:
+        DOUBackfillScheduler: Agendador de jobs
+    """
+    global _scheduler_instance
+    
+    if _scheduler_instance is None:
+        _scheduler_instance = DOUBackfillScheduler()
+    
+    return _scheduler_instance
+
+
+async def shutdown_backfill_scheduler() -> None:
+    """Interrompe os jobs do agendador global, se tiver sido criado."""
+    
+    if _scheduler_instance is not None:
+        await _scheduler_instance.shutdown()
+
+
+def _format_job(job: DOUBackfillJob) -> str:
+    """Formata o estado de um job para exibição."""
+    
+    total = len(job.planned)
+    resolved = len(job.completed) + len(job.missing) + len(job.failed)
+    progress = (resolved / total * 100) if total else 100.0
+    
+    lines = [
+        f"🆔 Job: {job.job_id}",
+        f"📌 Status: {job.status.value}",
+        f"📅 Período: {job.start_date} até {job.end_date}",
+        f"📑 Seções: {' '.join(s.value for s in job.sections)} ({job.file_format.value.upper()})",
+        f"📊 Progresso: {resolved}/{total} ({progress:.1f}%)",
+        f"  ✅ Baixados: {len(job.completed)}",
+        f"  ❌ Indisponíveis: {len(job.missing)}",
+        f"  ⚠️ Com erro: {len(job.failed)}",
+        f"  💾 Já em cache: {job.already_cached}",
+        f"🕒 Atualizado em: {job.updated_at:%Y-%m-%d %H:%M:%S}",
+    ]
+    if job.error:
+        lines.append(f"🔍 Erro: {job.error}")
+    
+    return "\n".join(lines)
+
+
+def register_backfill_tools(mcp: FastMCP) -> None:
+    """Registra as ferramentas de backfill no servidor MCP."""
+    
+    @mcp.tool()
+    @instrument()
+    async def backfill_dou(
+        start_date: str,
+        end_date: str,
+        sections: str = "DO1 DO2 DO3",
+        file_format: str = "xml",
+        include_weekends: bool = False
+    ) -> str:
+        """
+        Inicia o download em segundo plano de um intervalo de datas do DOU.
+        
+        Apenas os arquivos ausentes do cache são baixados. Use
+        get_backfill_status para acompanhar o progresso.
+        
+        Args:
+            start_date: Data inicial (YYYY-MM-DD)
+            end_date: Data final (YYYY-MM-DD)
+            sections: Seções separadas por espaço (ex: "DO1 DO2 DO3")
+            file_format: Formato do arquivo ("xml" ou "pdf")
+            include_weekends: Incluir sábados e domingos (edições extras)
+        """
+        start_time = time.time()
+        
+        try:
+            start = datetime.strptime(start_date, "%Y-%m-%d").date()
+            end = datetime.strptime(end_date, "%Y-%m-%d").date()
+            if start > end:
+                return "❌ Data inicial não pode ser posterior à data final"
+            
+            format_enum = FileFormat.XML if file_format.lower() == "xml" else FileFormat.PDF
+            section_list = [DOUSection(s.strip().upper()) for s in sections.split()]
+            
+            job = get_backfill_scheduler().create_job(
+                start, end, section_list, format_enum, include_weekends
+            )
+            
+            execution_time = (time.time() - start_time) * 1000
+            
+            return (
+                f"🚀 Backfill DOU iniciado\n\n"
+                f"{_format_job(job)}\n"
+                f"⏱️ Tempo de planejamento: {execution_time:.2f}ms\n\n"
+                f"💡 Use get_backfill_status(\"{job.job_id}\") para acompanhar"
+            )
+        
+        except ValueError as e:
+            return f"❌ Erro: Parâmetro inválido ({e}). Use datas YYYY-MM-DD e seções DO1..DO3E"
+        except Exception as e:
+            logger.error(f"Erro ao iniciar backfill: {e}")
+            return f"❌ Erro: {str(e)}"
+    
+    @mcp.tool()
+    @instrument()
+    async def get_backfill_status(job_id: str = "") -> str:
+        """
+        Mostra o progresso de um job de backfill (ou lista todos os jobs).
+        
+        Args:
+            job_id: Identificador do job (vazio para listar todos)
+        """
+        scheduler = get_backfill_scheduler()
+        
+        if job_id:
+            job = scheduler.jobs.get(job_id)
+            if job is None:
+                return f"❌ Job não encontrado: {job_id}"
+            return f"📥 Backfill DOU\n\n{_format_job(job)}"
+        
+        if not scheduler.jobs:
+            return "📭 Nenhum job de backfill registrado."
+        
+        jobs = sorted(scheduler.jobs.values(), key=lambda j: j.created_at, reverse=True)
+        return "📥 Jobs de backfill DOU\n\n" + "\n\n".join(_format_job(job) for job in jobs)
+    
+    @mcp.tool()
+    @instrument()
+    async def resume_backfill(job_id: str) -> str:
+        """
+        Retoma um job de backfill interrompido ou com erros.
+        
+        Args:
+            job_id: Identificador do job
+        """
+        try:
+            job = get_backfill_scheduler().resume_job(job_id)
+            return f"🔄 Backfill retomado\n\n{_format_job(job)}"
+        except KeyError:
+            return f"❌ Job não encontrado: {job_id}"
+        except ValueError as e:
+            return f"⚠️ {str(e)}"
+    
+    @mcp.tool()
+    @instrument()
+    async def cancel_backfill(job_id: str) -> str:
+        """
+        Cancela um job de backfill em execução (pode ser retomado depois).
+        
+        Args:
+            job_id: Identificador do job
+        """
+        if get_backfill_scheduler().cancel_job(job_id):
+            return f"🛑 Cancelamento solicitado para o job {job_id}"
+        return f"⚠️ Job {job_id} não está em execução"
@@ -0,0 +1,868 @@
+"""
+Gerenciamento do cache de arquivos baixados do DOU.
+
+Este módulo mantém um manifesto persistente dos arquivos do cache
+(cache/YYYY/MM) com data, seção, formato, tamanho, checksum, momento do
+download e uso de cada um. O manifesto resolve as buscas por data/seção
+sem varrer diretórios e orienta a remoção dos arquivos menos usados
+recentemente (LRU) sempre que os limites de quantidade (max_cache_size)
+ou de espaço (max_cache_mb, que inclui a parte de cada ZIP no índice de
+busca) são excedidos. A verificação roda em segundo
+plano, em pequenos lotes, sem bloquear as ferramentas.
+"""
+
+import asyncio
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from mcp.server.fastmcp import FastMCP
+
+from ..config.settings import get_config
+from .index import get_search_index
+from .metrics import instrument
+from .parse_cache import SIDECAR_SUFFIX, DOUParseCache
+
+
+logger = logging.getLogger(__name__)
+
+
+# Versão do esquema; uma alteração recria a tabela a partir do disco
+CACHE_SCHEMA_VERSION = 3
+
+# Arquivos removidos por lote antes de devolver o controle ao loop
+EVICTION_BATCH_SIZE = 50
+
+# Arquivos sem checksum calculados a cada verificação periódica
+CHECKSUM_BATCH_SIZE = 20
+
+# Extensões dos arquivos gerenciados (os sidecars acompanham os ZIPs e
+# entram no tamanho deles)
+CACHED_SUFFIXES = (".zip", ".pdf")
+
+# Nome dos arquivos do cache: YYYY-MM-DD-SECAO.zip|pdf
+_FILE_NAME_RE = re.compile(r"^(\d{4}-\d{2}-\d{2})-(DO\w+)\.(zip|pdf)$")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    pub_date TEXT,
+    section TEXT,
+    format TEXT,
+    size INTEGER NOT NULL,
+    sidecar_size INTEGER NOT NULL DEFAULT 0,
+    sha256 TEXT,
+    downloaded_at REAL NOT NULL,
+    last_access REAL NOT NULL,
+    access_count INTEGER NOT NULL DEFAULT 0,
+    validated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_files_last_access ON files(last_access);
+CREATE INDEX IF NOT EXISTS idx_files_format_date ON files(format, pub_date);
+CREATE INDEX IF NOT EXISTS idx_files_section ON files(section);
+"""
+
+
+def _describe(path: Path) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """Extrai data, seção e formato ('xml' ou 'pdf') do nome de um arquivo."""
+    
+    match = _FILE_NAME_RE.match(path.name)
+    if not match:
+        return None, None, None
+    pub_date, section, extension = match.groups()
+    return pub_date, section, "xml" if extension == "zip" else "pdf"
+
+
+def normalize_date(value: Optional[str]) -> Optional[str]:
+    """
+    Valida uma data de filtro e a converte para AAAA-MM-DD.
+    
+    Aceita dia e mês sem zero à esquerda (2024-9-6), como o strptime.
+    
+    Args:
+        value: Data informada (vazia = sem limite)
+    
+    Returns:
+        Optional[str]: Data em formato ISO, ou None se vazia
+    
+    Raises:
+        ValueError: Se a data não estiver no formato AAAA-MM-DD
+    """
+    if value is None or not value.strip():
+        return None
+    
+    try:
+        return datetime.strptime(value.strip(), "%Y-%m-%d").date().isoformat()
+    except ValueError:
+        raise ValueError(f"Data inválida '{value}' (use o formato AAAA-MM-DD)")
+
+
+def _sha256(path: Path) -> str:
+    """Calcula o SHA-256 de um arquivo."""
+    
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DOUCacheManager:
+    """
+    Manifesto, controle de uso e limites do cache de arquivos.
+    
+    O manifesto fica em SQLite (cache/.state/cache.db); arquivos
+    encontrados no disco sem registro entram com o mtime como momento do
+    download e do último acesso, e têm o checksum calculado em segundo plano.
+    """
+    
+    def __init__(self, db_path: Optional[Path] = None):
+        self.config = get_config()
+        self.cache_dir = Path(self.config.cache_dir)
+        self.db_path = db_path or self.cache_dir / ".state" / "cache.db"
+        self.parse_cache = DOUParseCache()
+        
+        self._write_lock = threading.Lock()
+        self._initialized = False
+        self._dir_mtimes: Optional[Dict[str, float]] = None
+        # Acessos ainda não gravados: caminho -> (último acesso, quantidade)
+        self._pending_access: Dict[str, Tuple[float, int]] = {}
+        self._pending_lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self.evicted_files = 0
+        self.evicted_bytes = 0
+    
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Abre uma conexão com o banco do cache, garantindo o esquema."""
+        
+        if not self._initialized:
+            self._initialize()
+        
+        conn = sqlite3.connect(str(self.db_path), timeout=30)
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+    
+    def _initialize(self) -> None:
+        """Cria o banco e recria a tabela se a versão do esquema mudou."""
+        
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        conn = sqlite3.connect(str(self.db_path), timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            
+            if version != CACHE_SCHEMA_VERSION:
+                conn.execute("DROP TABLE IF EXISTS files")
+                conn.execute(f"PRAGMA user_version = {CACHE_SCHEMA_VERSION}")
+            
+            conn.executescript(_SCHEMA)
+            conn.commit()
+        finally:
+            conn.close()
+        
+        self._initialized = True
+    
+    # ------------------------------------------------------------------
+    # Registro de uso
+    # ------------------------------------------------------------------
+    
+    def record_download(self, file_path: Path) -> None:
+        """
+        Registra no manifesto um arquivo recém-baixado (ou revalidado).
+        
+        Args:
+            file_path: Caminho do arquivo
+        """
+        file_path = Path(file_path).absolute()
+        pub_date, section, file_format = _describe(file_path)
+        size = file_path.stat().st_size
+        checksum = _sha256(file_path)
+        now = time.time()
+        
+        with self._write_lock, self._connection() as conn:
+            conn.execute(
+                "INSERT INTO files "
+                "(path, pub_date, section, format, size, sha256, downloaded_at, "
+                "last_access, access_count, validated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, 1, ?) "
+                "ON CONFLICT(path) DO UPDATE SET size = excluded.size, "
+                "sha256 = excluded.sha256, last_access = excluded.last_access, "
+                "access_count = access_count + 1, validated_at = excluded.validated_at, "
+                "downloaded_at = CASE WHEN sha256 IS excluded.sha256 "
+                "THEN downloaded_at ELSE excluded.downloaded_at END",
+                (str(file_path), pub_date, section, file_format, size, checksum, now, now, now)
+            )
+    
+    def record_access(self, paths: Iterable[Path]) -> None:
+        """
+        Atualiza o último acesso de arquivos do cache.
+        
+        Args:
+            paths: Arquivos acessados
+        """
+        now = time.time()
+        self._write_accesses({str(Path(path).absolute()): (now, 1) for path in paths})
+    
+    def touch(self, paths: Iterable[Path]) -> None:
+        """
+        Registra acessos apenas em memória, sem escrever no manifesto.
+        
+        Usado pelas buscas, inclusive as respondidas pelo cache de
+        resultados; os acessos acumulados são gravados em lote por
+        flush_access (verificação periódica dos limites, consultas ao
+        manifesto e encerramento).
+        
+        Args:
+            paths: Arquivos acessados
+        """
+        now = time.time()
+        with self._pending_lock:
+            for path in paths:
+                key = str(Path(path).absolute())
+                _, count = self._pending_access.get(key, (now, 0))
+                self._pending_access[key] = (now, count + 1)
+    
+    def flush_access(self) -> int:
+        """
+        Grava no manifesto os acessos registrados por touch.
+        
+        Returns:
+            int: Quantidade de arquivos atualizados
+        """
+        with self._pending_lock:
+            pending, self._pending_access = self._pending_access, {}
+        
+        if pending:
+            self._write_accesses(pending)
+        return len(pending)
+    
+    def _write_accesses(self, accesses: Dict[str, Tuple[float, int]]) -> None:
+        """Grava acessos (momento do último e quantidade) no manifesto."""
+        
+        rows = []
+        for path, (accessed_at, count) in accesses.items():
+            try:
+                stat = Path(path).stat()
+            except FileNotFoundError:
+                continue
+            rows.append((
+                path, *_describe(Path(path)), stat.st_size, stat.st_mtime,
+                accessed_at, count, stat.st_mtime
+            ))
+        
+        if not rows:
+            return
+        
+        with self._write_lock, self._connection() as conn:
+            conn.executemany(
+                "INSERT INTO files "
+                "(path, pub_date, section, format, size, downloaded_at, "
+                "last_access, access_count, validated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(path) DO UPDATE SET size = excluded.size, "
+                "last_access = MAX(last_access, excluded.last_access), "
+                "access_count = access_count + excluded.access_count",
+                rows
+            )
+    
+    def needs_revalidation(self, file_path: Path) -> bool:
+        """
+        Indica se um arquivo do cache passou do TTL e deve ser revalidado.
+        
+        Só edições dos últimos cache_revalidate_days dias são revalidadas;
+        edições mais antigas não mudam mais e nunca geram requisições.
+        
+        Args:
+            file_path: Caminho do arquivo
+        
+        Returns:
+            bool: True se a edição é recente e a última validação é mais
+            antiga que cache_ttl_hours
+        """
+        if self.config.cache_ttl_hours <= 0:
+            return False
+        
+        file_path = Path(file_path).absolute()
+        pub_date, _, _ = _describe(file_path)
+        if pub_date is not None:
+            oldest = date.today() - timedelta(days=self.config.cache_revalidate_days)
+            if date.fromisoformat(pub_date) < oldest:
+                return False
+        
+        with self._connection() as conn:
+            row = conn.execute(
+                "SELECT validated_at FROM files WHERE path = ?", (str(file_path),)
+            ).fetchone()
+        
+        validated_at = row[0] if row else file_path.stat().st_mtime
+        return time.time() - validated_at > self.config.cache_ttl_hours * 3600
+    
+    # ------------------------------------------------------------------
+    # Limites e remoção
+    # ------------------------------------------------------------------
+    
+    def _scan(self) -> Tuple[Dict[str, Tuple[int, float]], Dict[str, int]]:
+        """
+        Lista os arquivos gerenciados presentes no disco.
+        
+        Returns:
+            Tuple[Dict[str, Tuple[int, float]], Dict[str, int]]: Tamanho e
+            mtime de cada arquivo, e tamanho do sidecar de cada ZIP que o tem
+        """
+        files = {}
+        sidecars = {}
+        for path in self.cache_dir.glob("[0-9][0-9][0-9][0-9]/[0-9][0-9]/*"):
+            is_sidecar = path.name.endswith(SIDECAR_SUFFIX)
+            if not is_sidecar and path.suffix not in CACHED_SUFFIXES:
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if is_sidecar:
+                zip_name = path.name[:-len(SIDECAR_SUFFIX)] + ".zip"
+                sidecars[str(path.with_name(zip_name).absolute())] = stat.st_size
+            else:
+                files[str(path.absolute())] = (stat.st_size, stat.st_mtime)
+        return files, sidecars
+    
+    def get_state_size(self) -> int:
+        """
+        Soma o tamanho de cache/.state (manifesto, índice de busca, jobs).
+        
+        Returns:
+            int: Total em bytes
+        """
+        total = 0
+        for path in (self.cache_dir / ".state").rglob("*"):
+            try:
+                if path.is_file():
+                    total += path.stat().st_size
+            except FileNotFoundError:
+                continue
+        return total
+    
+    def _directory_mtimes(self) -> Dict[str, float]:
+        """mtime do diretório do cache e dos diretórios YYYY e YYYY/MM."""
+        
+        mtimes = {}
+        for pattern in ("", "[0-9][0-9][0-9][0-9]", "[0-9][0-9][0-9][0-9]/[0-9][0-9]"):
+            directories = self.cache_dir.glob(pattern) if pattern else [self.cache_dir]
+            for directory in directories:
+                try:
+                    mtimes[str(directory)] = directory.stat().st_mtime
+                except FileNotFoundError:
+                    continue
+        return mtimes
+    
+    def get_signature(self) -> Tuple[Tuple[str, float], ...]:
+        """
+        Assinatura barata do conteúdo do cache.
+        
+        Muda quando arquivos são criados, removidos ou substituídos nos
+        diretórios do cache, inclusive por cópias manuais que ainda não
+        passaram pelo manifesto nem pelo índice.
+        
+        Returns:
+            Tuple[Tuple[str, float], ...]: mtimes de cache/, YYYY e YYYY/MM
+        """
+        return tuple(sorted(self._directory_mtimes().items()))
+    
+    def _ensure_reconciled(self) -> None:
+        """
+        Reconcilia o manifesto se algum diretório do cache mudou.
+        
+        Arquivos criados, removidos ou renomeados em cache/YYYY/MM alteram o
+        mtime do diretório, então arquivos copiados manualmente aparecem
+        sem uma varredura completa a cada consulta.
+        """
+        if self._dir_mtimes is None or self._directory_mtimes() != self._dir_mtimes:
+            self.reconcile()
+    
+    def reconcile(self) -> None:
+        """Sincroniza o manifesto com o disco (arquivos novos, alterados ou removidos)."""
+        
+        # Capturado antes da varredura: mudanças durante ela disparam outra
+        dir_mtimes = self._directory_mtimes()
+        on_disk, sidecars = self._scan()
+        
+        with self._write_lock, self._connection() as conn:
+            known = {}
+            known_sidecars = {}
+            for path, size, sidecar_size in conn.execute(
+                "SELECT path, size, sidecar_size FROM files"
+            ).fetchall():
+                known[path] = size
+                known_sidecars[path] = sidecar_size
+            
+            conn.executemany(
+                "DELETE FROM files WHERE path = ?",
+                ((path,) for path in known if path not in on_disk)
+            )
+            conn.executemany(
+                "INSERT INTO files "
+                "(path, pub_date, section, format, size, downloaded_at, last_access, validated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(path) DO UPDATE SET size = excluded.size, sha256 = NULL",
+                (
+                    (path, *_describe(Path(path)), size, mtime, mtime, mtime)
+                    for path, (size, mtime) in on_disk.items()
+                    if known.get(path) != size
+                )
+            )
+            conn.executemany(
+                "UPDATE files SET sidecar_size = ? WHERE path = ?",
+                (
+                    (sidecars.get(path, 0), path)
+                    for path in on_disk
+                    if known_sidecars.get(path, 0) != sidecars.get(path, 0)
+                )
+            )
+        
+        self._dir_mtimes = dir_mtimes
+    
+    def fill_checksums(self, limit: int = CHECKSUM_BATCH_SIZE) -> int:
+        """
+        Calcula o checksum de arquivos do manifesto que ainda não o têm.
+        
+        Args:
+            limit: Quantidade máxima de arquivos processados
+        
+        Returns:
+            int: Quantidade de checksums calculados
+        """
+        with self._connection() as conn:
+            paths = [
+                path for (path,) in conn.execute(
+                    "SELECT path FROM files WHERE sha256 IS NULL LIMIT ?", (limit,)
+                ).fetchall()
+            ]
+        
+        filled = 0
+        for path in paths:
+            try:
+                checksum = _sha256(Path(path))
+            except FileNotFoundError:
+                continue
+            with self._write_lock, self._connection() as conn:
+                conn.execute("UPDATE files SET sha256 = ? WHERE path = ?", (checksum, path))
+            filled += 1
+        return filled
+    
+    # ------------------------------------------------------------------
+    # Consultas ao manifesto
+    # ------------------------------------------------------------------
+    
+    def find_files(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        sections: Optional[List[str]] = None,
+        file_format: str = "xml"
+    ) -> List[Path]:
+        """
+        Localiza arquivos do cache por intervalo de datas e seções.
+        
+        Args:
+            start_date: Data inicial (YYYY-MM-DD, inclusiva)
+            end_date: Data final (YYYY-MM-DD, inclusiva)
+            sections: Seções (DO1 também seleciona edições extras como DO1E)
+            file_format: 'xml' (ZIPs) ou 'pdf'
+        
+        Returns:
+            List[Path]: Arquivos encontrados, ordenados pelo caminho
+        
+        Raises:
+            ValueError: Se alguma das datas for inválida
+        """
+        start_date = normalize_date(start_date)
+        end_date = normalize_date(end_date)
+        
+        self._ensure_reconciled()
+        
+        conditions = ["format = ?"]
+        params: List[Any] = [file_format]
+        if start_date:
+            conditions.append("pub_date >= ?")
+            params.append(start_date)
+        if end_date:
+            conditions.append("pub_date <= ?")
+            params.append(end_date)
+        if sections:
+            conditions.append("(" + " OR ".join("section LIKE ?" for _ in sections) + ")")
+            params.extend(f"{section}%" for section in sections)
+        
+        with self._connection() as conn:
+            rows = conn.execute(
+                f"SELECT path FROM files WHERE {' AND '.join(conditions)} ORDER BY path",
+                params
+            ).fetchall()
+        
+        return [Path(path) for (path,) in rows]
+    
+    def get_summary(self, hot_files: int = 5) -> Dict[str, Any]:
+        """
+        Resume o conteúdo do cache a partir do manifesto.
+        
+        Args:
+            hot_files: Quantidade de arquivos mais acessados a listar
+        
+        Returns:
+            Dict[str, Any]: Totais, contagens por formato e seção, período
+            coberto, downloads recentes e arquivos mais acessados
+        """
+        self.flush_access()
+        self._ensure_reconciled()
+        
+        day_ago = time.time() - 24 * 3600
+        
+        with self._connection() as conn:
+            files, total, sidecar_total, accesses, first_date, last_date = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(sidecar_size), 0), "
+                "COALESCE(SUM(access_count), 0), MIN(pub_date), MAX(pub_date) FROM files"
+            ).fetchone()
+            by_format = {
+                file_format or "outros": (count, size)
+                for file_format, count, size in conn.execute(
+                    "SELECT format, COUNT(*), SUM(size) FROM files GROUP BY format"
+                ).fetchall()
+            }
+            by_section = {
+                section or "outros": (count, size)
+                for section, count, size in conn.execute(
+                    "SELECT section, COUNT(*), SUM(size) FROM files GROUP BY section ORDER BY section"
+                ).fetchall()
+            }
+            recent_downloads = conn.execute(
+                "SELECT COUNT(*) FROM files WHERE downloaded_at >= ?", (day_ago,)
+            ).fetchone()[0]
+            hot = conn.execute(
+                "SELECT path, access_count, last_access FROM files WHERE access_count > 0 "
+                "ORDER BY access_count DESC, last_access DESC LIMIT ?",
+                (hot_files,)
+            ).fetchall()
+        
+        return {
+            "files": files,
+            "bytes": total,
+            "sidecar_bytes": sidecar_total,
+            "state_bytes": self.get_state_size(),
+            "accesses": accesses,
+            "first_date": first_date,
+            "last_date": last_date,
+            "by_format": by_format,
+            "by_section": by_section,
+            "recent_downloads": recent_downloads,
+            "hot_files": [
+                {"name": Path(path).name, "access_count": count, "last_access": last_access}
+                for path, count, last_access in hot
+            ],
+        }
+    
+    def get_usage(self) -> Dict[str, int]:
+        """
+        Retorna a ocupação atual do cache segundo o registro.
+        
+        Os bytes incluem os sidecars de artigos processados e a parte de
+        cada ZIP no índice de busca, que são removidos junto com ele.
+        
+        Returns:
+            Dict[str, int]: Quantidade de arquivos, total de bytes e as
+            partes ocupadas pelos sidecars e pelo índice de busca
+        """
+        with self._connection() as conn:
+            files, total, sidecar_total = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size + sidecar_size), 0), "
+                "COALESCE(SUM(sidecar_size), 0) FROM files"
+            ).fetchone()
+        index_total = sum(get_search_index().get_segment_sizes().values())
+        return {
+            "files": files,
+            "bytes": total + index_total,
+            "sidecar_bytes": sidecar_total,
+            "index_bytes": index_total,
+        }
+    
+    def _over_budget(self, usage: Dict[str, int]) -> bool:
+        """Indica se a ocupação excede algum dos limites configurados."""
+        
+        max_files = self.config.max_cache_size
+        max_bytes = self.config.max_cache_mb * 1024 * 1024
+        return (
+            (max_files > 0 and usage["files"] > max_files)
+            or (max_bytes > 0 and usage["bytes"] > max_bytes)
+        )
+    
+    def _eviction_batch(self, usage: Dict[str, int]) -> List[Tuple[str, int]]:
+        """Seleciona os próximos arquivos a remover (menos usados recentemente)."""
+        
+        max_files = self.config.max_cache_size
+        max_bytes = self.config.max_cache_mb * 1024 * 1024
+        
+        with self._connection() as conn:
+            rows = conn.execute(
+                "SELECT path, size + sidecar_size FROM files ORDER BY last_access LIMIT ?",
+                (EVICTION_BATCH_SIZE,)
+            ).fetchall()
+        index_sizes = get_search_index().get_segment_sizes() if max_bytes > 0 else {}
+        
+        batch = []
+        files, total = usage["files"], usage["bytes"]
+        for path, size in rows:
+            if not (
+                (max_files > 0 and files > max_files)
+                or (max_bytes > 0 and total > max_bytes)
+            ):
+                break
+            size += index_sizes.get(path, 0)
+            batch.append((path, size))
+            files -= 1
+            total -= size
+        return batch
+    
+    def evict(self, path: str) -> None:
+        """
+        Remove um arquivo do cache, junto com seu sidecar e segmento do índice.
+        
+        Args:
+            path: Caminho do arquivo
+        """
+        file_path = Path(path)
+        
+        if file_path.suffix == ".zip":
+            try:
+                get_search_index().remove_zip(file_path)
+            except Exception as e:
+                logger.warning(f"Falha ao remover {file_path.name} do índice: {e}")
+            self.parse_cache.invalidate(file_path)
+        
+        file_path.unlink(missing_ok=True)
+        
+        with self._write_lock, self._connection() as conn:
+            conn.execute("DELETE FROM files WHERE path = ?", (path,))
+    
+    async def enforce_limits(self) -> Dict[str, int]:
+        """
+        Remove arquivos até que o cache volte aos limites configurados.
+        
+        A remoção é feita em lotes, devolvendo o controle ao loop entre
+        eles para não atrasar as ferramentas em execução.
+        
+        Returns:
+            Dict[str, int]: Arquivos e bytes removidos nesta execução
+        """
+        # Os acessos pendentes definem quais arquivos são os menos usados
+        await asyncio.to_thread(self.flush_access)
+        await asyncio.to_thread(self.reconcile)
+        
+        removed_files = 0
+        removed_bytes = 0
+        
+        while True:
+            usage = await asyncio.to_thread(self.get_usage)
+            if not self._over_budget(usage):
+                break
+            
+            batch = await asyncio.to_thread(self._eviction_batch, usage)
+            if not batch:
+                break
+            
+            for path, size in batch:
+                try:
+                    await asyncio.to_thread(self.evict, path)
+                except Exception as e:
+                    logger.error(f"Erro ao remover {path} do cache: {e}")
+                    continue
+                removed_files += 1
+                removed_bytes += size
+            
+            await asyncio.sleep(0)
+        
+        if removed_files:
+            self.evicted_files += removed_files
+            self.evicted_bytes += removed_bytes
+            logger.info(
+                f"Cache: {removed_files} arquivos removidos "
+                f"({removed_bytes / 1024 / 1024:.1f} MB) para respeitar os limites"
+            )
+        
+        return {"files": removed_files, "bytes": removed_bytes}
+    
+    # ------------------------------------------------------------------
+    # Execução em segundo plano
+    # ------------------------------------------------------------------
+    
+    def start(self) -> None:
+        """Inicia a verificação periódica dos limites no loop atual."""
+        
+        if self._task is not None and not self._task.done():
+            return
+        
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+    
+    def request_enforcement(self) -> None:
+        """Antecipa a próxima verificação (por exemplo, após um download)."""
+        
+        if self._wakeup is not None:
+            self._wakeup.set()
+    
+    async def _run(self) -> None:
+        """Laço da verificação periódica."""
+        
+        interval = max(1, self.config.cache_eviction_interval)
+        
+        while True:
+            try:
+                await self.enforce_limits()
+                await asyncio.to_thread(self.fill_checksums)
+            except Exception as e:
+                logger.error(f"Erro na verificação dos limites do cache: {e}")
+            
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+    
+    async def shutdown(self) -> None:
+        """Interrompe a verificação periódica e grava os acessos pendentes."""
+        
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        
+        try:
+            await asyncio.to_thread(self.flush_access)
+        except Exception as e:
+            logger.error(f"Erro ao gravar os acessos pendentes do cache: {e}")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna a ocupação, os limites e o total já removido.
+        
+        Returns:
+            Dict[str, Any]: Estatísticas do cache
+        """
+        usage = self.get_usage()
+        return {
+            "files": usage["files"],
+            "bytes": usage["bytes"],
+            "sidecar_bytes": usage["sidecar_bytes"],
+            "index_bytes": usage["index_bytes"],
+            "state_bytes": self.get_state_size(),
+            "max_files": self.config.max_cache_size,
+            "max_bytes": self.config.max_cache_mb * 1024 * 1024,
+            "ttl_hours": self.config.cache_ttl_hours,
+            "evicted_files": self.evicted_files,
+            "evicted_bytes": self.evicted_bytes,
+        }
+
+
+# Instância global do gerenciador de cache
+_cache_manager_instance: Optional[DOUCacheManager] = None
+
+
+def get_cache_manager() -> DOUCacheManager:
+    """
+    Obtém a instância global do gerenciador de cache.
+    
+    Returns:
+        DOUCacheManager: Gerenciador de cache
+    """
+    global _cache_manager_instance
+    
+    if _cache_manager_instance is None:
+        _cache_manager_instance = DOUCacheManager()
+    
+    return _cache_manager_instance
+
+
+async def shutdown_cache_manager() -> None:
+    """Interrompe a verificação periódica do gerenciador global, se criado."""
+    
+    if _cache_manager_instance is not None:
+        await _cache_manager_instance.shutdown()
+
+
+def _format_size(size: int) -> str:
+    """Formata um tamanho em bytes para exibição."""
+    
+    return f"{size / 1024 / 1024:.1f} MB"
+
+
+def register_cache_tools(mcp: FastMCP) -> None:
+    """Registra as ferramentas de gerenciamento do cache no servidor MCP."""
+    
+    @mcp.tool()
+    @instrument()
+    async def get_cache_status() -> str:
+        """
+        Mostra a ocupação do cache de arquivos e os limites configurados.
+        """
+        try:
+            manager = get_cache_manager()
+            await asyncio.to_thread(manager.reconcile)
+            stats = await asyncio.to_thread(manager.get_stats)
+            
+            max_files = stats["max_files"] or "sem limite"
+            max_bytes = _format_size(stats["max_bytes"]) if stats["max_bytes"] else "sem limite"
+            ttl = f"{stats['ttl_hours']} horas" if stats["ttl_hours"] > 0 else "desativado"
+            
+            return (
+                f"💾 Cache de arquivos DOU\n\n"
+                f"📁 Arquivos: {stats['files']} (limite: {max_files})\n"
+                f"📦 Espaço: {_format_size(stats['bytes'])} (limite: {max_bytes}), "
+                f"dos quais {_format_size(stats['sidecar_bytes'])} em artigos processados "
+                f"e {_format_size(stats['index_bytes'])} no índice de busca\n"
+                f"🗂️ Arquivos de estado (.state): {_format_size(stats['state_bytes'])}\n"
+                f"⏰ Revalidação (TTL): {ttl}\n"
+                f"🧹 Removidos desde o início: {stats['evicted_files']} arquivos "
+                f"({_format_size(stats['evicted_bytes'])})"
+            )
+        
+        except Exception as e:
+            logger.error(f"Erro ao consultar o cache: {e}")
+            return f"❌ Erro ao consultar o cache: {str(e)}"
+    
+    @mcp.tool()
+    @instrument()
+    async def enforce_cache_limits() -> str:
+        """
+        Remove imediatamente os arquivos menos usados até respeitar os limites do cache.
+        """
+        try:
+            removed = await get_cache_manager().enforce_limits()
+            
+            if not removed["files"]:
+                return "✅ O cache já está dentro dos limites configurados."
+            
+            return (
+                f"🧹 Limpeza do cache concluída\n\n"
+                f"🗑️ Arquivos removidos: {removed['files']}\n"
+                f"📦 Espaço liberado: {_format_size(removed['bytes'])}"
+            )
+        
+        except Exception as e:
+            logger.error(f"Erro ao aplicar limites do cache: {e}")
+            return f"❌ Erro ao aplicar limites do cache: {str(e)}"
@@ -9,71 +9,287 @@ import asyncio
 import logging
 import os
 import time
+import weakref
+import zipfile
 from datetime import date, datetime
+from email.utils import formatdate
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, List, Optional, Tuple, Union
 
-import aiofiles
-import httpx
 from mcp.server.fastmcp import FastMCP
 
 from ..auth.inlabs_auth import get_auth_instance, INLABSAuthenticationError
 from ..config.settings import get_config
 from ..models.dou_models import (
+    DOUAvailability,
     DOUDownloadRequest,
     DOUFileInfo,
     DOUSection,
     FileFormat,
     MCPToolResult
 )
+from .availability import get_availability_cache
+from .cache_manager import get_cache_manager
+from .http_client import get_http_client
+from .index import get_search_index
+from .metrics import get_metrics, instrument
+from .tracing import span
 
 
 logger = logging.getLogger(__name__)
 
+# Tamanho dos blocos gravados em disco durante o download
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Sufixo dos arquivos ainda em download
+PARTIAL_SUFFIX = ".part"
+
+# Sufixo do arquivo, ao lado do .part, com o validador (ETag ou Last-Modified)
+# da resposta que o originou; enviado em If-Range ao retomar
+VALIDATOR_SUFFIX = ".validator"
+
+# Semáforo global de downloads (criado no loop em uso)
+_download_semaphore: Optional[asyncio.Semaphore] = None
+_download_semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+# Semáforo das verificações de disponibilidade (separado para não esperar downloads)
+_probe_semaphore: Optional[asyncio.Semaphore] = None
+_probe_semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+# Um lock por arquivo local: sessões concorrentes não baixam o mesmo arquivo
+# em paralelo (nem gravam no mesmo .part); quem espera encontra o cache pronto
+_file_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+
+def _partial_validator(headers) -> Optional[str]:
+    """
+    Escolhe o validador de uma resposta para o cabeçalho If-Range.
+    
+    Args:
+        headers: Headers da resposta
+    
+    Returns:
+        Optional[str]: ETag forte ou, na falta dele, Last-Modified
+    """
+    etag = headers.get("etag")
+    # ETags fracos (W/"...") não são aceitos em If-Range
+    if etag and not etag.startswith("W/"):
+        return etag
+    return headers.get("last-modified")
+
+
+def _discard_partial(part_path: Path) -> None:
+    """Remove um .part e o seu validador."""
+    
+    part_path.unlink(missing_ok=True)
+    part_path.with_name(part_path.name + VALIDATOR_SUFFIX).unlink(missing_ok=True)
+
 
 async def download_file_from_url(
     url: str,
     file_path: Path,
     headers: dict,
-    timeout: int = 30
+    timeout: int = 30,
+    if_modified_since: Optional[float] = None,
+    on_not_found: Optional[Callable[[], None]] = None
 ) -> bool:
     """
-    Baixa um arquivo de uma URL usando httpx assíncrono.
+    Baixa um arquivo de uma URL usando o cliente HTTP compartilhado.
+    
+    O conteúdo é gravado em blocos num arquivo temporário (.part), que só
+    é renomeado para o destino final quando o download termina; se já
+    existir um .part de uma tentativa anterior, o download é retomado via
+    cabeçalho Range, condicionado (If-Range) ao ETag/Last-Modified da
+    resposta que o originou: se o arquivo mudou no servidor, a resposta
+    completa (200) substitui o .part, e um .part sem validador é descartado
+    em vez de ser emendado a outra versão.
     
     Args:
         url: URL para download
         file_path: Caminho onde salvar o arquivo
         headers: Headers HTTP
         timeout: Timeout em segundos
+        if_modified_since: Timestamp da cópia local; se o servidor responder
+            304, o arquivo existente é mantido
+        on_not_found: Chamado quando o servidor responde 404
         
     Returns:
         bool: True se download foi bem-sucedido
     """
+    import aiofiles
+    
+    part_path = file_path.with_name(file_path.name + PARTIAL_SUFFIX)
+    validator_path = part_path.with_name(part_path.name + VALIDATOR_SUFFIX)
+    
     try:
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            response = await client.get(url, headers=headers)
+        # Garante que o diretório existe
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        # Até duas tentativas: a segunda descarta um .part recusado pelo servidor
+        for _ in range(2):
+            resume_from = 0
+            validator = None
+            if part_path.exists():
+                validator = validator_path.read_text() if validator_path.exists() else None
+                if validator:
+                    resume_from = part_path.stat().st_size
+                else:
+                    # Sem validador não há como saber se o .part é da mesma versão
+                    logger.warning(f"Descartando download parcial sem validador: {part_path}")
+                    _discard_partial(part_path)
             
-            if response.status_code == 200:
-                # Garante que o diretório existe
-                file_path.parent.mkdir(parents=True, exist_ok=True)
+            request_headers = dict(headers)
+            if resume_from:
+                request_headers["Range"] = f"bytes={resume_from}-"
+                request_headers["If-Range"] = validator
+            elif if_modified_since is not None:
+                request_headers["If-Modified-Since"] = formatdate(if_modified_since, usegmt=True)
+            
+            async with get_http_client().stream(
+                "GET", url, headers=request_headers, timeout=timeout
+            ) as response:
+                if response.status_code == 416 and resume_from:
+                    logger.warning(f"Retomada recusada, reiniciando download: {url}")
+                    _discard_partial(part_path)
+                    continue
+                
+                if response.status_code == 304 and file_path.exists():
+                    logger.info(f"Arquivo em cache não foi modificado: {file_path}")
+                    get_metrics().increment("files_not_modified")
+                    return True
+                
+                if response.status_code == 404:
+                    logger.warning(f"Arquivo não encontrado: {url}")
+                    if on_not_found is not None:
+                        on_not_found()
+                    return False
                 
-                async with aiofiles.open(file_path, 'wb') as f:
-                    await f.write(response.content)
+                if response.status_code not in (200, 206):
+                    logger.error(f"Erro HTTP {response.status_code} ao baixar: {url}")
+                    return False
                 
-                logger.info(f"Arquivo baixado: {file_path}")
-                return True
-            elif response.status_code == 404:
-                logger.warning(f"Arquivo não encontrado: {url}")
-                return False
-            else:
-                logger.error(f"Erro HTTP {response.status_code} ao baixar: {url}")
-                return False
+                if response.status_code == 206:
+                    content_range = response.headers.get("content-range", "")
+                    if not resume_from or not content_range.startswith(f"bytes {resume_from}-"):
+                        logger.warning(f"Content-Range inesperado ({content_range}), reiniciando download: {url}")
+                        _discard_partial(part_path)
+                        continue
+                    mode = 'ab'
+                    logger.info(f"Retomando download de {file_path.name} a partir de {resume_from} bytes")
+                else:
+                    # 200: o servidor ignorou o Range ou o arquivo mudou (If-Range); recomeça do zero
+                    if resume_from:
+                        logger.info(f"Arquivo mudou no servidor, reiniciando download: {url}")
+                    mode = 'wb'
+                    resume_from = 0
+                    # Grava o validador antes dos dados para que o .part sempre tenha o seu
+                    new_validator = _partial_validator(response.headers)
+                    if new_validator:
+                        validator_path.write_text(new_validator)
+                    else:
+                        validator_path.unlink(missing_ok=True)
+                
+                content_length = response.headers.get('content-length')
+                expected_size = resume_from + int(content_length) if content_length else None
+                
+                received = 0
+                try:
+                    async with aiofiles.open(part_path, mode) as f:
+                        async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                            await f.write(chunk)
+                            received += len(chunk)
+                finally:
+                    get_metrics().increment("bytes_downloaded", received)
+            
+            break
+        else:
+            return False
+        
+        final_size = part_path.stat().st_size
+        if expected_size is not None and final_size != expected_size:
+            # Mantém o .part para retomar numa próxima tentativa
+            logger.error(
+                f"Download incompleto de {url}: {final_size}/{expected_size} bytes"
+            )
+            return False
+        
+        if file_path.suffix == '.zip' and not zipfile.is_zipfile(part_path):
+            logger.error(f"Arquivo ZIP inválido recebido de {url}")
+            _discard_partial(part_path)
+            return False
+        
+        # Publica o arquivo de forma atômica
+        os.replace(part_path, file_path)
+        validator_path.unlink(missing_ok=True)
+        get_metrics().increment("files_downloaded")
+        
+        logger.info(f"Arquivo baixado: {file_path}")
+        return True
                 
     except Exception as e:
         logger.error(f"Erro ao baixar arquivo {url}: {e}")
         return False
 
 
+def get_download_semaphore() -> asyncio.Semaphore:
+    """
+    Obtém o semáforo que limita os downloads simultâneos.
+    
+    Returns:
+        asyncio.Semaphore: Semáforo dimensionado por max_concurrent_downloads
+    """
+    global _download_semaphore, _download_semaphore_loop
+    
+    loop = asyncio.get_running_loop()
+    
+    # Um semáforo só pode ser usado no loop em que foi criado
+    if _download_semaphore is None or _download_semaphore_loop is not loop:
+        _download_semaphore = asyncio.Semaphore(max(1, get_config().max_concurrent_downloads))
+        _download_semaphore_loop = loop
+    
+    return _download_semaphore
+
+
+def get_probe_semaphore() -> asyncio.Semaphore:
+    """
+    Obtém o semáforo que limita as verificações de disponibilidade simultâneas.
+    
+    Returns:
+        asyncio.Semaphore: Semáforo dimensionado por max_concurrent_downloads
+    """
+    global _probe_semaphore, _probe_semaphore_loop
+    
+    loop = asyncio.get_running_loop()
+    
+    if _probe_semaphore is None or _probe_semaphore_loop is not loop:
+        _probe_semaphore = asyncio.Semaphore(max(1, get_config().max_concurrent_downloads))
+        _probe_semaphore_loop = loop
+    
+    return _probe_semaphore
+
+
+def get_file_lock(file_path: Path) -> asyncio.Lock:
+    """
+    Obtém o lock que serializa os downloads de um arquivo local.
+    
+    Os locks são descartados quando ninguém mais os referencia.
+    
+    Args:
+        file_path: Caminho local do arquivo
+        
+    Returns:
+        asyncio.Lock: Lock do arquivo
+    """
+    key = str(file_path)
+    lock = _file_locks.get(key)
+    
+    if lock is None:
+        lock = asyncio.Lock()
+        _file_locks[key] = lock
+    
+    return lock
+
+
 def build_download_url(
     base_date: date,
     section: DOUSection,
@@ -90,7 +306,7 @@ def build_download_url(
     Returns:
         str: URL de download
     """
-    base_url = "https://inlabs.in.gov.br/index.php?p="
+    base_url = f"{get_config().inlabs_base_url.rstrip('/')}/index.php?p="
     
     # Formata data
     date_str = base_date.strftime("%Y-%m-%d")
@@ -137,93 +353,375 @@ def get_local_file_path(
     return Path(cache_dir) / str(base_date.year) / f"{base_date.month:02d}" / filename
 
 
-async def download_dou_file(
+def _cached_file_info(
+    file_path: Path,
     base_date: date,
     section: DOUSection,
     file_format: FileFormat,
-    force_download: bool = False
+    download_url: str
 ) -> DOUFileInfo:
+    """Monta as informações de um arquivo servido a partir do cache."""
+    
+    stat = file_path.stat()
+    return DOUFileInfo(
+        filename=file_path.name,
+        date=base_date,
+        section=section,
+        file_format=file_format,
+        file_size=stat.st_size,
+        file_path=str(file_path),
+        download_url=download_url,
+        is_cached=True,
+        last_modified=datetime.fromtimestamp(stat.st_mtime)
+    )
+
+
+async def probe_availability(
+    base_date: date,
+    section: DOUSection,
+    file_format: FileFormat,
+    use_cache: bool = True
+) -> DOUAvailability:
     """
-    Baixa um arquivo específico do DOU.
+    Verifica se um arquivo existe no INLABS sem baixá-lo.
+    
+    Resultados conclusivos (200 e 404) são guardados no cache de
+    disponibilidade; enquanto válidos, a verificação não gera requisição.
     
     Args:
         base_date: Data da publicação
         section: Seção do DOU
         file_format: Formato do arquivo
-        force_download: Forçar novo download
+        use_cache: Se pode responder a partir do cache
         
     Returns:
-        DOUFileInfo: Informações do arquivo baixado
+        DOUAvailability: Resultado da verificação
     """
-    config = get_config()
-    auth = get_auth_instance()
-    
-    # Autentica se necessário
-    if not auth.is_authenticated():
-        await auth.authenticate()
+    availability = get_availability_cache()
     
-    # Determina caminho local
-    file_path = get_local_file_path(base_date, section, file_format, config.cache_dir)
+    if use_cache:
+        cached = availability.get(base_date, section, file_format)
+        if cached is not None:
+            return cached
     
-    # Constrói URL (necessário mesmo para arquivos em cache)
+    auth = get_auth_instance()
     download_url = build_download_url(base_date, section, file_format)
     
-    # Verifica se arquivo já existe e não deve forçar download
-    if file_path.exists() and not force_download:
-        logger.info(f"Arquivo já existe em cache: {file_path}")
-        return DOUFileInfo(
-            filename=file_path.name,
-            date=base_date,
-            section=section,
-            file_format=file_format,
-            file_size=file_path.stat().st_size,
-            file_path=str(file_path),
-            download_url=download_url,
-            is_cached=True,
-            last_modified=datetime.fromtimestamp(file_path.stat().st_mtime)
+    async with get_probe_semaphore():
+        response = await get_http_client().request(
+            "HEAD", download_url, headers=auth.get_session_headers()
         )
     
-    # Faz download
-    headers = auth.get_session_headers()
-    
-    success = await download_file_from_url(
-        download_url,
-        file_path,
-        headers,
-        config.download_timeout
-    )
-    
-    if success and file_path.exists():
-        return DOUFileInfo(
-            filename=file_path.name,
+    if response.status_code == 200:
+        content_length = response.headers.get('content-length')
+        result = DOUAvailability(
             date=base_date,
             section=section,
             file_format=file_format,
-            file_size=file_path.stat().st_size,
-            file_path=str(file_path),
-            download_url=download_url,
-            is_cached=False,
-            last_modified=datetime.now()
+            available=True,
+            status_code=200,
+            file_size=int(content_length) if content_length and content_length.isdigit() else None
         )
     else:
-        # Retorna info mesmo se download falhou
-        return DOUFileInfo(
-            filename=f"{base_date}-{section.value}.{file_format.value.lower()}",
+        result = DOUAvailability(
             date=base_date,
             section=section,
             file_format=file_format,
-            file_size=None,
-            file_path=None,
-            download_url=download_url,
-            is_cached=False,
-            last_modified=None
+            available=False if response.status_code == 404 else None,
+            status_code=response.status_code
+        )
+    
+    return availability.put(result)
+
+
+async def probe_sections(
+    base_date: date,
+    sections: List[DOUSection],
+    file_format: FileFormat,
+    use_cache: bool = True
+) -> List[Union[DOUAvailability, Exception]]:
+    """
+    Verifica a disponibilidade de várias seções concorrentemente.
+    
+    Args:
+        base_date: Data da publicação
+        sections: Seções do DOU
+        file_format: Formato do arquivo
+        use_cache: Se pode responder a partir do cache
+        
+    Returns:
+        List[Union[DOUAvailability, Exception]]: Resultado de cada seção, na ordem informada
+    """
+    results = await asyncio.gather(
+        *(
+            probe_availability(base_date, section, file_format, use_cache)
+            for section in sections
+        ),
+        return_exceptions=True
+    )
+    
+    await asyncio.to_thread(get_availability_cache().save)
+    return results
+
+
+async def download_dou_file(
+    base_date: date,
+    section: DOUSection,
+    file_format: FileFormat,
+    force_download: bool = False
+) -> DOUFileInfo:
+    """
+    Baixa um arquivo específico do DOU.
+    
+    Arquivos já em cache são reaproveitados; se a edição for dos últimos
+    cache_revalidate_days dias e a última validação for mais antiga que
+    cache_ttl_hours, o INLABS é consultado com If-Modified-Since antes de
+    reutilizá-los. Edições mais antigas são tratadas como imutáveis.
+    
+    Chamadas concorrentes para o mesmo arquivo são serializadas: a
+    primeira baixa e as demais reaproveitam o arquivo em cache.
+    
+    Args:
+        base_date: Data da publicação
+        section: Seção do DOU
+        file_format: Formato do arquivo
+        force_download: Forçar novo download
+        
+    Returns:
+        DOUFileInfo: Informações do arquivo baixado
+    """
+    file_path = get_local_file_path(base_date, section, file_format, get_config().cache_dir)
+    
+    async with get_file_lock(file_path):
+        return await _download_dou_file(base_date, section, file_format, force_download)
+
+
+async def _download_dou_file(
+    base_date: date,
+    section: DOUSection,
+    file_format: FileFormat,
+    force_download: bool
+) -> DOUFileInfo:
+    """Implementação de download_dou_file, executada sob o lock do arquivo."""
+    
+    with span(
+        "download_dou_file",
+        date=base_date.isoformat(),
+        section=section.value,
+        file_format=file_format.value
+    ) as current:
+        config = get_config()
+        auth = get_auth_instance()
+        
+        # Autentica se necessário (renova sessões expiradas)
+        with span("download.auth"):
+            await auth.authenticate()
+        
+        # Determina caminho local
+        file_path = get_local_file_path(base_date, section, file_format, config.cache_dir)
+        
+        # Constrói URL (necessário mesmo para arquivos em cache)
+        download_url = build_download_url(base_date, section, file_format)
+        
+        cache_manager = get_cache_manager()
+        availability = get_availability_cache()
+        previous_mtime = None
+        
+        # Verifica se arquivo já existe e não deve forçar download
+        if file_path.exists() and not force_download:
+            with span("download.cache_check"):
+                needs_revalidation = await asyncio.to_thread(
+                    cache_manager.needs_revalidation, file_path
+                )
+            if not needs_revalidation:
+                logger.info(f"Arquivo já existe em cache: {file_path}")
+                await asyncio.to_thread(cache_manager.record_access, [file_path])
+                current.set(outcome="cached")
+                return _cached_file_info(file_path, base_date, section, file_format, download_url)
+            
+            logger.info(f"Arquivo em cache passou do TTL, revalidando: {file_path}")
+            previous_mtime = file_path.stat().st_mtime
+        
+        # Evita requisições para arquivos que o INLABS já respondeu não existir
+        if (
+            previous_mtime is None
+            and not force_download
+            and availability.is_known_missing(base_date, section, file_format)
+        ):
+            logger.info(f"Arquivo indisponível segundo verificação recente: {file_path.name}")
+            current.set(outcome="known_missing")
+            return DOUFileInfo(
+                filename=f"{base_date}-{section.value}.{file_format.value.lower()}",
+                date=base_date,
+                section=section,
+                file_format=file_format,
+                file_size=None,
+                file_path=None,
+                download_url=download_url,
+                is_cached=False,
+                last_modified=None
+            )
+        
+        not_found = []
+        
+        def record_missing() -> None:
+            availability.record(base_date, section, file_format, available=False)
+            not_found.append(download_url)
+        
+        # Faz download (limitado por max_concurrent_downloads)
+        headers = auth.get_session_headers()
+        
+        semaphore = get_download_semaphore()
+        with span("download.wait_slot"):
+            await semaphore.acquire()
+        
+        try:
+            with span("download.http", revalidation=previous_mtime is not None) as step:
+                success = await download_file_from_url(
+                    download_url,
+                    file_path,
+                    headers,
+                    config.download_timeout,
+                    if_modified_since=previous_mtime,
+                    on_not_found=record_missing
+                )
+                step.set(success=success)
+        finally:
+            semaphore.release()
+        
+        if not_found:
+            await asyncio.to_thread(availability.save)
+        
+        if success and file_path.exists():
+            modified = file_path.stat().st_mtime != previous_mtime
+            await asyncio.to_thread(cache_manager.record_download, file_path)
+            cache_manager.request_enforcement()
+            availability.record(
+                base_date, section, file_format, available=True, file_size=file_path.stat().st_size
+            )
+            
+            if not modified:
+                current.set(outcome="not_modified")
+                return _cached_file_info(file_path, base_date, section, file_format, download_url)
+            
+            current.set(outcome="downloaded", bytes=file_path.stat().st_size)
+            
+            # Atualiza o índice de busca com o novo arquivo
+            if file_format == FileFormat.XML:
+                try:
+                    with span("download.index"):
+                        await get_search_index().index_zip(file_path, force=True)
+                except Exception as e:
+                    logger.warning(f"Falha ao indexar {file_path}: {e}")
+            
+            return DOUFileInfo(
+                filename=file_path.name,
+                date=base_date,
+                section=section,
+                file_format=file_format,
+                file_size=file_path.stat().st_size,
+                file_path=str(file_path),
+                download_url=download_url,
+                is_cached=False,
+                last_modified=datetime.now()
+            )
+        elif previous_mtime is not None and file_path.exists():
+            # Sem resposta válida do INLABS, a cópia local continua sendo usada
+            logger.warning(f"Não foi possível revalidar {file_path}, usando a cópia em cache")
+            current.set(outcome="stale_cache")
+            await asyncio.to_thread(cache_manager.record_access, [file_path])
+            return _cached_file_info(file_path, base_date, section, file_format, download_url)
+        else:
+            # Retorna info mesmo se download falhou
+            current.set(outcome="not_found" if not_found else "failed")
+            return DOUFileInfo(
+                filename=f"{base_date}-{section.value}.{file_format.value.lower()}",
+                date=base_date,
+                section=section,
+                file_format=file_format,
+                file_size=None,
+                file_path=None,
+                download_url=download_url,
+                is_cached=False,
+                last_modified=None
+            )
+
+
+async def download_dou_sections(
+    base_date: date,
+    sections: List[DOUSection],
+    file_format: FileFormat,
+    force_download: bool = False
+) -> List[Union[DOUFileInfo, Exception]]:
+    """
+    Baixa várias seções do DOU concorrentemente.
+    
+    As seções são disparadas ao mesmo tempo; o número de transferências
+    simultâneas é limitado pelo semáforo de download.
+    
+    Args:
+        base_date: Data da publicação
+        sections: Seções do DOU
+        file_format: Formato do arquivo
+        force_download: Forçar novo download
+        
+    Returns:
+        List[Union[DOUFileInfo, Exception]]: Resultado de cada seção, na ordem informada
+    """
+    return await asyncio.gather(
+        *(
+            download_dou_file(base_date, section, file_format, force_download)
+            for section in sections
+        ),
+        return_exceptions=True
+    )
+
+
+def format_section_results(
+    sections: List[DOUSection],
+    file_infos: List[Union[DOUFileInfo, Exception]]
+) -> Tuple[List[str], int]:
+    """
+    Formata o resultado do download de cada seção.
+    
+    Args:
+        sections: Seções solicitadas
+        file_infos: Resultados retornados por download_dou_sections
+        
+    Returns:
+        Tuple[List[str], int]: Linhas por seção e quantidade de downloads bem-sucedidos
+    """
+    results = []
+    successful_downloads = 0
+    
+    for section, file_info in zip(sections, file_infos):
+        if isinstance(file_info, Exception):
+            logger.error(f"Erro ao baixar seção {section}: {file_info}")
+            results.append(f"Seção {section.value}: ❌ Erro - {str(file_info)}")
+            continue
+        
+        if file_info.file_path and Path(file_info.file_path).exists():
+            successful_downloads += 1
+            status = "✅ Sucesso"
+            details = f"Tamanho: {file_info.file_size} bytes"
+        else:
+            status = "❌ Não encontrado"
+            details = "Arquivo não disponível para esta data"
+        
+        results.append(
+            f"Seção {section.value}: {status}\n"
+            f"  Arquivo: {file_info.filename}\n"
+            f"  {details}"
         )
+    
+    return results, successful_downloads
 
 
 def register_download_tools(mcp: FastMCP) -> None:
     """Registra as ferramentas de download no servidor MCP."""
     
     @mcp.tool()
+    @instrument()
     async def download_dou_xml(
         date_str: str,
         sections: Optional[str] = "DO1 DO2 DO3",
@@ -252,36 +750,14 @@ def register_download_tools(mcp: FastMCP) -> None:
             auth = get_auth_instance()
             await auth.authenticate()
             
-            results = []
-            successful_downloads = 0
-            
-            # Download de cada seção
-            for section in section_list:
-                try:
-                    file_info = await download_dou_file(
-                        target_date,
-                        section,
-                        FileFormat.XML,
-                        force_download
-                    )
-                    
-                    if file_info.file_path and Path(file_info.file_path).exists():
-                        successful_downloads += 1
-                        status = "✅ Sucesso"
-                        details = f"Tamanho: {file_info.file_size} bytes"
-                    else:
-                        status = "❌ Não encontrado"
-                        details = "Arquivo não disponível para esta data"
-                    
-                    results.append(
-                        f"Seção {section.value}: {status}\n"
-                        f"  Arquivo: {file_info.filename}\n"
-                        f"  {details}"
-                    )
-                    
-                except Exception as e:
-                    logger.error(f"Erro ao baixar seção {section}: {e}")
-                    results.append(f"Seção {section.value}: ❌ Erro - {str(e)}")
+            # Download concorrente das seções (limitado por max_concurrent_downloads)
+            file_infos = await download_dou_sections(
+                target_date,
+                section_list,
+                FileFormat.XML,
+                force_download
+            )
+            results, successful_downloads = format_section_results(section_list, file_infos)
             
             execution_time = (time.time() - start_time) * 1000
             
@@ -302,6 +778,7 @@ def register_download_tools(mcp: FastMCP) -> None:
             return f"❌ Erro: {str(e)}"
     
     @mcp.tool()
+    @instrument()
     async def download_dou_pdf(
         date_str: str,
         sections: Optional[str] = "do1 do2 do3",
@@ -337,36 +814,14 @@ def register_download_tools(mcp: FastMCP) -> None:
             auth = get_auth_instance()
             await auth.authenticate()
             
-            results = []
-            successful_downloads = 0
-            
-            # Download de cada seção
-            for section in section_list:
-                try:
-                    file_info = await download_dou_file(
-                        target_date,
-                        section,
-                        FileFormat.PDF,
-                        force_download
-                    )
-                    
-                    if file_info.file_path and Path(file_info.file_path).exists():
-                        successful_downloads += 1
-                        status = "✅ Sucesso"
-                        details = f"Tamanho: {file_info.file_size} bytes"
-                    else:
-                        status = "❌ Não encontrado"
-                        details = "Arquivo não disponível para esta data"
-                    
-                    results.append(
-                        f"Seção {section.value}: {status}\n"
-                        f"  Arquivo: {file_info.filename}\n"
-                        f"  {details}"
-                    )
-                    
-                except Exception as e:
-                    logger.error(f"Erro ao baixar seção {section}: {e}")
-                    results.append(f"Seção {section.value}: ❌ Erro - {str(e)}")
+            # Download concorrente das seções (limitado por max_concurrent_downloads)
+            file_infos = await download_dou_sections(
+                target_date,
+                section_list,
+                FileFormat.PDF,
+                force_download
+            )
+            results, successful_downloads = format_section_results(section_list, file_infos)
             
             execution_time = (time.time() - start_time) * 1000
             
@@ -387,18 +842,24 @@ def register_download_tools(mcp: FastMCP) -> None:
             return f"❌ Erro: {str(e)}"
     
     @mcp.tool()
+    @instrument()
     async def check_file_availability(
         date_str: str,
         sections: Optional[str] = "DO1 DO2 DO3",
-        file_format: str = "xml"
+        file_format: str = "xml",
+        refresh: bool = False
     ) -> str:
         """
         Verifica disponibilidade de arquivos DOU sem baixá-los.
         
+        As seções são verificadas concorrentemente e os resultados ficam em
+        cache (404 de datas passadas por bem mais tempo que os positivos).
+        
         Args:
             date_str: Data no formato YYYY-MM-DD (ex: 2024-09-17)
             sections: Seções separadas por espaço (ex: "DO1 DO2 DO3")
             file_format: Formato do arquivo ("xml" ou "pdf")
+            refresh: Ignorar o cache e consultar o INLABS novamente
         """
         start_time = time.time()
         
@@ -416,46 +877,56 @@ def register_download_tools(mcp: FastMCP) -> None:
             auth = get_auth_instance()
             await auth.authenticate()
             
+            # Verificações concorrentes; 200/404 recentes vêm do cache
+            probes = await probe_sections(
+                target_date,
+                section_list,
+                format_enum,
+                use_cache=not refresh
+            )
+            
             results = []
             available_count = 0
+            cached_count = 0
             
-            # Verifica cada seção
-            for section in section_list:
-                try:
-                    download_url = build_download_url(target_date, section, format_enum)
-                    headers = auth.get_session_headers()
-                    
-                    # Faz apenas um HEAD request para verificar
-                    async with httpx.AsyncClient() as client:
-                        response = await client.head(download_url, headers=headers)
-                    
-                    if response.status_code == 200:
-                        available_count += 1
-                        status = "✅ Disponível"
-                        size = response.headers.get('content-length', 'Desconhecido')
-                        details = f"Tamanho: {size} bytes" if size != 'Desconhecido' else "Tamanho: Não informado"
-                    elif response.status_code == 404:
-                        status = "❌ Não disponível"
-                        details = "Arquivo não encontrado no servidor"
-                    else:
-                        status = "⚠️ Incerto"
-                        details = f"Status HTTP: {response.status_code}"
-                    
-                    results.append(
-                        f"Seção {section.value}: {status}\n"
-                        f"  URL: {download_url}\n"
-                        f"  {details}"
+            for section, probe in zip(section_list, probes):
+                if isinstance(probe, Exception):
+                    logger.error(f"Erro ao verificar seção {section}: {probe}")
+                    results.append(f"Seção {section.value}: ❌ Erro - {str(probe)}")
+                    continue
+                
+                if probe.from_cache:
+                    cached_count += 1
+                
+                if probe.available:
+                    available_count += 1
+                    status = "✅ Disponível"
+                    details = (
+                        f"Tamanho: {probe.file_size} bytes" if probe.file_size is not None
+                        else "Tamanho: Não informado"
                     )
-                    
-                except Exception as e:
-                    logger.error(f"Erro ao verificar seção {section}: {e}")
-                    results.append(f"Seção {section.value}: ❌ Erro - {str(e)}")
+                elif probe.available is False:
+                    status = "❌ Não disponível"
+                    details = "Arquivo não encontrado no servidor"
+                else:
+                    status = "⚠️ Incerto"
+                    details = f"Status HTTP: {probe.status_code}"
+                
+                if probe.from_cache:
+                    details += f" (verificado em {probe.checked_at:%Y-%m-%d %H:%M})"
+                
+                results.append(
+                    f"Seção {section.value}: {status}\n"
+                    f"  URL: {build_download_url(target_date, section, format_enum)}\n"
+                    f"  {details}"
+                )
             
             execution_time = (time.time() - start_time) * 1000
             
             summary = (
                 f"🔍 Verificação DOU {format_enum.value.upper()} - {date_str}\n\n"
                 f"✅ Arquivos disponíveis: {available_count}/{len(section_list)}\n"
+                f"💾 Respostas do cache: {cached_count}/{len(section_list)}\n"
                 f"⏱️ Tempo de verificação: {execution_time:.2f}ms\n\n"
                 f"📋 Resultados detalhados:\n" +
                 "\n\n".join(results)
@@ -0,0 +1,223 @@
+"""
+Cliente HTTP assíncrono compartilhado para o tráfego com o INLABS.
+
+Este módulo mantém um httpx.AsyncClient de longa duração por loop de
+eventos (normalmente um por processo), criado sob demanda, com keep-alive e
+limites de pool derivados da configuração, para que downloads, verificações
+de disponibilidade e autenticação reutilizem as mesmas conexões TCP/TLS.
+"""
+
+import asyncio
+import logging
+import weakref
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+import httpx
+
+from ..config.settings import get_config
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_HEADERS = {
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "User-Agent": "Mozilla/5.0 (compatible; MCP-DOU-Server/1.0)"
+}
+
+
+async def _close_on_loop_shutdown(client: httpx.AsyncClient) -> AsyncIterator[None]:
+    """
+    Fecha o cliente quando o loop em que foi criado é finalizado.
+    
+    Geradores assíncronos suspensos são fechados por
+    loop.shutdown_asyncgens() (chamado por asyncio.run) enquanto o loop
+    ainda funciona, único momento em que as conexões do cliente podem ser
+    encerradas corretamente.
+    """
+    try:
+        yield
+    finally:
+        if not client.is_closed:
+            await client.aclose()
+            logger.debug("Cliente HTTP do loop encerrado fechado")
+
+
+class INLABSHttpClient:
+    """
+    Wrapper dos httpx.AsyncClient de longa duração, um por loop de eventos.
+    
+    Contabiliza as requisições, as conexões abertas e as requisições
+    atendidas por conexões já existentes, a partir dos eventos de trace do
+    httpcore.
+    """
+    
+    def __init__(self):
+        self.config = get_config()
+        # Um cliente só pode ser usado no loop em que foi criado
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Tuple[httpx.AsyncClient, AsyncIterator[None]]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        
+        self.requests_count = 0
+        self.connections_opened = 0
+        self.connections_reused = 0
+    
+    def _build_client(self) -> httpx.AsyncClient:
+        """Cria o cliente HTTP com os limites de pool configurados."""
+        
+        max_concurrent = max(1, self.config.max_concurrent_downloads)
+        limits = httpx.Limits(
+            max_connections=max_concurrent * 2,
+            max_keepalive_connections=max_concurrent,
+            keepalive_expiry=self.config.http_keepalive_expiry
+        )
+        
+        http2 = self.config.http2_enabled
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("HTTP/2 solicitado mas o pacote 'h2' não está instalado; usando HTTP/1.1")
+                http2 = False
+        
+        logger.info(
+            f"Criando cliente HTTP compartilhado (pool: {limits.max_connections}, "
+            f"keep-alive: {limits.max_keepalive_connections}, HTTP/2: {http2})"
+        )
+        
+        return httpx.AsyncClient(
+            headers=DEFAULT_HEADERS,
+            timeout=self.config.download_timeout,
+            limits=limits,
+            http2=http2
+        )
+    
+    def get_client(self) -> httpx.AsyncClient:
+        """
+        Retorna o cliente HTTP do loop atual, criando-o na primeira utilização.
+        
+        O cliente é fechado automaticamente quando o loop é finalizado
+        (asyncio.run), então trocar de loop não deixa conexões abertas.
+        
+        Returns:
+            httpx.AsyncClient: Cliente compartilhado
+        """
+        loop = asyncio.get_running_loop()
+        
+        entry = self._clients.get(loop)
+        if entry is None or entry[0].is_closed:
+            client = self._build_client()
+            closer = _close_on_loop_shutdown(client)
+            # Avança o gerador até o yield, registrando-o para shutdown_asyncgens
+            asyncio.ensure_future(anext(closer, None))
+            entry = (client, closer)
+            self._clients[loop] = entry
+        
+        return entry[0]
+    
+    def _prepare(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Adiciona a extensão de trace aos argumentos da requisição.
+        
+        Uma requisição cuja resposta chega sem que uma conexão TCP tenha sido
+        aberta durante ela foi atendida por uma conexão reaproveitada do pool.
+        """
+        self.requests_count += 1
+        connected = False
+        
+        async def trace(event_name: str, info: Dict[str, Any]) -> None:
+            nonlocal connected
+            
+            if event_name == "connection.connect_tcp.complete":
+                connected = True
+                self.connections_opened += 1
+            elif event_name.endswith(".receive_response_headers.complete") and not connected:
+                self.connections_reused += 1
+        
+        extensions = dict(kwargs.pop("extensions", None) or {})
+        extensions["trace"] = trace
+        kwargs["extensions"] = extensions
+        return kwargs
+    
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """
+        Executa uma requisição usando o cliente compartilhado.
+        
+        Args:
+            method: Método HTTP
+            url: URL de destino
+            **kwargs: Argumentos repassados ao httpx
+        
+        Returns:
+            httpx.Response: Resposta recebida
+        """
+        client = self.get_client()
+        return await client.request(method, url, **self._prepare(kwargs))
+    
+    def stream(self, method: str, url: str, **kwargs: Any):
+        """
+        Abre uma resposta em streaming usando o cliente compartilhado.
+        
+        Args:
+            method: Método HTTP
+            url: URL de destino
+            **kwargs: Argumentos repassados ao httpx
+        
+        Returns:
+            Gerenciador de contexto assíncrono com a resposta
+        """
+        client = self.get_client()
+        return client.stream(method, url, **self._prepare(kwargs))
+    
+    async def aclose(self) -> None:
+        """Fecha o cliente do loop atual e suas conexões."""
+        
+        entry = self._clients.pop(asyncio.get_running_loop(), None)
+        if entry is None:
+            return
+        
+        client, closer = entry
+        if not client.is_closed:
+            await client.aclose()
+            logger.info("Cliente HTTP compartilhado encerrado")
+        await closer.aclose()
+    
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Retorna estatísticas de uso das conexões.
+        
+        Returns:
+            Dict[str, int]: Requisições, conexões abertas e reaproveitadas
+        """
+        return {
+            "requests": self.requests_count,
+            "connections_opened": self.connections_opened,
+            "connections_reused": self.connections_reused,
+        }
+
+
+# Instância global do cliente HTTP
+_http_client: Optional[INLABSHttpClient] = None
+
+
+def get_http_client() -> INLABSHttpClient:
+    """
+    Obtém a instância global do cliente HTTP.
+    
+    Returns:
+        INLABSHttpClient: Cliente compartilhado
+    """
+    global _http_client
+    
+    if _http_client is None:
+        _http_client = INLABSHttpClient()
+    
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Fecha o cliente HTTP global, se tiver sido criado."""
+    
+    if _http_client is not None:
+        await _http_client.aclose()
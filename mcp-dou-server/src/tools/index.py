@@ -0,0 +1,1322 @@
+"""
+Índice invertido persistente para o conteúdo do DOU.
+
+Este módulo mantém em disco (SQLite) um índice invertido dos artigos
+contidos nos arquivos ZIP do cache, permitindo responder buscas a partir
+das listas de ocorrências sem reabrir e reprocessar os XMLs a cada consulta.
+A tabela de documentos funciona também como catálogo de metadados, com
+índices por data, seção, tipo e órgão para filtros e contagens em SQL.
+"""
+
+import asyncio
+import heapq
+import json
+import logging
+import math
+import re
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..config.settings import get_config
+from ..models.dou_models import DOUArticle, DOUArticleContent, DOUArticleMetadata
+from .parser import DOUXMLParser, build_search_text
+from .query import (
+    AndNode,
+    DateClause,
+    MetadataClause,
+    NotNode,
+    OrNode,
+    QueryNode,
+    TextClause,
+)
+from .text import fold_text
+from .tracing import span
+
+
+logger = logging.getLogger(__name__)
+
+
+# Versão do esquema; uma alteração força a reconstrução do índice
+INDEX_SCHEMA_VERSION = 5
+
+# Campos indexados (a posição na tupla é o identificador do campo nas postings)
+INDEXED_FIELDS = (
+    "identifica",
+    "ementa",
+    "titulo",
+    "subtitulo",
+    "texto",
+    "name",
+    "art_category",
+)
+
+# Peso de cada campo na pontuação BM25F (mesma ordem de INDEXED_FIELDS)
+FIELD_BOOSTS = (3.0, 2.0, 2.5, 1.5, 1.0, 1.5, 0.5)
+
+# Parâmetros do BM25: saturação da frequência e normalização pelo tamanho
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_TOKEN_RE = re.compile(r"\w+")
+_ZIP_NAME_RE = re.compile(r"^(\d{4}-\d{2}-\d{2})-(DO\d+E?)\.zip$")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS segments (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    pub_date TEXT,
+    section TEXT,
+    file_size INTEGER NOT NULL,
+    file_mtime REAL NOT NULL,
+    doc_count INTEGER NOT NULL,
+    field_lengths TEXT NOT NULL,
+    indexed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS documents (
+    segment_id INTEGER NOT NULL,
+    local_id INTEGER NOT NULL,
+    member TEXT,
+    pub_date TEXT,
+    pub_name TEXT,
+    art_type TEXT,
+    art_category TEXT,
+    metadata TEXT NOT NULL,
+    identifica TEXT,
+    data TEXT,
+    ementa TEXT,
+    titulo TEXT,
+    subtitulo TEXT,
+    texto TEXT NOT NULL,
+    search_text TEXT,
+    PRIMARY KEY (segment_id, local_id)
+);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    segment_id INTEGER NOT NULL,
+    doc_freq INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (term, segment_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_postings_segment ON postings(segment_id);
+CREATE INDEX IF NOT EXISTS idx_documents_pub_date ON documents(pub_date);
+CREATE INDEX IF NOT EXISTS idx_documents_pub_name ON documents(pub_name);
+CREATE INDEX IF NOT EXISTS idx_documents_art_type ON documents(art_type);
+CREATE INDEX IF NOT EXISTS idx_documents_art_category ON documents(art_category);
+"""
+
+DocKey = Tuple[int, int]
+
+# Ocorrências de um termo: artigo -> campo -> posições
+TermOccurrences = Dict[DocKey, Dict[int, set]]
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Divide um texto em termos normalizados para indexação.
+    
+    Args:
+        text: Texto de entrada
+    
+    Returns:
+        List[str]: Termos em minúsculas e sem acentos, na ordem em que aparecem
+    """
+    return _TOKEN_RE.findall(fold_text(text))
+
+
+def _iso_date(value: Optional[str]) -> Optional[str]:
+    """Converte a data DD/MM/AAAA dos metadados para AAAA-MM-DD."""
+    
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%d/%m/%Y").date().isoformat()
+    except ValueError:
+        return value
+
+
+def _fold(value: Optional[str]) -> Optional[str]:
+    """Minúsculas sem acentos (o lower() do SQLite só trata ASCII)."""
+    return fold_text(value) if value is not None else None
+
+
+def _field_values(article: DOUArticle) -> Tuple[Optional[str], ...]:
+    """Retorna os valores dos campos indexados de um artigo."""
+    return (
+        article.content.identifica,
+        article.content.ementa,
+        article.content.titulo,
+        article.content.subtitulo,
+        article.content.texto,
+        article.metadata.name,
+        article.metadata.art_category,
+    )
+
+
+class DOUSearchIndex:
+    """
+    Índice invertido (termo → ocorrências) armazenado em SQLite.
+    
+    Cada arquivo ZIP do cache corresponde a um segmento do índice, que
+    pode ser atualizado ou removido isoladamente. As ocorrências guardam
+    o artigo, o campo e as posições de cada termo.
+    """
+    
+    def __init__(self, db_path: Optional[Path] = None):
+        self.config = get_config()
+        self.parser = DOUXMLParser()
+        self.db_path = db_path or Path(self.config.cache_dir) / ".state" / "search_index.db"
+        
+        self._write_lock = threading.Lock()
+        self._sync_lock = asyncio.Lock()
+        self._initialized = False
+        self._generation = 0
+    
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Abre uma conexão com o banco do índice, garantindo o esquema."""
+        
+        if not self._initialized:
+            self._initialize()
+        
+        conn = sqlite3.connect(str(self.db_path), timeout=30)
+        conn.create_function("py_fold", 1, _fold, deterministic=True)
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+    
+    def _initialize(self) -> None:
+        """Cria o banco e recria as tabelas se a versão do esquema mudou."""
+        
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        conn = sqlite3.connect(str(self.db_path), timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            
+            if version != INDEX_SCHEMA_VERSION:
+                if version:
+                    logger.info(
+                        f"Esquema do índice alterado ({version} -> {INDEX_SCHEMA_VERSION}), "
+                        f"reconstruindo"
+                    )
+                conn.executescript(
+                    "DROP TABLE IF EXISTS postings;"
+                    "DROP TABLE IF EXISTS documents;"
+                    "DROP TABLE IF EXISTS segments;"
+                )
+                conn.execute(f"PRAGMA user_version = {INDEX_SCHEMA_VERSION}")
+            
+            conn.executescript(_SCHEMA)
+            conn.commit()
+        finally:
+            conn.close()
+        
+        self._initialized = True
+    
+    @property
+    def generation(self) -> int:
+        """
+        Contador incrementado a cada alteração de conteúdo do índice.
+        
+        Resultados calculados com uma geração anterior podem estar
+        desatualizados; deve ser lido antes de consultar o índice.
+        """
+        return self._generation
+    
+    def _bump_generation(self) -> None:
+        """Marca que o conteúdo do índice mudou (chamado após o commit)."""
+        
+        self._generation += 1
+    
+    # ------------------------------------------------------------------
+    # Ingestão
+    # ------------------------------------------------------------------
+    
+    async def index_zip(self, zip_path: Path, force: bool = False) -> bool:
+        """
+        Indexa (ou reindexa) um arquivo ZIP do cache.
+        
+        Args:
+            zip_path: Caminho do arquivo ZIP
+            force: Reindexa mesmo se o segmento estiver atualizado
+        
+        Returns:
+            bool: True se o segmento foi (re)construído
+        """
+        zip_path = Path(zip_path).absolute()
+        stat = zip_path.stat()
+        
+        if not force:
+            states = await asyncio.to_thread(self._segment_states)
+            if states.get(str(zip_path)) == (stat.st_size, stat.st_mtime):
+                return False
+        
+        articles = await self.parser.parse_zip_file(str(zip_path))
+        with span("index.write_segment", articles=len(articles)):
+            await asyncio.to_thread(self._write_segment, zip_path, stat, articles)
+        return True
+    
+    async def sync(self, zip_files: Iterable[Path]) -> int:
+        """
+        Atualiza incrementalmente o índice para os arquivos informados.
+        
+        Arquivos novos ou modificados (tamanho/mtime) são indexados e
+        segmentos cujos arquivos não existem mais são removidos.
+        
+        Args:
+            zip_files: Arquivos ZIP que devem estar indexados
+        
+        Returns:
+            int: Quantidade de segmentos (re)construídos
+        """
+        async with self._sync_lock:
+            states = await asyncio.to_thread(self._segment_states)
+            updated = 0
+            
+            for zip_path in zip_files:
+                zip_path = Path(zip_path).absolute()
+                try:
+                    stat = zip_path.stat()
+                except FileNotFoundError:
+                    continue
+                
+                if states.get(str(zip_path)) == (stat.st_size, stat.st_mtime):
+                    continue
+                
+                try:
+                    articles = await self.parser.parse_zip_file(str(zip_path))
+                    await asyncio.to_thread(self._write_segment, zip_path, stat, articles)
+                    updated += 1
+                except Exception as e:
+                    logger.error(f"Erro ao indexar {zip_path}: {e}")
+            
+            stale = [path for path in states if not Path(path).exists()]
+            if stale:
+                await asyncio.to_thread(self._remove_segments, stale)
+            
+            return updated
+    
+    async def rebuild(self) -> Dict[str, int]:
+        """
+        Reconstrói o índice a partir da estrutura cache/YYYY/MM/*.zip.
+        
+        Returns:
+            Dict[str, int]: Quantidade de segmentos e documentos indexados
+        """
+        async with self._sync_lock:
+            await asyncio.to_thread(self._clear)
+            
+            cache_dir = Path(self.config.cache_dir)
+            zip_files = sorted(
+                path for path in cache_dir.glob("[0-9][0-9][0-9][0-9]/[0-9][0-9]/*.zip")
+                if _ZIP_NAME_RE.match(path.name)
+            )
+            
+            segments = 0
+            documents = 0
+            for zip_path in zip_files:
+                try:
+                    stat = zip_path.stat()
+                    articles = await self.parser.parse_zip_file(str(zip_path))
+                    await asyncio.to_thread(
+                        self._write_segment, zip_path.absolute(), stat, articles
+                    )
+                    segments += 1
+                    documents += len(articles)
+                except Exception as e:
+                    logger.error(f"Erro ao indexar {zip_path}: {e}")
+            
+            logger.info(f"Índice reconstruído: {segments} arquivos, {documents} artigos")
+            return {"segments": segments, "documents": documents}
+    
+    def remove_zip(self, zip_path: Path) -> None:
+        """
+        Remove do índice o segmento de um arquivo ZIP.
+        
+        Args:
+            zip_path: Caminho do arquivo ZIP
+        """
+        self._remove_segments([str(Path(zip_path).absolute())])
+    
+    def get_segment_sizes(self) -> Dict[str, int]:
+        """
+        Estima o espaço que cada segmento ocupa no banco do índice.
+        
+        Conta apenas as páginas em uso: as liberadas por segmentos removidos
+        ficam no arquivo, mas são reaproveitadas pelos próximos. O total é
+        repartido entre os segmentos pela quantidade de artigos.
+        
+        Returns:
+            Dict[str, int]: Bytes estimados por caminho de arquivo ZIP
+        """
+        with self._connection() as conn:
+            page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+            page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+            free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            rows = conn.execute("SELECT path, doc_count FROM segments").fetchall()
+        
+        used = (page_count - free_pages) * page_size
+        documents = sum(doc_count for _, doc_count in rows)
+        if not documents:
+            return {}
+        return {path: used * doc_count // documents for path, doc_count in rows}
+    
+    def _segment_states(self) -> Dict[str, Tuple[int, float]]:
+        """Retorna tamanho e mtime registrados para cada segmento."""
+        
+        with self._connection() as conn:
+            rows = conn.execute("SELECT path, file_size, file_mtime FROM segments").fetchall()
+        return {path: (size, mtime) for path, size, mtime in rows}
+    
+    def _write_segment(self, zip_path: Path, stat, articles: List[DOUArticle]) -> None:
+        """Grava (substituindo) o segmento correspondente a um arquivo ZIP."""
+        
+        match = _ZIP_NAME_RE.match(zip_path.name)
+        pub_date, section = match.groups() if match else (None, None)
+        
+        # Monta as postings: termo -> [[artigo, campo, [posições], tamanho do campo], ...]
+        postings: Dict[str, List[list]] = defaultdict(list)
+        field_lengths = [0] * len(INDEXED_FIELDS)
+        for local_id, article in enumerate(articles):
+            for field_id, value in enumerate(_field_values(article)):
+                if not value:
+                    continue
+                terms = tokenize(value)
+                field_lengths[field_id] += len(terms)
+                positions: Dict[str, List[int]] = defaultdict(list)
+                for position, term in enumerate(terms):
+                    positions[term].append(position)
+                for term, term_positions in positions.items():
+                    postings[term].append([local_id, field_id, term_positions, len(terms)])
+        
+        with self._write_lock, self._connection() as conn:
+            self._delete_segment(conn, str(zip_path))
+            
+            cursor = conn.execute(
+                "INSERT INTO segments "
+                "(path, pub_date, section, file_size, file_mtime, doc_count, field_lengths, indexed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    str(zip_path), pub_date, section,
+                    stat.st_size, stat.st_mtime, len(articles),
+                    json.dumps(field_lengths), time.time()
+                )
+            )
+            segment_id = cursor.lastrowid
+            
+            conn.executemany(
+                "INSERT INTO documents "
+                "(segment_id, local_id, member, pub_date, pub_name, art_type, art_category, "
+                "metadata, identifica, data, ementa, titulo, subtitulo, texto, search_text) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        segment_id,
+                        local_id,
+                        article.source_member,
+                        _iso_date(article.metadata.pub_date),
+                        article.metadata.pub_name,
+                        article.metadata.art_type,
+                        article.metadata.art_category,
+                        article.metadata.model_dump_json(),
+                        article.content.identifica,
+                        article.content.data,
+                        article.content.ementa,
+                        article.content.titulo,
+                        article.content.subtitulo,
+                        article.content.texto,
+                        article.search_text
+                        or build_search_text(article.metadata, article.content),
+                    )
+                    for local_id, article in enumerate(articles)
+                )
+            )
+            
+            conn.executemany(
+                "INSERT INTO postings (term, segment_id, doc_freq, data) VALUES (?, ?, ?, ?)",
+                (
+                    (
+                        term,
+                        segment_id,
+                        len({entry[0] for entry in entries}),
+                        json.dumps(entries, separators=(",", ":")),
+                    )
+                    for term, entries in postings.items()
+                )
+            )
+        
+        self._bump_generation()
+        logger.info(f"Indexado {zip_path.name}: {len(articles)} artigos, {len(postings)} termos")
+    
+    def _remove_segments(self, paths: List[str]) -> None:
+        """Remove segmentos do índice."""
+        
+        with self._write_lock, self._connection() as conn:
+            for path in paths:
+                self._delete_segment(conn, path)
+                logger.info(f"Segmento removido do índice: {path}")
+        self._bump_generation()
+    
+    @staticmethod
+    def _delete_segment(conn: sqlite3.Connection, path: str) -> None:
+        """Apaga um segmento e seus documentos/postings."""
+        
+        row = conn.execute("SELECT id FROM segments WHERE path = ?", (path,)).fetchone()
+        if row is None:
+            return
+        conn.execute("DELETE FROM postings WHERE segment_id = ?", (row[0],))
+        conn.execute("DELETE FROM documents WHERE segment_id = ?", (row[0],))
+        conn.execute("DELETE FROM segments WHERE id = ?", (row[0],))
+    
+    def _clear(self) -> None:
+        """Remove todo o conteúdo do índice."""
+        
+        with self._write_lock, self._connection() as conn:
+            conn.execute("DELETE FROM postings")
+            conn.execute("DELETE FROM documents")
+            conn.execute("DELETE FROM segments")
+        self._bump_generation()
+    
+    # ------------------------------------------------------------------
+    # Consulta
+    # ------------------------------------------------------------------
+    
+    def find_candidates(self, query: str, zip_files: List[Path]) -> List[DocKey]:
+        """
+        Localiza os artigos que contêm os termos da consulta.
+        
+        Os termos devem aparecer em sequência dentro de um mesmo campo; o
+        último termo é tratado como prefixo, para palavras incompletas. A
+        comparação é por palavra (sem acentos nem caixa): "licit" encontra
+        "licitação", mas "citação" não casa com o meio de "licitação".
+        
+        Args:
+            query: Texto buscado
+            zip_files: Arquivos ZIP que delimitam a busca
+        
+        Returns:
+            List[DocKey]: Chaves (segmento, artigo) na ordem dos arquivos
+        """
+        terms = tokenize(query or "")
+        
+        with self._connection() as conn:
+            segment_ids = self._segment_ids(conn, zip_files)
+            if not segment_ids:
+                return []
+            
+            if not terms:
+                keys: List[DocKey] = []
+                for segment_id in segment_ids:
+                    rows = conn.execute(
+                        "SELECT local_id FROM documents WHERE segment_id = ? ORDER BY local_id",
+                        (segment_id,)
+                    ).fetchall()
+                    keys.extend((segment_id, local_id) for (local_id,) in rows)
+                return keys
+            
+            occurrences, _, _ = self._lookup(conn, terms, segment_ids)
+        
+        if not occurrences:
+            return []
+        
+        order = {segment_id: i for i, segment_id in enumerate(segment_ids)}
+        matches = [key for key in occurrences[-1] if self._is_phrase_match(key, occurrences)]
+        return sorted(matches, key=lambda key: (order[key[0]], key[1]))
+    
+    def top_k(
+        self,
+        query: str,
+        zip_files: List[Path],
+        k: int,
+        exclude: Optional[set] = None,
+        publication_type: Optional[str] = None,
+        organ: Optional[str] = None
+    ) -> List[Tuple[DocKey, float]]:
+        """
+        Retorna os k artigos mais relevantes para a consulta (BM25F).
+        
+        Os candidatos são os mesmos de find_candidates; a pontuação soma,
+        para cada termo, o IDF vezes a frequência ponderada pelos pesos de
+        FIELD_BOOSTS e normalizada pelo tamanho de cada campo. A seleção
+        usa um heap limitado a k itens.
+        
+        Args:
+            query: Texto buscado
+            zip_files: Arquivos ZIP que delimitam a busca
+            k: Quantidade de resultados
+            exclude: Chaves a ignorar (já retornadas em chamadas anteriores)
+            publication_type: Trecho do tipo de publicação (filtro do catálogo)
+            organ: Trecho do órgão (filtro do catálogo)
+        
+        Returns:
+            List[Tuple[DocKey, float]]: Chaves e pontuações, da maior para a menor
+        """
+        terms = tokenize(query or "")
+        if not terms or k <= 0:
+            return []
+        
+        with self._connection() as conn:
+            segment_ids = self._segment_ids(conn, zip_files)
+            if not segment_ids:
+                return []
+            
+            occurrences, doc_freqs, field_lengths = self._lookup(conn, terms, segment_ids)
+            if not occurrences:
+                return []
+            
+            allowed: Optional[set] = None
+            if publication_type or organ:
+                allowed = set(self._filter_keys(conn, segment_ids, publication_type, organ))
+            
+            doc_count, avg_lengths = self._collection_stats(conn, segment_ids)
+        
+        idfs = self._idfs(doc_freqs, doc_count)
+        order = {segment_id: i for i, segment_id in enumerate(segment_ids)}
+        
+        # Heap mínimo com os k melhores; o desempate favorece a ordem dos arquivos
+        heap: List[tuple] = []
+        for key in occurrences[-1]:
+            if exclude and key in exclude:
+                continue
+            if allowed is not None and key not in allowed:
+                continue
+            if not self._is_phrase_match(key, occurrences):
+                continue
+            
+            score = self._bm25_score(key, occurrences, idfs, field_lengths[key], avg_lengths)
+            item = (score, -order[key[0]], -key[1], key)
+            if len(heap) < k:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+        
+        return [(item[3], item[0]) for item in sorted(heap, reverse=True)]
+    
+    def execute_plan(
+        self,
+        plan: QueryNode,
+        zip_files: List[Path],
+        k: int
+    ) -> Tuple[List[Tuple[DocKey, float]], Dict[str, Any]]:
+        """
+        Avalia um plano da linguagem de consulta e retorna os k melhores artigos.
+        
+        Em cada AND as cláusulas são avaliadas da mais seletiva para a menos
+        seletiva (estimativas pelo catálogo e pelas postings), cada uma
+        restrita aos candidatos que sobraram das anteriores; a avaliação
+        termina assim que não resta nenhum candidato. A pontuação soma o
+        BM25F das cláusulas de texto satisfeitas fora de um NOT.
+        
+        Args:
+            plan: Raiz do plano (ver query.parse_query)
+            zip_files: Arquivos ZIP que delimitam a busca
+            k: Quantidade de resultados
+        
+        Returns:
+            Tuple[List[Tuple[DocKey, float]], Dict[str, Any]]: Chaves e
+            pontuações (da maior para a menor) e detalhes da execução
+            ('matches': total de artigos que atendem ao plano; 'steps':
+            cláusulas na ordem avaliada, com a quantidade de candidatos)
+        """
+        details: Dict[str, Any] = {"matches": 0, "steps": []}
+        if k <= 0:
+            return [], details
+        
+        with self._connection() as conn:
+            segment_ids = self._segment_ids(conn, zip_files)
+            if not segment_ids:
+                return [], details
+            
+            execution = _PlanExecution(conn, segment_ids)
+            matches = execution.evaluate(plan, None, scoring=True)
+            scores = execution.scores(matches)
+        
+        details["matches"] = len(matches)
+        details["steps"] = execution.steps
+        
+        order = {segment_id: i for i, segment_id in enumerate(segment_ids)}
+        ranked = heapq.nlargest(
+            k,
+            ((scores.get(key, 0.0), -order[key[0]], -key[1], key) for key in matches)
+        )
+        return [(item[3], item[0]) for item in ranked], details
+    
+    @staticmethod
+    def _idfs(doc_freqs: List[int], doc_count: int) -> List[float]:
+        """Calcula o IDF (BM25) de cada termo."""
+        
+        return [
+            math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+            for df in (min(df, doc_count) for df in doc_freqs)
+        ]
+    
+    @staticmethod
+    def _lookup(
+        conn: sqlite3.Connection,
+        terms: List[str],
+        segment_ids: List[int],
+        prefix_last: bool = True,
+        restrict: Optional[set] = None,
+        field_ids: Optional[set] = None
+    ) -> Tuple[List[TermOccurrences], List[int], Dict[DocKey, Dict[int, int]]]:
+        """
+        Lê as postings dos termos, restringindo-as aos artigos com todos eles.
+        
+        Args:
+            conn: Conexão com o índice
+            terms: Termos em sequência
+            segment_ids: Segmentos no escopo da busca
+            prefix_last: Se o último termo vale como prefixo
+            restrict: Artigos candidatos (None = todos do escopo)
+            field_ids: Campos considerados (None = todos)
+        
+        Returns:
+            Ocorrências por termo (vazio se algum termo não ocorre), número
+            de artigos com cada termo e tamanho dos campos dos candidatos
+        """
+        occurrences: List[TermOccurrences] = []
+        doc_freqs: List[int] = []
+        field_lengths: Dict[DocKey, Dict[int, int]] = defaultdict(dict)
+        candidates: Optional[set] = restrict
+        
+        for i, term in enumerate(terms):
+            if prefix_last and i == len(terms) - 1:
+                condition, params = "term >= ? AND term < ?", (term, term + "\U0010ffff")
+            else:
+                condition, params = "term = ?", (term,)
+            
+            # O escopo vai para o SQL: postings de outros segmentos nem são lidas
+            rows = []
+            for start in range(0, len(segment_ids), 500):
+                batch = segment_ids[start:start + 500]
+                rows.extend(conn.execute(
+                    f"SELECT segment_id, doc_freq, data FROM postings WHERE {condition} "
+                    f"AND segment_id IN ({','.join('?' * len(batch))})",
+                    (*params, *batch)
+                ).fetchall())
+            
+            term_occurrences: TermOccurrences = defaultdict(lambda: defaultdict(set))
+            doc_freq = 0
+            for segment_id, segment_doc_freq, data in rows:
+                doc_freq += segment_doc_freq
+                for local_id, field_id, positions, field_length in json.loads(data):
+                    if field_ids is not None and field_id not in field_ids:
+                        continue
+                    key = (segment_id, local_id)
+                    if candidates is None or key in candidates:
+                        term_occurrences[key][field_id].update(positions)
+                        field_lengths[key][field_id] = field_length
+            
+            candidates = set(term_occurrences)
+            if not candidates:
+                return [], [], {}
+            occurrences.append(term_occurrences)
+            doc_freqs.append(doc_freq)
+        
+        return occurrences, doc_freqs, field_lengths
+    
+    @staticmethod
+    def _collection_stats(
+        conn: sqlite3.Connection,
+        segment_ids: List[int]
+    ) -> Tuple[int, List[float]]:
+        """Retorna o total de artigos e o tamanho médio de cada campo no escopo."""
+        
+        doc_count = 0
+        totals = [0] * len(INDEXED_FIELDS)
+        placeholders = ",".join("?" * len(segment_ids))
+        rows = conn.execute(
+            f"SELECT doc_count, field_lengths FROM segments WHERE id IN ({placeholders})",
+            segment_ids
+        ).fetchall()
+        for segment_doc_count, lengths in rows:
+            doc_count += segment_doc_count
+            for field_id, length in enumerate(json.loads(lengths)):
+                totals[field_id] += length
+        
+        return doc_count, [max(total / max(doc_count, 1), 1.0) for total in totals]
+    
+    @staticmethod
+    def _bm25_score(
+        key: DocKey,
+        occurrences: List[TermOccurrences],
+        idfs: List[float],
+        field_lengths: Dict[int, int],
+        avg_lengths: List[float]
+    ) -> float:
+        """Calcula a pontuação BM25F de um artigo."""
+        
+        score = 0.0
+        for term_occurrences, idf in zip(occurrences, idfs):
+            weighted_tf = 0.0
+            for field_id, positions in term_occurrences[key].items():
+                norm = 1 - BM25_B + BM25_B * field_lengths[field_id] / avg_lengths[field_id]
+                weighted_tf += FIELD_BOOSTS[field_id] * len(positions) / norm
+            score += idf * weighted_tf / (BM25_K1 + weighted_tf)
+        return score
+    
+    @staticmethod
+    def _is_phrase_match(key: DocKey, occurrences: List[TermOccurrences]) -> bool:
+        """Verifica se os termos ocorrem em posições consecutivas de um campo."""
+        
+        first = occurrences[0][key]
+        for field_id, start_positions in first.items():
+            for start in start_positions:
+                if all(
+                    start + offset in occurrences[offset][key].get(field_id, ())
+                    for offset in range(1, len(occurrences))
+                ):
+                    return True
+        return False
+    
+    @staticmethod
+    def _segment_ids(conn: sqlite3.Connection, zip_files: List[Path]) -> List[int]:
+        """Converte caminhos de arquivos ZIP em identificadores de segmento."""
+        
+        by_path = dict(conn.execute("SELECT path, id FROM segments").fetchall())
+        segment_ids = []
+        for zip_path in zip_files:
+            segment_id = by_path.get(str(Path(zip_path).absolute()))
+            if segment_id is not None:
+                segment_ids.append(segment_id)
+        return segment_ids
+    
+    def load_articles(self, keys: List[DocKey]) -> List[DOUArticle]:
+        """
+        Carrega os artigos armazenados no índice.
+        
+        Args:
+            keys: Chaves (segmento, artigo) a carregar
+        
+        Returns:
+            List[DOUArticle]: Artigos na mesma ordem das chaves
+        """
+        loaded = self.load_article_map(keys)
+        return [loaded[key] for key in keys if key in loaded]
+    
+    def load_article_map(self, keys: List[DocKey]) -> Dict[DocKey, DOUArticle]:
+        """
+        Carrega os artigos armazenados no índice, indexados pela chave.
+        
+        Args:
+            keys: Chaves (segmento, artigo) a carregar
+        
+        Returns:
+            Dict[DocKey, DOUArticle]: Artigos encontrados
+        """
+        if not keys:
+            return {}
+        
+        by_segment: Dict[int, List[int]] = defaultdict(list)
+        for segment_id, local_id in keys:
+            by_segment[segment_id].append(local_id)
+        
+        loaded: Dict[DocKey, DOUArticle] = {}
+        with self._connection() as conn:
+            for segment_id, local_ids in by_segment.items():
+                row = conn.execute(
+                    "SELECT path, indexed_at FROM segments WHERE id = ?", (segment_id,)
+                ).fetchone()
+                source_zip, extracted_at = (
+                    (row[0], datetime.fromtimestamp(row[1])) if row else (None, datetime.now())
+                )
+                placeholders = ",".join("?" * len(local_ids))
+                rows = conn.execute(
+                    "SELECT local_id, member, metadata, identifica, data, ementa, titulo, "
+                    "subtitulo, texto, search_text "
+                    f"FROM documents WHERE segment_id = ? AND local_id IN ({placeholders})",
+                    (segment_id, *local_ids)
+                ).fetchall()
+                
+                for (
+                    local_id, member, metadata, identifica, data, ementa, titulo, subtitulo, texto,
+                    search_text
+                ) in rows:
+                    loaded[(segment_id, local_id)] = DOUArticle(
+                        metadata=DOUArticleMetadata.model_validate_json(metadata),
+                        content=DOUArticleContent(
+                            identifica=identifica,
+                            data=data,
+                            ementa=ementa,
+                            titulo=titulo,
+                            subtitulo=subtitulo,
+                            texto=texto
+                        ),
+                        source_zip=source_zip,
+                        source_member=member,
+                        search_text=search_text,
+                        extracted_at=extracted_at
+                    )
+        
+        return loaded
+    
+    # ------------------------------------------------------------------
+    # Catálogo de metadados
+    # ------------------------------------------------------------------
+    
+    @staticmethod
+    def _metadata_filter(
+        publication_type: Optional[str],
+        organ: Optional[str]
+    ) -> Tuple[str, List[str]]:
+        """Monta a condição SQL dos filtros de tipo e órgão (trecho, sem caixa e acentos)."""
+        
+        conditions = []
+        params = []
+        if publication_type:
+            conditions.append("instr(py_fold(art_type), ?) > 0")
+            params.append(fold_text(publication_type))
+        if organ:
+            conditions.append("instr(py_fold(art_category), ?) > 0")
+            params.append(fold_text(organ))
+        
+        return "".join(f" AND {condition}" for condition in conditions), params
+    
+    def _filter_keys(
+        self,
+        conn: sqlite3.Connection,
+        segment_ids: List[int],
+        publication_type: Optional[str] = None,
+        organ: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[DocKey]:
+        """Retorna as chaves dos artigos que atendem aos filtros, na ordem dos arquivos."""
+        
+        condition, params = self._metadata_filter(publication_type, organ)
+        keys: List[DocKey] = []
+        for segment_id in segment_ids:
+            # LIMIT negativo no SQLite significa "sem limite"
+            if limit is not None and int(limit) <= len(keys):
+                break
+            sql = f"SELECT local_id FROM documents WHERE segment_id = ?{condition} ORDER BY local_id"
+            if limit is not None:
+                sql += f" LIMIT {int(limit) - len(keys)}"
+            rows = conn.execute(sql, (segment_id, *params)).fetchall()
+            keys.extend((segment_id, local_id) for (local_id,) in rows)
+        return keys
+    
+    def filter_keys(
+        self,
+        zip_files: List[Path],
+        publication_type: Optional[str] = None,
+        organ: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[DocKey]:
+        """
+        Lista os artigos pelos metadados, sem consultar os ZIPs.
+        
+        Args:
+            zip_files: Arquivos ZIP que delimitam a busca
+            publication_type: Trecho do tipo de publicação
+            organ: Trecho do órgão (categoria)
+            limit: Quantidade máxima de artigos (None = todos)
+        
+        Returns:
+            List[DocKey]: Chaves (segmento, artigo) na ordem dos arquivos
+        """
+        with self._connection() as conn:
+            segment_ids = self._segment_ids(conn, zip_files)
+            if not segment_ids:
+                return []
+            return self._filter_keys(conn, segment_ids, publication_type, organ, limit)
+    
+    def count_metadata(
+        self,
+        zip_files: List[Path],
+        publication_type: Optional[str] = None,
+        organ: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Conta os artigos por tipo, categoria e seção usando o catálogo.
+        
+        Args:
+            zip_files: Arquivos ZIP que delimitam a contagem
+            publication_type: Trecho do tipo de publicação
+            organ: Trecho do órgão (categoria)
+        
+        Returns:
+            Dict[str, Any]: Total ('total') e contagens em 'by_type',
+            'by_category' e 'by_section'
+        """
+        counts: Dict[str, Any] = {
+            "total": 0,
+            "by_type": {},
+            "by_category": {},
+            "by_section": {},
+        }
+        
+        with self._connection() as conn:
+            segment_ids = self._segment_ids(conn, zip_files)
+            if not segment_ids:
+                return counts
+            
+            condition, params = self._metadata_filter(publication_type, organ)
+            placeholders = ",".join("?" * len(segment_ids))
+            scope = f"FROM documents WHERE segment_id IN ({placeholders}){condition}"
+            scope_params = (*segment_ids, *params)
+            
+            counts["total"] = conn.execute(
+                f"SELECT COUNT(*) {scope}", scope_params
+            ).fetchone()[0]
+            for key, column in (
+                ("by_type", "art_type"),
+                ("by_category", "art_category"),
+                ("by_section", "pub_name"),
+            ):
+                rows = conn.execute(
+                    f"SELECT {column}, COUNT(*) {scope} GROUP BY {column}", scope_params
+                ).fetchall()
+                counts[key] = {value: count for value, count in rows}
+        
+        return counts
+    
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Retorna estatísticas do índice.
+        
+        Returns:
+            Dict[str, int]: Segmentos, documentos e termos distintos
+        """
+        with self._connection() as conn:
+            segments, documents = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(doc_count), 0) FROM segments"
+            ).fetchone()
+            terms = conn.execute("SELECT COUNT(DISTINCT term) FROM postings").fetchone()[0]
+        
+        return {"segments": segments, "documents": documents, "terms": terms}
+
+
+class _PlanExecution:
+    """Avaliação de um plano de consulta sobre os segmentos de uma busca."""
+    
+    # Fração de artigos que se supõe aceita por um filtro de metadados
+    # (trechos de texto livre não têm estatística barata no catálogo)
+    METADATA_SELECTIVITY = 0.1
+    
+    # Até esta quantidade de candidatos, os metadados são lidos por chave
+    KEY_LOOKUP_LIMIT = 2000
+    
+    # Ordem de desempate entre estimativas iguais (mais barato primeiro)
+    _COST_CLASS = {DateClause: 0, MetadataClause: 1, TextClause: 2}
+    
+    def __init__(self, conn: sqlite3.Connection, segment_ids: List[int]):
+        self.conn = conn
+        self.segment_ids = segment_ids
+        self.doc_count, self.avg_lengths = DOUSearchIndex._collection_stats(conn, segment_ids)
+        self.field_lengths: Dict[DocKey, Dict[int, int]] = defaultdict(dict)
+        self.scored: List[Tuple[List[TermOccurrences], List[float], set]] = []
+        self.steps: List[str] = []
+        self._estimates: Dict[int, float] = {}
+        self._universe: Optional[set] = None
+    
+    # ------------------------------------------------------------------
+    # Avaliação
+    # ------------------------------------------------------------------
+    
+    def evaluate(self, node: QueryNode, candidates: Optional[set], scoring: bool) -> set:
+        """
+        Avalia um nó, restrito aos candidatos informados.
+        
+        Args:
+            node: Nó do plano
+            candidates: Artigos ainda possíveis (None = todos do escopo)
+            scoring: Se as cláusulas de texto contam para a pontuação
+        
+        Returns:
+            set: Chaves dos artigos que satisfazem o nó (subconjunto dos candidatos)
+        """
+        if isinstance(node, AndNode):
+            return self._evaluate_and(node, candidates, scoring)
+        
+        if isinstance(node, OrNode):
+            result: set = set()
+            for child in node.children:
+                result |= self.evaluate(child, candidates, scoring)
+                if not scoring and candidates is not None and len(result) == len(candidates):
+                    break
+            return result
+        
+        if isinstance(node, NotNode):
+            scope = self._all(candidates)
+            if not scope:
+                return scope
+            return scope - self.evaluate(node.child, scope, scoring=False)
+        
+        if isinstance(node, TextClause):
+            result = self._evaluate_text(node, candidates, scoring)
+        elif isinstance(node, MetadataClause):
+            result = self._evaluate_metadata(node, candidates)
+        elif isinstance(node, DateClause):
+            result = self._evaluate_date(node, candidates)
+        else:
+            raise TypeError(f"Nó de consulta desconhecido: {type(node).__name__}")
+        
+        self.steps.append(f"{node.describe()} → {len(result)}")
+        return result
+    
+    def _evaluate_and(self, node: AndNode, candidates: Optional[set], scoring: bool) -> set:
+        """Avalia as cláusulas da mais seletiva para a menos, parando no primeiro vazio."""
+        
+        positives = [child for child in node.children if not isinstance(child, NotNode)]
+        negatives = [child for child in node.children if isinstance(child, NotNode)]
+        
+        positives.sort(key=lambda child: (self.estimate(child), self._cost_class(child)))
+        if positives and self.estimate(positives[0]) == 0:
+            self.steps.append(f"{positives[0].describe()} → 0 (estimado)")
+            return set()
+        
+        result = candidates
+        for child in positives:
+            result = self.evaluate(child, result, scoring)
+            if not result:
+                return set()
+        
+        if result is None:
+            result = self._all(None)
+        
+        # As negações só precisam olhar os candidatos que sobraram
+        for child in negatives:
+            result = result - self.evaluate(child.child, result, scoring=False)
+            if not result:
+                break
+        
+        return result
+    
+    def _evaluate_text(
+        self,
+        node: TextClause,
+        candidates: Optional[set],
+        scoring: bool
+    ) -> set:
+        """Avalia um trecho pelas postings, verificando a sequência dos termos."""
+        
+        terms = tokenize(node.text)
+        if not terms:
+            return self._all(candidates)
+        
+        field_ids = (
+            {INDEXED_FIELDS.index(field) for field in node.fields} if node.fields else None
+        )
+        occurrences, doc_freqs, field_lengths = DOUSearchIndex._lookup(
+            self.conn,
+            terms,
+            self._segments_of(candidates),
+            prefix_last=node.prefix,
+            restrict=candidates,
+            field_ids=field_ids
+        )
+        if not occurrences:
+            return set()
+        
+        matched = {
+            key for key in occurrences[-1]
+            if DOUSearchIndex._is_phrase_match(key, occurrences)
+        }
+        
+        if scoring and matched:
+            self.scored.append(
+                (occurrences, DOUSearchIndex._idfs(doc_freqs, self.doc_count), matched)
+            )
+            for key in matched:
+                self.field_lengths[key].update(field_lengths[key])
+        
+        return matched
+    
+    def _evaluate_metadata(self, node: MetadataClause, candidates: Optional[set]) -> set:
+        """Avalia um filtro de metadados no catálogo."""
+        
+        operator = "= 1" if node.mode == "prefix" else "> 0"
+        condition = f"instr(py_fold({node.column}), ?) {operator}"
+        return self._select(condition, [node.value], candidates)
+    
+    def _evaluate_date(self, node: DateClause, candidates: Optional[set]) -> set:
+        """Avalia um intervalo de datas pelo índice de pub_date."""
+        
+        condition, params = self._date_condition(node)
+        if not condition:
+            return self._all(candidates)
+        return self._select(condition, params, candidates)
+    
+    def _select(self, condition: str, params: List[Any], candidates: Optional[set]) -> set:
+        """Seleciona no catálogo os artigos (dentre os candidatos) que atendem à condição."""
+        
+        if candidates is not None and len(candidates) <= self.KEY_LOOKUP_LIMIT:
+            # Poucos candidatos: consulta apenas as linhas deles
+            by_segment: Dict[int, List[int]] = defaultdict(list)
+            for segment_id, local_id in candidates:
+                by_segment[segment_id].append(local_id)
+            
+            result = set()
+            for segment_id, local_ids in by_segment.items():
+                for i in range(0, len(local_ids), 500):
+                    batch = local_ids[i:i + 500]
+                    rows = self.conn.execute(
+                        f"SELECT local_id FROM documents WHERE segment_id = ? "
+                        f"AND local_id IN ({','.join('?' * len(batch))}) AND {condition}",
+                        (segment_id, *batch, *params)
+                    ).fetchall()
+                    result.update((segment_id, local_id) for (local_id,) in rows)
+            return result
+        
+        segment_ids = self._segments_of(candidates)
+        rows = self.conn.execute(
+            f"SELECT segment_id, local_id FROM documents "
+            f"WHERE segment_id IN ({','.join('?' * len(segment_ids))}) AND {condition}",
+            (*segment_ids, *params)
+        ).fetchall()
+        result = set(rows)
+        return result if candidates is None else result & candidates
+    
+    @staticmethod
+    def _date_condition(node: DateClause) -> Tuple[str, List[str]]:
+        """Monta a condição SQL de um intervalo de datas."""
+        
+        conditions = []
+        params = []
+        if node.start:
+            conditions.append("pub_date >= ?")
+            params.append(node.start)
+        if node.end:
+            conditions.append("pub_date <= ?")
+            params.append(node.end)
+        return " AND ".join(conditions), params
+    
+    def _all(self, candidates: Optional[set]) -> set:
+        """Todos os candidatos (ou todos os artigos do escopo)."""
+        
+        if candidates is not None:
+            return set(candidates)
+        
+        if self._universe is None:
+            rows = self.conn.execute(
+                f"SELECT segment_id, local_id FROM documents "
+                f"WHERE segment_id IN ({','.join('?' * len(self.segment_ids))})",
+                self.segment_ids
+            ).fetchall()
+            self._universe = set(rows)
+        return set(self._universe)
+    
+    def _segments_of(self, candidates: Optional[set]) -> List[int]:
+        """Segmentos que ainda têm candidatos."""
+        
+        if candidates is None:
+            return self.segment_ids
+        present = {segment_id for segment_id, _ in candidates}
+        return [segment_id for segment_id in self.segment_ids if segment_id in present]
+    
+    # ------------------------------------------------------------------
+    # Estimativas e pontuação
+    # ------------------------------------------------------------------
+    
+    def _cost_class(self, node: QueryNode) -> int:
+        """Classe de custo de um nó (cláusulas compostas por último)."""
+        return self._COST_CLASS.get(type(node), 3)
+    
+    def estimate(self, node: QueryNode) -> float:
+        """
+        Estima quantos artigos do escopo satisfazem um nó.
+        
+        Trechos usam a frequência do termo mais raro (limite superior),
+        datas uma contagem pelo índice de pub_date e metadados uma fração
+        fixa do escopo.
+        """
+        cached = self._estimates.get(id(node))
+        if cached is not None:
+            return cached
+        
+        if isinstance(node, TextClause):
+            value = self._estimate_text(node)
+        elif isinstance(node, DateClause):
+            condition, params = self._date_condition(node)
+            value = self.doc_count
+            if condition:
+                value = self.conn.execute(
+                    f"SELECT COUNT(*) FROM documents "
+                    f"WHERE segment_id IN ({','.join('?' * len(self.segment_ids))}) AND {condition}",
+                    (*self.segment_ids, *params)
+                ).fetchone()[0]
+        elif isinstance(node, MetadataClause):
+            value = self.doc_count * self.METADATA_SELECTIVITY
+        elif isinstance(node, AndNode):
+            positives = [c for c in node.children if not isinstance(c, NotNode)]
+            value = min((self.estimate(c) for c in positives), default=self.doc_count)
+        elif isinstance(node, OrNode):
+            value = min(self.doc_count, sum(self.estimate(c) for c in node.children))
+        else:
+            value = self.doc_count
+        
+        self._estimates[id(node)] = value
+        return value
+    
+    def _estimate_text(self, node: TextClause) -> float:
+        """Menor frequência (em artigos) entre os termos de um trecho."""
+        
+        terms = tokenize(node.text)
+        if not terms:
+            return self.doc_count
+        
+        placeholders = ",".join("?" * len(self.segment_ids))
+        estimate = self.doc_count
+        for i, term in enumerate(terms):
+            if node.prefix and i == len(terms) - 1:
+                condition, params = "term >= ? AND term < ?", (term, term + "\U0010ffff")
+            else:
+                condition, params = "term = ?", (term,)
+            doc_freq = self.conn.execute(
+                f"SELECT COALESCE(SUM(doc_freq), 0) FROM postings "
+                f"WHERE {condition} AND segment_id IN ({placeholders})",
+                (*params, *self.segment_ids)
+            ).fetchone()[0]
+            estimate = min(estimate, doc_freq)
+            if not estimate:
+                break
+        return estimate
+    
+    def scores(self, matches: set) -> Dict[DocKey, float]:
+        """
+        Calcula a pontuação BM25F dos artigos encontrados.
+        
+        Args:
+            matches: Artigos que satisfazem o plano
+        
+        Returns:
+            Dict[DocKey, float]: Pontuação de cada artigo com cláusulas de texto satisfeitas
+        """
+        scores: Dict[DocKey, float] = defaultdict(float)
+        for occurrences, idfs, matched in self.scored:
+            for key in matched & matches:
+                scores[key] += DOUSearchIndex._bm25_score(
+                    key, occurrences, idfs, self.field_lengths[key], self.avg_lengths
+                )
+        return scores
+
+
+# Instância global do índice
+_index_instance: Optional[DOUSearchIndex] = None
+
+
+def get_search_index() -> DOUSearchIndex:
+    """
+    Obtém a instância global do índice de busca.
+    
+    Returns:
+        DOUSearchIndex: Instância do índice
+    """
+    global _index_instance
+    
+    if _index_instance is None:
+        _index_instance = DOUSearchIndex()
+    
+    return _index_instance
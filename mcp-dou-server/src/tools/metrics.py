@@ -0,0 +1,435 @@
+"""
+Métricas de desempenho do servidor MCP DOU.
+
+Agrega a latência de cada ferramenta MCP (histograma e percentis sobre as
+chamadas recentes), contagens de chamadas e erros, contadores de trabalho
+(bytes baixados, artigos processados) e acertos dos caches. Os dados são
+expostos pela ferramenta get_metrics e, opcionalmente, no formato texto do
+Prometheus num arquivo atualizado periodicamente e/ou numa porta HTTP.
+"""
+
+import asyncio
+import functools
+import logging
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+from ..config.settings import get_config
+
+
+logger = logging.getLogger(__name__)
+
+# Limites (s) dos buckets do histograma de latência
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Chamadas recentes usadas no cálculo dos percentis, por ferramenta
+LATENCY_WINDOW = 1024
+
+# Prefixo das respostas de erro das ferramentas
+ERROR_PREFIX = "❌"
+
+# Descrição dos contadores exportados
+COUNTER_HELP = {
+    "bytes_downloaded": "Bytes recebidos do INLABS",
+    "files_downloaded": "Arquivos baixados do INLABS",
+    "files_not_modified": "Revalidações respondidas com 304",
+    "files_parsed": "ZIPs processados a partir dos XMLs",
+    "articles_parsed": "Artigos extraídos dos XMLs",
+    "parse_seconds": "Tempo gasto processando XMLs (s)",
+    "files_prefetched": "Seções do dia baixadas pela pré-carga",
+    "tool_wait_seconds": "Tempo de espera por uma vaga de execução de ferramenta (s)",
+}
+
+
+class LatencyHistogram:
+    """Latências e erros de uma ferramenta."""
+    
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.samples: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+    
+    def observe(self, seconds: float, error: bool = False) -> None:
+        """Registra uma chamada."""
+        
+        self.count += 1
+        self.errors += int(error)
+        self.total_seconds += seconds
+        self.samples.append(seconds)
+        for i, limit in enumerate(LATENCY_BUCKETS):
+            if seconds <= limit:
+                self.buckets[i] += 1
+                break
+    
+    def percentile(self, q: float) -> float:
+        """Percentil q (0 a 1) das chamadas recentes, em segundos."""
+        
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Resumo da ferramenta (latências em ms)."""
+        
+        return {
+            "calls": self.count,
+            "errors": self.errors,
+            "mean_ms": self.total_seconds / self.count * 1000 if self.count else 0.0,
+            "p50_ms": self.percentile(0.50) * 1000,
+            "p95_ms": self.percentile(0.95) * 1000,
+            "p99_ms": self.percentile(0.99) * 1000,
+        }
+
+
+class DOUMetrics:
+    """Registro global das métricas do servidor."""
+    
+    def __init__(self):
+        self.config = get_config()
+        self._lock = threading.Lock()
+        self._tools: Dict[str, LatencyHistogram] = {}
+        self._counters: Dict[str, float] = {name: 0 for name in COUNTER_HELP}
+        self._caches: Dict[str, List[int]] = {}
+        self._started_at = time.time()
+        self._running_tools = 0
+        self._tool_semaphore: Optional[asyncio.Semaphore] = None
+        self._tool_semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._http_server: Optional[ThreadingHTTPServer] = None
+    
+    def observe_tool(self, name: str, seconds: float, error: bool = False) -> None:
+        """
+        Registra a execução de uma ferramenta MCP.
+        
+        Args:
+            name: Nome da ferramenta
+            seconds: Duração da chamada
+            error: Se a chamada falhou
+        """
+        with self._lock:
+            histogram = self._tools.get(name)
+            if histogram is None:
+                histogram = self._tools[name] = LatencyHistogram()
+            histogram.observe(seconds, error)
+    
+    def increment(self, name: str, value: float = 1) -> None:
+        """Soma value ao contador name."""
+        
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+    
+    def record_cache(self, name: str, hit: bool) -> None:
+        """Registra um acerto ou uma falha no cache name."""
+        
+        with self._lock:
+            counts = self._caches.setdefault(name, [0, 0])
+            counts[0 if hit else 1] += 1
+    
+    def get_tool_semaphore(self) -> Optional[asyncio.Semaphore]:
+        """
+        Obtém o semáforo que limita as ferramentas em execução simultânea.
+        
+        Returns:
+            Optional[asyncio.Semaphore]: Semáforo do loop atual, ou None se
+            max_concurrent_tools for 0 (sem limite)
+        """
+        limit = self.config.max_concurrent_tools
+        if limit <= 0:
+            return None
+        
+        loop = asyncio.get_running_loop()
+        if self._tool_semaphore is None or self._tool_semaphore_loop is not loop:
+            self._tool_semaphore = asyncio.Semaphore(limit)
+            self._tool_semaphore_loop = loop
+        
+        return self._tool_semaphore
+    
+    def tool_started(self) -> None:
+        """Marca o início da execução de uma ferramenta."""
+        
+        with self._lock:
+            self._running_tools += 1
+    
+    def tool_finished(self) -> None:
+        """Marca o fim da execução de uma ferramenta."""
+        
+        with self._lock:
+            self._running_tools -= 1
+    
+    def get_running_tools(self) -> int:
+        """Ferramentas em execução neste momento."""
+        
+        return self._running_tools
+    
+    def get_tool_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Obtém o resumo de cada ferramenta já chamada.
+        
+        Returns:
+            Dict[str, Dict[str, Any]]: Chamadas, erros e latências por ferramenta
+        """
+        with self._lock:
+            return {name: histogram.snapshot() for name, histogram in sorted(self._tools.items())}
+    
+    def get_counters(self) -> Dict[str, float]:
+        """Obtém os contadores de trabalho."""
+        
+        with self._lock:
+            return dict(self._counters)
+    
+    def get_cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Obtém acertos e falhas dos caches do servidor.
+        
+        Returns:
+            Dict[str, Dict[str, int]]: hits e misses por cache
+        """
+        # Importados aqui para evitar ciclo (a busca usa o parser, que registra métricas)
+        from .availability import get_availability_cache
+        from .http_client import get_http_client
+        from .search import get_search_result_cache
+        
+        with self._lock:
+            caches = {
+                name: {"hits": hits, "misses": misses}
+                for name, (hits, misses) in self._caches.items()
+            }
+        
+        for name, stats in (
+            ("search_results", get_search_result_cache().get_stats()),
+            ("availability", get_availability_cache().get_stats()),
+        ):
+            caches[name] = {"hits": stats["hits"], "misses": stats["misses"]}
+        
+        http_stats = get_http_client().get_stats()
+        caches["http_connections"] = {
+            "hits": http_stats["connections_reused"],
+            "misses": http_stats["connections_opened"],
+        }
+        
+        return dict(sorted(caches.items()))
+    
+    def get_uptime(self) -> float:
+        """Segundos desde a criação do registro."""
+        
+        return time.time() - self._started_at
+    
+    def render_prometheus(self) -> str:
+        """
+        Gera as métricas no formato texto do Prometheus.
+        
+        Returns:
+            str: Métricas no formato de exposição 0.0.4
+        """
+        with self._lock:
+            tools = {
+                name: (list(h.buckets), h.count, h.errors, h.total_seconds)
+                for name, h in sorted(self._tools.items())
+            }
+        counters = self.get_counters()
+        caches = self.get_cache_stats()
+        
+        lines = [
+            "# HELP dou_tool_duration_seconds Duração das chamadas de ferramentas MCP",
+            "# TYPE dou_tool_duration_seconds histogram",
+        ]
+        for name, (buckets, count, _, total) in tools.items():
+            cumulative = 0
+            for limit, bucket in zip(LATENCY_BUCKETS, buckets):
+                cumulative += bucket
+                lines.append(f'dou_tool_duration_seconds_bucket{{tool="{name}",le="{limit}"}} {cumulative}')
+            lines.append(f'dou_tool_duration_seconds_bucket{{tool="{name}",le="+Inf"}} {count}')
+            lines.append(f'dou_tool_duration_seconds_sum{{tool="{name}"}} {total:.6f}')
+            lines.append(f'dou_tool_duration_seconds_count{{tool="{name}"}} {count}')
+        
+        lines.append("# HELP dou_tool_errors_total Chamadas de ferramentas MCP que falharam")
+        lines.append("# TYPE dou_tool_errors_total counter")
+        for name, (_, _, errors, _) in tools.items():
+            lines.append(f'dou_tool_errors_total{{tool="{name}"}} {errors}')
+        
+        for name, value in counters.items():
+            metric = f"dou_{name}_total"
+            lines.append(f"# HELP {metric} {COUNTER_HELP.get(name, name)}")
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value:g}")
+        
+        for kind in ("hits", "misses"):
+            lines.append(f"# HELP dou_cache_{kind}_total {'Acertos' if kind == 'hits' else 'Falhas'} por cache")
+            lines.append(f"# TYPE dou_cache_{kind}_total counter")
+            for name, stats in caches.items():
+                lines.append(f'dou_cache_{kind}_total{{cache="{name}"}} {stats[kind]}')
+        
+        lines.append("# HELP dou_tools_running Ferramentas MCP em execução")
+        lines.append("# TYPE dou_tools_running gauge")
+        lines.append(f"dou_tools_running {self.get_running_tools()}")
+        
+        lines.append("# HELP dou_uptime_seconds Tempo desde o início do servidor")
+        lines.append("# TYPE dou_uptime_seconds gauge")
+        lines.append(f"dou_uptime_seconds {self.get_uptime():.0f}")
+        
+        return "\n".join(lines) + "\n"
+    
+    def write_file(self) -> None:
+        """Grava as métricas em metrics_file de forma atômica, se configurado."""
+        
+        if not self.config.metrics_file:
+            return
+        
+        path = Path(self.config.metrics_file)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(path.name + ".tmp")
+            tmp_path.write_text(self.render_prometheus(), encoding="utf-8")
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Falha ao gravar métricas em {path}: {e}")
+    
+    def start(self) -> None:
+        """Inicia a exportação configurada (arquivo periódico e/ou porta HTTP)."""
+        
+        if self.config.metrics_port and self._http_server is None:
+            self._start_http_server()
+        
+        if self.config.metrics_file and (self._task is None or self._task.done()):
+            self._task = asyncio.get_running_loop().create_task(self._run())
+    
+    def _start_http_server(self) -> None:
+        """Expõe /metrics numa thread com o servidor HTTP da biblioteca padrão."""
+        
+        metrics = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = metrics.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        try:
+            self._http_server = ThreadingHTTPServer(
+                (self.config.metrics_host, self.config.metrics_port), Handler
+            )
+        except OSError as e:
+            logger.error(f"Não foi possível expor métricas na porta {self.config.metrics_port}: {e}")
+            return
+        
+        self._http_server.daemon_threads = True
+        threading.Thread(
+            target=self._http_server.serve_forever, name="dou-metrics", daemon=True
+        ).start()
+        logger.info(
+            f"Métricas Prometheus em http://{self.config.metrics_host}:{self.config.metrics_port}/metrics"
+        )
+    
+    async def _run(self) -> None:
+        """Laço da gravação periódica do arquivo de métricas."""
+        
+        interval = max(1, self.config.metrics_interval)
+        
+        while True:
+            await asyncio.to_thread(self.write_file)
+            await asyncio.sleep(interval)
+    
+    async def shutdown(self) -> None:
+        """Interrompe a exportação, gravando o arquivo uma última vez."""
+        
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            await asyncio.to_thread(self.write_file)
+        self._task = None
+        
+        if self._http_server is not None:
+            self._http_server.shutdown()
+            self._http_server.server_close()
+            self._http_server = None
+
+
+def instrument(name: Optional[str] = None) -> Callable:
+    """
+    Decorador que mede as chamadas de uma ferramenta MCP.
+    
+    Deve ficar abaixo de @mcp.tool(); a assinatura e a docstring da função
+    original são preservadas. Exceções e respostas iniciadas por "❌"
+    contam como erro. Com max_concurrent_tools, a chamada aguarda uma vaga
+    antes de executar; a espera não entra na latência da ferramenta.
+    
+    Args:
+        name: Nome registrado (padrão: nome da função)
+    
+    Returns:
+        Callable: Decorador
+    """
+    def decorator(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        tool_name = name or func.__name__
+        
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            metrics = get_metrics()
+            semaphore = metrics.get_tool_semaphore()
+            if semaphore is not None:
+                wait_start = time.perf_counter()
+                await semaphore.acquire()
+                metrics.increment("tool_wait_seconds", time.perf_counter() - wait_start)
+            
+            metrics.tool_started()
+            start = time.perf_counter()
+            error = True
+            try:
+                result = await func(*args, **kwargs)
+                error = isinstance(result, str) and result.startswith(ERROR_PREFIX)
+                return result
+            finally:
+                metrics.observe_tool(tool_name, time.perf_counter() - start, error)
+                metrics.tool_finished()
+                if semaphore is not None:
+                    semaphore.release()
+        
+        return wrapper
+    
+    return decorator
+
+
+# Instância global das métricas
+_metrics_instance: Optional[DOUMetrics] = None
+
+
+def get_metrics() -> DOUMetrics:
+    """
+    Obtém a instância global das métricas.
+    
+    Returns:
+        DOUMetrics: Registro de métricas
+    """
+    global _metrics_instance
+    
+    if _metrics_instance is None:
+        _metrics_instance = DOUMetrics()
+    
+    return _metrics_instance
+
+
+async def shutdown_metrics() -> None:
+    """Interrompe a exportação das métricas globais, se criadas."""
+    
+    if _metrics_instance is not None:
+        await _metrics_instance.shutdown()
@@ -0,0 +1,159 @@
+"""
+Cache de artigos já processados ("sidecar") para arquivos ZIP do DOU.
+
+Para cada ZIP do cache é gravado, ao lado dele, um arquivo compacto com
+os metadados e o texto limpo dos artigos extraídos. O sidecar é validado
+pelo tamanho e mtime do ZIP, de modo que chamadas repetidas sobre a mesma
+edição não precisam reprocessar o XML.
+"""
+
+import gzip
+import json
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+from ..models.dou_models import DOUArticle, DOUArticleContent, DOUArticleMetadata
+
+
+logger = logging.getLogger(__name__)
+
+
+# Versão do formato do sidecar; alterações invalidam os arquivos existentes
+SIDECAR_VERSION = 3
+
+SIDECAR_SUFFIX = ".articles.json.gz"
+
+
+def get_sidecar_path(zip_path: Path) -> Path:
+    """
+    Retorna o caminho do sidecar de um arquivo ZIP.
+    
+    Args:
+        zip_path: Caminho do arquivo ZIP
+    
+    Returns:
+        Path: Caminho do sidecar (ex: 2024-09-17-DO1.articles.json.gz)
+    """
+    zip_path = Path(zip_path)
+    return zip_path.with_name(zip_path.stem + SIDECAR_SUFFIX)
+
+
+class DOUParseCache:
+    """Leitura e gravação dos sidecars de artigos processados."""
+    
+    def load(self, zip_path: Path) -> Optional[List[DOUArticle]]:
+        """
+        Carrega os artigos do sidecar, se ele for válido para o ZIP atual.
+        
+        Args:
+            zip_path: Caminho do arquivo ZIP
+        
+        Returns:
+            Optional[List[DOUArticle]]: Artigos ou None se não houver sidecar válido
+        """
+        sidecar_path = get_sidecar_path(zip_path)
+        
+        try:
+            stat = Path(zip_path).stat()
+            with gzip.open(sidecar_path, "rt", encoding="utf-8") as f:
+                payload = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Sidecar inválido {sidecar_path}: {e}")
+            return None
+        
+        if (
+            payload.get("version") != SIDECAR_VERSION
+            or payload.get("zip_size") != stat.st_size
+            or payload.get("zip_mtime_ns") != stat.st_mtime_ns
+        ):
+            return None
+        
+        # Os dados foram validados na gravação; model_construct evita revalidar
+        source_zip = str(zip_path)
+        return [
+            DOUArticle.model_construct(
+                metadata=DOUArticleMetadata.model_construct(**item["metadata"]),
+                content=DOUArticleContent.model_construct(**item["content"]),
+                raw_xml=None,
+                source_zip=source_zip,
+                source_member=item.get("source_member"),
+                search_text=item.get("search_text"),
+                extracted_at=datetime.fromisoformat(item["extracted_at"])
+            )
+            for item in payload["articles"]
+        ]
+    
+    def store(self, zip_path: Path, stat: os.stat_result, articles: List[DOUArticle]) -> None:
+        """
+        Grava o sidecar de um arquivo ZIP de forma atômica.
+        
+        Args:
+            zip_path: Caminho do arquivo ZIP
+            stat: Resultado de stat() do ZIP obtido antes do processamento
+            articles: Artigos extraídos do ZIP
+        """
+        sidecar_path = get_sidecar_path(zip_path)
+        tmp_path = sidecar_path.with_name(sidecar_path.name + ".tmp")
+        
+        payload = {
+            "version": SIDECAR_VERSION,
+            "zip_size": stat.st_size,
+            "zip_mtime_ns": stat.st_mtime_ns,
+            "articles": [
+                {
+                    "metadata": article.metadata.model_dump(),
+                    "content": article.content.model_dump(),
+                    "source_member": article.source_member,
+                    "search_text": article.search_text,
+                    "extracted_at": article.extracted_at.isoformat(),
+                }
+                for article in articles
+            ],
+        }
+        
+        try:
+            with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=1) as f:
+                json.dump(payload, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, sidecar_path)
+        except Exception as e:
+            logger.warning(f"Não foi possível gravar sidecar {sidecar_path}: {e}")
+            tmp_path.unlink(missing_ok=True)
+    
+    def invalidate(self, zip_path: Path) -> bool:
+        """
+        Remove o sidecar de um arquivo ZIP.
+        
+        Args:
+            zip_path: Caminho do arquivo ZIP
+        
+        Returns:
+            bool: True se havia um sidecar
+        """
+        sidecar_path = get_sidecar_path(zip_path)
+        if sidecar_path.exists():
+            sidecar_path.unlink()
+            return True
+        return False
+    
+    def invalidate_all(self, cache_dir: Path) -> int:
+        """
+        Remove todos os sidecars do diretório de cache.
+        
+        Args:
+            cache_dir: Diretório de cache
+        
+        Returns:
+            int: Quantidade de sidecars removidos
+        """
+        removed = 0
+        for sidecar_path in Path(cache_dir).glob(f"*/*/*{SIDECAR_SUFFIX}"):
+            sidecar_path.unlink(missing_ok=True)
+            removed += 1
+        
+        logger.info(f"{removed} sidecars removidos de {cache_dir}")
+        return removed
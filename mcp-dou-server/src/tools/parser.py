@@ -8,17 +8,19 @@ dados dos arquivos XML do Diário Oficial da União.
 import asyncio
 import json
 import logging
+import math
+import os
 import time
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
-import aiofiles
-from bs4 import BeautifulSoup, Tag
-from lxml import etree
 from mcp.server.fastmcp import FastMCP
 
+from ..config.settings import get_config
 from ..models.dou_models import (
     DOUArticle,
     DOUArticleContent,
@@ -26,6 +28,10 @@ from ..models.dou_models import (
     DOUSection,
     FileFormat
 )
+from .metrics import get_metrics, instrument
+from .parse_cache import DOUParseCache
+from .text import fold_fields, html_to_text
+from .tracing import span, stage
 
 
 logger = logging.getLogger(__name__)
@@ -36,37 +42,121 @@ class DOUXMLParser:
     
     def __init__(self):
         self.encoding = 'utf-8'
+        self.parse_cache = DOUParseCache()
+        self.retain_raw_xml = get_config().retain_raw_xml
     
-    async def parse_zip_file(self, zip_path: str) -> List[DOUArticle]:
+    async def parse_zip_file(
+        self,
+        zip_path: str,
+        use_cache: bool = True,
+        parallel: Optional[bool] = None
+    ) -> List[DOUArticle]:
         """
         Parsea um arquivo ZIP contendo XMLs do DOU.
         
+        Se houver um sidecar válido para o ZIP (mesmo tamanho e mtime), os
+        artigos são lidos dele sem reprocessar os XMLs. ZIPs com muitos
+        membros são distribuídos em lotes para um pool de processos; a
+        leitura e gravação do sidecar e o parsing no próprio processo rodam
+        numa thread, sem bloquear o loop de eventos.
+        
         Args:
             zip_path: Caminho para o arquivo ZIP
+            use_cache: Se deve ler/gravar o sidecar de artigos processados
+            parallel: Força (True) ou desativa (False) o pool de processos;
+                None decide pelo número de membros do ZIP
             
         Returns:
             List[DOUArticle]: Lista de artigos extraídos
         """
-        articles = []
+        metrics = get_metrics()
         
-        try:
-            with zipfile.ZipFile(zip_path, 'r') as zip_file:
-                xml_files = [f for f in zip_file.namelist() if f.endswith('.xml')]
+        with span("parse_zip_file", zip=Path(zip_path).name) as current:
+            if use_cache:
+                with span("parse.sidecar_load"):
+                    cached_articles = await asyncio.to_thread(self.parse_cache.load, Path(zip_path))
+                metrics.record_cache("parse_sidecar", cached_articles is not None)
+                if cached_articles is not None:
+                    logger.debug(f"Artigos carregados do sidecar: {zip_path}")
+                    current.set(sidecar=True, articles=len(cached_articles))
+                    return cached_articles
+            
+            articles = []
+            start = time.perf_counter()
+            
+            try:
+                with span("parse.zip_list"):
+                    zip_stat, xml_files = await asyncio.to_thread(list_zip_members, zip_path)
                 
-                for xml_file in xml_files:
-                    try:
-                        xml_content = zip_file.read(xml_file).decode(self.encoding)
-                        article = await self.parse_xml_content(xml_content)
-                        if article:
-                            articles.append(article)
-                    except Exception as e:
-                        logger.error(f"Erro ao processar {xml_file}: {e}")
-                        continue
-                        
-        except Exception as e:
-            logger.error(f"Erro ao abrir ZIP {zip_path}: {e}")
+                # ZIPs pequenos não compensam o custo de enviar trabalho ao pool
+                if parallel is None:
+                    config = get_config()
+                    parallel = (
+                        len(xml_files) >= config.parse_parallel_min_members
+                        and get_parse_worker_count() > 1
+                    )
+                
+                with span("parse.members", members=len(xml_files), parallel=parallel):
+                    if parallel:
+                        articles = await self._parse_members_parallel(zip_path, xml_files)
+                    else:
+                        articles = await asyncio.to_thread(parse_zip_members, zip_path, xml_files)
+                            
+            except Exception as e:
+                logger.error(f"Erro ao abrir ZIP {zip_path}: {e}")
+                current.set(error=str(e))
+                return articles
+            
+            metrics.increment("files_parsed")
+            metrics.increment("articles_parsed", len(articles))
+            metrics.increment("parse_seconds", time.perf_counter() - start)
+            current.set(sidecar=False, articles=len(articles))
+            
+            if use_cache:
+                with span("parse.sidecar_store"):
+                    await asyncio.to_thread(self.parse_cache.store, Path(zip_path), zip_stat, articles)
+                
+            return articles
+    
+    async def _parse_members_parallel(
+        self,
+        zip_path: str,
+        xml_files: List[str]
+    ) -> List[DOUArticle]:
+        """
+        Parsea os membros de um ZIP em lotes no pool de processos.
+        
+        Args:
+            zip_path: Caminho para o arquivo ZIP
+            xml_files: Membros XML do ZIP
             
-        return articles
+        Returns:
+            List[DOUArticle]: Artigos na ordem dos membros
+        """
+        workers = get_parse_worker_count()
+        
+        # Alguns lotes por worker equilibram a carga sem excesso de overhead
+        batch_size = max(1, math.ceil(len(xml_files) / (workers * 4)))
+        batches = [
+            xml_files[i:i + batch_size] for i in range(0, len(xml_files), batch_size)
+        ]
+        
+        loop = asyncio.get_running_loop()
+        pool = get_parse_pool()
+        
+        try:
+            results = await asyncio.gather(
+                *(
+                    loop.run_in_executor(pool, parse_zip_members, zip_path, batch)
+                    for batch in batches
+                )
+            )
+        except BrokenProcessPool as e:
+            logger.warning(f"Pool de parsing indisponível ({e}), processando no próprio processo")
+            shutdown_parse_pool()
+            return await asyncio.to_thread(parse_zip_members, zip_path, xml_files)
+        
+        return [article for batch_articles in results for article in batch_articles]
     
     async def parse_xml_content(self, xml_content: str) -> Optional[DOUArticle]:
         """
@@ -78,32 +168,93 @@ class DOUXMLParser:
         Returns:
             DOUArticle: Artigo estruturado ou None se erro
         """
+        with span("parse_xml_content", size=len(xml_content)):
+            return self.parse_xml(xml_content)
+    
+    def parse_xml(
+        self,
+        xml_content: str,
+        source_zip: Optional[str] = None,
+        source_member: Optional[str] = None
+    ) -> Optional[DOUArticle]:
+        """
+        Versão síncrona de parse_xml_content.
+        
+        O XML original só é mantido no artigo com retain_raw_xml; caso
+        contrário ele pode ser relido do ZIP com load_raw_xml.
+        
+        Args:
+            xml_content: Conteúdo XML como string
+            source_zip: Arquivo ZIP de onde o XML foi lido
+            source_member: Nome do membro XML dentro do ZIP
+            
+        Returns:
+            DOUArticle: Artigo estruturado ou None se erro
+        """
+        # Importado no primeiro parsing, e não na inicialização do servidor
+        from lxml import etree
+        
         try:
             # Parse com lxml para maior performance
-            root = etree.fromstring(xml_content.encode(self.encoding))
-            article_elem = root.find('.//article')
+            with stage("xml.lxml"):
+                root = etree.fromstring(xml_content.encode(self.encoding))
+                article_elem = root.find('.//article')
             
             if article_elem is None:
                 logger.warning("Elemento 'article' não encontrado no XML")
                 return None
             
             # Extrai metadados dos atributos
-            metadata = self._extract_metadata(article_elem)
+            with stage("xml.metadata"):
+                metadata = self._extract_metadata(article_elem)
             
             # Extrai conteúdo do body
-            content = self._extract_content(article_elem)
+            with stage("xml.content"):
+                content = self._extract_content(article_elem)
             
-            return DOUArticle(
-                metadata=metadata,
-                content=content,
-                raw_xml=xml_content,
-                extracted_at=datetime.now()
-            )
+            with stage("xml.search_text"):
+                search_text = build_search_text(metadata, content)
+            
+            with stage("xml.model"):
+                return DOUArticle(
+                    metadata=metadata,
+                    content=content,
+                    raw_xml=xml_content if self.retain_raw_xml else None,
+                    source_zip=source_zip,
+                    source_member=source_member,
+                    search_text=search_text,
+                    extracted_at=datetime.now()
+                )
             
         except Exception as e:
             logger.error(f"Erro ao parsear XML: {e}")
             return None
     
+    def load_raw_xml(self, article: DOUArticle) -> Optional[str]:
+        """
+        Retorna o XML original de um artigo, lendo-o do ZIP se necessário.
+        
+        Args:
+            article: Artigo extraído
+            
+        Returns:
+            Optional[str]: XML original ou None se a origem não for conhecida
+        """
+        if article.raw_xml is not None:
+            return article.raw_xml
+        
+        if not article.source_zip or not article.source_member:
+            return None
+        
+        try:
+            with zipfile.ZipFile(article.source_zip, 'r') as zip_file:
+                return zip_file.read(article.source_member).decode(self.encoding)
+        except (OSError, KeyError, zipfile.BadZipFile) as e:
+            logger.warning(
+                f"Não foi possível ler {article.source_member} de {article.source_zip}: {e}"
+            )
+            return None
+    
     def _extract_metadata(self, article_elem) -> DOUArticleMetadata:
         """Extrai metadados do elemento article."""
         
@@ -142,9 +293,8 @@ class DOUXMLParser:
         texto_elem = body.find('Texto')
         texto_clean = ""
         if texto_elem is not None and texto_elem.text:
-            # Usa BeautifulSoup para limpar HTML
-            soup = BeautifulSoup(texto_elem.text, 'html.parser')
-            texto_clean = soup.get_text(separator=' ', strip=True)
+            with stage("xml.html_to_text"):
+                texto_clean = html_to_text(texto_elem.text)
         
         return DOUArticleContent(
             identifica=get_cdata_text('Identifica'),
@@ -156,12 +306,134 @@ class DOUXMLParser:
         )
 
 
+def build_search_text(metadata: DOUArticleMetadata, content: DOUArticleContent) -> str:
+    """
+    Monta o texto de busca normalizado de um artigo.
+    
+    Args:
+        metadata: Metadados do artigo
+        content: Conteúdo do artigo
+    
+    Returns:
+        str: Campos textuais em minúsculas, sem acentos, separados por espaço
+    """
+    return fold_fields((
+        content.identifica,
+        content.ementa,
+        content.titulo,
+        content.subtitulo,
+        content.texto,
+        metadata.name,
+        metadata.art_category,
+    ))
+
+
+# Pool de processos para parsing paralelo (criado sob demanda)
+_parse_pool: Optional[ProcessPoolExecutor] = None
+
+# Parser usado por parse_zip_members em cada processo
+_member_parser: Optional[DOUXMLParser] = None
+
+
+def get_parse_worker_count() -> int:
+    """
+    Retorna o número de processos do pool de parsing.
+    
+    Returns:
+        int: DOU_PARSE_WORKERS ou, se 0, o número de CPUs da máquina
+    """
+    return get_config().parse_workers or os.cpu_count() or 1
+
+
+def get_parse_pool() -> ProcessPoolExecutor:
+    """
+    Obtém o pool de processos de parsing, criando-o na primeira utilização.
+    
+    Returns:
+        ProcessPoolExecutor: Pool de processos
+    """
+    global _parse_pool
+    
+    if _parse_pool is None:
+        workers = get_parse_worker_count()
+        logger.info(f"Criando pool de parsing com {workers} processos")
+        _parse_pool = ProcessPoolExecutor(max_workers=workers)
+    
+    return _parse_pool
+
+
+def shutdown_parse_pool() -> None:
+    """Encerra o pool de processos de parsing, se tiver sido criado."""
+    global _parse_pool
+    
+    if _parse_pool is not None:
+        _parse_pool.shutdown(wait=False, cancel_futures=True)
+        _parse_pool = None
+
+
+def list_zip_members(zip_path: str) -> Tuple[os.stat_result, List[str]]:
+    """
+    Lista os membros XML de um ZIP.
+    
+    Args:
+        zip_path: Caminho para o arquivo ZIP
+        
+    Returns:
+        Tuple[os.stat_result, List[str]]: Estado do ZIP antes da leitura
+        (que identifica o sidecar) e os membros XML
+    """
+    zip_stat = os.stat(zip_path)
+    
+    with zipfile.ZipFile(zip_path, 'r') as zip_file:
+        xml_files = [f for f in zip_file.namelist() if f.endswith('.xml')]
+    
+    return zip_stat, xml_files
+
+
+def parse_zip_members(zip_path: str, xml_files: List[str]) -> List[DOUArticle]:
+    """
+    Parsea um conjunto de membros XML de um ZIP.
+    
+    Função de módulo para poder ser executada nos processos do pool.
+    
+    Args:
+        zip_path: Caminho para o arquivo ZIP
+        xml_files: Membros a processar
+        
+    Returns:
+        List[DOUArticle]: Artigos extraídos, na ordem dos membros
+    """
+    global _member_parser
+    
+    if _member_parser is None:
+        _member_parser = DOUXMLParser()
+    
+    articles = []
+    
+    with zipfile.ZipFile(zip_path, 'r') as zip_file:
+        for xml_file in xml_files:
+            try:
+                with stage("zip.read"):
+                    xml_content = zip_file.read(xml_file).decode(_member_parser.encoding)
+                article = _member_parser.parse_xml(
+                    xml_content, source_zip=str(zip_path), source_member=xml_file
+                )
+                if article:
+                    articles.append(article)
+            except Exception as e:
+                logger.error(f"Erro ao processar {xml_file}: {e}")
+                continue
+    
+    return articles
+
+
 def register_parser_tools(mcp: FastMCP) -> None:
     """Registra as ferramentas de parsing no servidor MCP."""
     
     parser = DOUXMLParser()
     
     @mcp.tool()
+    @instrument()
     async def parse_xml_content(
         file_path: str,
         extract_metadata: bool = True,
@@ -188,6 +460,8 @@ def register_parser_tools(mcp: FastMCP) -> None:
             if file_path.endswith('.zip'):
                 articles = await parser.parse_zip_file(file_path)
             elif file_path.endswith('.xml'):
+                import aiofiles
+                
                 async with aiofiles.open(file_path, 'r', encoding='utf-8') as f:
                     xml_content = await f.read()
                 article = await parser.parse_xml_content(xml_content)
@@ -231,6 +505,7 @@ def register_parser_tools(mcp: FastMCP) -> None:
             return f"❌ Erro ao processar arquivo: {str(e)}"
     
     @mcp.tool()
+    @instrument()
     async def extract_metadata(file_path: str) -> str:
         """
         Extrai apenas metadados de um arquivo XML do DOU.
@@ -251,6 +526,8 @@ def register_parser_tools(mcp: FastMCP) -> None:
             if file_path.endswith('.zip'):
                 articles = await parser.parse_zip_file(file_path)
             elif file_path.endswith('.xml'):
+                import aiofiles
+                
                 async with aiofiles.open(file_path, 'r', encoding='utf-8') as f:
                     xml_content = await f.read()
                 article = await parser.parse_xml_content(xml_content)
@@ -312,4 +589,41 @@ def register_parser_tools(mcp: FastMCP) -> None:
             
         except Exception as e:
             logger.error(f"Erro na extração de metadados: {e}")
-            return f"❌ Erro ao extrair metadados: {str(e)}"
\ No newline at end of file
+            return f"❌ Erro ao extrair metadados: {str(e)}"
+    
+    @mcp.tool()
+    @instrument()
+    async def rebuild_parse_cache(rebuild: bool = True) -> str:
+        """
+        Invalida (e opcionalmente recria) os sidecars de artigos processados.
+        
+        Args:
+            rebuild: Se deve reprocessar os ZIPs em cache após invalidar
+        """
+        start_time = time.time()
+        
+        try:
+            cache_dir = Path(get_config().cache_dir)
+            removed = await asyncio.to_thread(parser.parse_cache.invalidate_all, cache_dir)
+            
+            rebuilt = 0
+            articles_total = 0
+            if rebuild:
+                for zip_path in sorted(cache_dir.glob("*/*/*.zip")):
+                    articles = await parser.parse_zip_file(str(zip_path))
+                    articles_total += len(articles)
+                    rebuilt += 1
+            
+            execution_time = (time.time() - start_time) * 1000
+            
+            return (
+                f"🗃️ Cache de artigos processados\n\n"
+                f"🗑️ Sidecars removidos: {removed}\n"
+                f"🔄 Sidecars recriados: {rebuilt}\n"
+                f"📄 Artigos processados: {articles_total}\n"
+                f"⏱️ Tempo de execução: {execution_time:.2f}ms"
+            )
+            
+        except Exception as e:
+            logger.error(f"Erro ao reconstruir cache de artigos: {e}")
+            return f"❌ Erro ao reconstruir cache de artigos: {str(e)}"
\ No newline at end of file
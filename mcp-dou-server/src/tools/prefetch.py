@@ -0,0 +1,362 @@
+"""
+Pré-carga em segundo plano da edição do dia do DOU.
+
+Dentro das janelas de prefetch_schedule, o servidor verifica periodicamente
+no INLABS (HEAD, sem usar o cache negativo de disponibilidade) as seções do
+dia que ainda não estão no cache e baixa as que já foram publicadas. O
+download de XMLs já processa os artigos (sidecar) e atualiza o índice de
+busca, de modo que as consultas sobre a edição do dia encontram tudo pronto.
+Edições extras publicadas ao longo do dia são apanhadas nas verificações
+seguintes. Sábados e domingos são ignorados.
+"""
+
+import asyncio
+import logging
+from datetime import date, datetime, time as Time, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from mcp.server.fastmcp import FastMCP
+
+from ..auth.inlabs_auth import get_auth_instance
+from ..config.settings import get_config
+from ..models.dou_models import DOUSection, FileFormat
+from .download import download_dou_file, get_local_file_path, probe_sections
+from .metrics import get_metrics, instrument
+
+
+logger = logging.getLogger(__name__)
+
+# Janela de verificação: início, fim e intervalo entre verificações (s)
+ScheduleWindow = Tuple[Time, Time, int]
+
+
+def parse_schedule(schedule: str) -> List[ScheduleWindow]:
+    """
+    Interpreta a agenda de verificações.
+    
+    Args:
+        schedule: Janelas "HH:MM-HH:MM=segundos" separadas por vírgula
+            (ex: "05:00-10:00=300,10:00-22:00=1800"); uma janela cujo fim é
+            anterior ao início atravessa a meia-noite
+    
+    Returns:
+        List[ScheduleWindow]: Janelas na ordem informada
+    
+    Raises:
+        ValueError: Se alguma janela for inválida
+    """
+    windows = []
+    
+    for entry in schedule.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        
+        try:
+            period, interval = entry.split("=")
+            start, end = period.split("-")
+            window = (
+                Time.fromisoformat(start.strip()),
+                Time.fromisoformat(end.strip()),
+                int(interval)
+            )
+        except ValueError:
+            raise ValueError(f"Janela inválida '{entry}' (use HH:MM-HH:MM=segundos)")
+        
+        if window[0] == window[1] or window[2] <= 0:
+            raise ValueError(f"Janela inválida '{entry}' (período vazio ou intervalo não positivo)")
+        windows.append(window)
+    
+    if not windows:
+        raise ValueError("Agenda de prefetch vazia")
+    
+    return windows
+
+
+def _in_window(window: ScheduleWindow, moment: Time) -> bool:
+    """Se o horário está dentro da janela."""
+    
+    start, end, _ = window
+    if start < end:
+        return start <= moment < end
+    return moment >= start or moment < end
+
+
+def _seconds_until(now: datetime, moment: Time) -> float:
+    """Segundos até a próxima ocorrência do horário."""
+    
+    target = datetime.combine(now.date(), moment)
+    if target <= now:
+        target += timedelta(days=1)
+    return (target - now).total_seconds()
+
+
+class DOUPrefetcher:
+    """Verificação periódica e pré-carga da edição do dia."""
+    
+    def __init__(self):
+        self.config = get_config()
+        self.schedule = parse_schedule(self.config.prefetch_schedule)
+        self.sections = [DOUSection(s.upper()) for s in self.config.prefetch_sections.split()]
+        
+        self.polls = 0
+        self.files_prefetched = 0
+        self.last_poll: Optional[datetime] = None
+        self.next_poll: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+        self.today: Dict[DOUSection, str] = {}
+        self._today_date: Optional[date] = None
+        self._task: Optional[asyncio.Task] = None
+    
+    def current_interval(self, now: datetime) -> Optional[int]:
+        """
+        Intervalo da janela em que now se encontra.
+        
+        Args:
+            now: Momento de referência
+        
+        Returns:
+            Optional[int]: Intervalo em segundos, ou None fora das janelas
+        """
+        for window in self.schedule:
+            if _in_window(window, now.time()):
+                return window[2]
+        return None
+    
+    def next_delay(self, now: datetime) -> float:
+        """
+        Segundos até a próxima verificação.
+        
+        Dentro de uma janela, o intervalo dela (antecipado se outra janela
+        começar antes); fora delas, até o início da próxima janela.
+        
+        Args:
+            now: Momento de referência
+        
+        Returns:
+            float: Espera em segundos
+        """
+        until_next_window = min(_seconds_until(now, window[0]) for window in self.schedule)
+        interval = self.current_interval(now)
+        
+        if interval is None:
+            return until_next_window
+        return min(interval, until_next_window)
+    
+    async def poll(self, base_date: Optional[date] = None) -> Dict[DOUSection, str]:
+        """
+        Verifica e baixa as seções do dia ainda ausentes do cache.
+        
+        Args:
+            base_date: Data da edição (padrão: hoje)
+        
+        Returns:
+            Dict[DOUSection, str]: Situação de cada seção configurada
+            ("cache", "baixado", "indisponível" ou "erro: ...")
+        """
+        base_date = base_date or date.today()
+        
+        if base_date != self._today_date:
+            self._today_date = base_date
+            self.today = {}
+        
+        self.polls += 1
+        self.last_poll = datetime.now()
+        
+        pending = []
+        for section in self.sections:
+            local_path = get_local_file_path(base_date, section, FileFormat.XML, self.config.cache_dir)
+            if local_path.exists():
+                self.today.setdefault(section, "cache")
+            else:
+                pending.append(section)
+        
+        if not pending:
+            return self.today
+        
+        await get_auth_instance().authenticate()
+        
+        # Ignora o cache negativo: a seção pode ter sido publicada desde a última verificação
+        probes = await probe_sections(base_date, pending, FileFormat.XML, use_cache=False)
+        
+        published = []
+        for section, probe in zip(pending, probes):
+            if isinstance(probe, Exception):
+                self.today[section] = f"erro: {probe}"
+            elif probe.available:
+                published.append(section)
+            elif probe.available is None:
+                self.today[section] = f"erro: HTTP {probe.status_code}"
+            else:
+                self.today[section] = "indisponível"
+        
+        semaphore = asyncio.Semaphore(max(1, self.config.prefetch_concurrency))
+        
+        async def fetch(section: DOUSection) -> None:
+            async with semaphore:
+                try:
+                    file_info = await download_dou_file(base_date, section, FileFormat.XML)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"Prefetch de {base_date} {section.value} falhou: {e}")
+                    self.today[section] = f"erro: {e}"
+                    return
+            
+            if file_info.file_path:
+                self.today[section] = "baixado"
+                self.files_prefetched += 1
+                get_metrics().increment("files_prefetched")
+                logger.info(f"Prefetch: {base_date} {section.value} baixado e indexado")
+            else:
+                self.today[section] = "indisponível"
+        
+        await asyncio.gather(*(fetch(section) for section in published))
+        return self.today
+    
+    def start(self) -> None:
+        """Inicia as verificações periódicas no loop atual."""
+        
+        if self._task is not None and not self._task.done():
+            return
+        
+        logger.info(
+            f"Prefetch ativo: {' '.join(s.value for s in self.sections)} "
+            f"na agenda {self.config.prefetch_schedule}"
+        )
+        self._task = asyncio.get_running_loop().create_task(self._run())
+    
+    async def _run(self) -> None:
+        """Laço das verificações agendadas."""
+        
+        while True:
+            now = datetime.now()
+            
+            if self.current_interval(now) is not None and now.weekday() < 5:
+                try:
+                    await self.poll(now.date())
+                    self.last_error = None
+                except Exception as e:
+                    self.last_error = str(e)
+                    logger.error(f"Erro na verificação de prefetch: {e}")
+                now = datetime.now()
+            
+            delay = self.next_delay(now)
+            self.next_poll = now + timedelta(seconds=delay)
+            await asyncio.sleep(delay)
+    
+    async def shutdown(self) -> None:
+        """Interrompe as verificações periódicas."""
+        
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Resume o estado da pré-carga.
+        
+        Returns:
+            Dict[str, Any]: Agenda, verificações e situação das seções do dia
+        """
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "schedule": self.config.prefetch_schedule,
+            "sections": [section.value for section in self.sections],
+            "concurrency": self.config.prefetch_concurrency,
+            "polls": self.polls,
+            "files_prefetched": self.files_prefetched,
+            "last_poll": self.last_poll,
+            "next_poll": self.next_poll,
+            "last_error": self.last_error,
+            "date": self._today_date,
+            "today": {section.value: status for section, status in self.today.items()},
+        }
+
+
+# Instância global da pré-carga
+_prefetcher_instance: Optional[DOUPrefetcher] = None
+
+
+def get_prefetcher() -> DOUPrefetcher:
+    """
+    Obtém a instância global da pré-carga.
+    
+    Returns:
+        DOUPrefetcher: Pré-carga configurada
+    
+    Raises:
+        ValueError: Se a agenda ou as seções configuradas forem inválidas
+    """
+    global _prefetcher_instance
+    
+    if _prefetcher_instance is None:
+        _prefetcher_instance = DOUPrefetcher()
+    
+    return _prefetcher_instance
+
+
+def start_prefetcher() -> None:
+    """Inicia a pré-carga se habilitada (DOU_PREFETCH_ENABLED)."""
+    
+    if not get_config().prefetch_enabled:
+        return
+    
+    try:
+        get_prefetcher().start()
+    except ValueError as e:
+        logger.error(f"Prefetch desativado, configuração inválida: {e}")
+
+
+async def shutdown_prefetcher() -> None:
+    """Interrompe a pré-carga global, se tiver sido criada."""
+    
+    if _prefetcher_instance is not None:
+        await _prefetcher_instance.shutdown()
+
+
+def register_prefetch_tools(mcp: FastMCP) -> None:
+    """Registra as ferramentas da pré-carga no servidor MCP."""
+    
+    @mcp.tool()
+    @instrument()
+    async def get_prefetch_status() -> str:
+        """
+        Mostra a agenda e o resultado da pré-carga da edição do dia.
+        """
+        config = get_config()
+        
+        if not config.prefetch_enabled:
+            return "💤 Prefetch desativado (defina DOU_PREFETCH_ENABLED=true para ativar)."
+        
+        try:
+            stats = get_prefetcher().get_stats()
+        except ValueError as e:
+            return f"❌ Erro: Configuração de prefetch inválida ({e})"
+        
+        lines = [
+            "🛰️ Prefetch da edição do dia",
+            "",
+            f"📌 Status: {'em execução' if stats['running'] else 'parado'}",
+            f"🗓️ Agenda: {stats['schedule']}",
+            f"📑 Seções: {' '.join(stats['sections'])} (até {stats['concurrency']} downloads simultâneos)",
+            f"🔁 Verificações: {stats['polls']} | 📥 Arquivos pré-carregados: {stats['files_prefetched']}",
+        ]
+        if stats["last_poll"]:
+            lines.append(f"🕒 Última verificação: {stats['last_poll']:%Y-%m-%d %H:%M:%S}")
+        if stats["next_poll"]:
+            lines.append(f"⏭️ Próxima verificação: {stats['next_poll']:%Y-%m-%d %H:%M:%S}")
+        if stats["last_error"]:
+            lines.append(f"⚠️ Último erro: {stats['last_error']}")
+        
+        if stats["today"]:
+            lines.append("")
+            lines.append(f"📅 Edição de {stats['date']}:")
+            for section, status in sorted(stats["today"].items()):
+                lines.append(f"  • {section}: {status}")
+        
+        return "\n".join(lines)
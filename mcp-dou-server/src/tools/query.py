@@ -0,0 +1,482 @@
+"""
+Linguagem de consulta da busca no DOU.
+
+Converte o texto de busca em uma árvore de cláusulas (o plano) que o
+índice avalia em uma única passada. A sintaxe aceita:
+
+- palavras seguidas formam um trecho, como na busca simples
+  (receita federal); a última palavra vale como prefixo
+- "trecho exato" entre aspas
+- AND, OR e NOT (em maiúsculas), "-" como NOT e parênteses
+- campos: identifica:, ementa:, titulo:, subtitulo:, texto:, orgao:,
+  tipo:, secao: e data: (ex: ementa:"dispensa de licitação",
+  orgao:(saúde OR educação), secao:DO1)
+- datas: data:2024-09-17, data:2024-09, data:2024,
+  data:2024-09-01..2024-09-30, data:>=2024-09-01, data:<2024-10-01
+
+Consultas sem nenhum desses elementos continuam sendo tratadas pela busca
+simples (is_simple_query).
+"""
+
+import calendar
+import re
+from datetime import date
+from typing import List, Optional, Tuple
+
+from .text import fold_text
+
+
+# Campos de texto (nomes de INDEXED_FIELDS no índice)
+TEXT_FIELDS = ("identifica", "ementa", "titulo", "subtitulo", "texto")
+
+# Campos de metadados: coluna do catálogo e modo de comparação
+METADATA_FIELDS = {
+    "orgao": ("art_category", "contains"),
+    "tipo": ("art_type", "contains"),
+    "secao": ("pub_name", "prefix"),
+}
+
+DATE_FIELD = "data"
+
+_OPERATORS = ("AND", "OR", "NOT")
+
+# Ordem das alternativas importa: campo antes de palavra, "-" só no início de um termo
+_LEX_RE = re.compile(
+    r'\s*(?:'
+    r'(?P<phrase>"[^"]*"?)'
+    r'|(?P<lparen>\()'
+    r'|(?P<rparen>\))'
+    r'|(?P<field>[^\s():"\-][^\s():"]*):(?=[^\s)])'
+    r'|(?P<minus>-)(?=[^\s\-)])'
+    r'|(?P<word>[^\s()"]+)'
+    r')'
+)
+
+_DATE_RE = re.compile(r"^(\d{4})(?:-(\d{2})(?:-(\d{2}))?)?$")
+_BR_DATE_RE = re.compile(r"^(\d{2})/(\d{2})/(\d{4})$")
+
+Token = Tuple[str, str]
+
+
+class QuerySyntaxError(ValueError):
+    """Erro de sintaxe na consulta."""
+
+
+class QueryNode:
+    """Nó do plano de consulta."""
+    
+    def describe(self) -> str:
+        """Forma canônica do nó (usada em mensagens e como chave de cache)."""
+        raise NotImplementedError
+
+
+class TextClause(QueryNode):
+    """
+    Trecho que deve ocorrer em posições consecutivas de um campo de texto.
+    
+    Attributes:
+        text: Trecho normalizado (fold_text)
+        fields: Campos permitidos (None = todos os campos indexados)
+        prefix: Se o último termo vale como prefixo
+    """
+    
+    def __init__(self, text: str, fields: Optional[Tuple[str, ...]] = None, prefix: bool = False):
+        self.text = text
+        self.fields = fields
+        self.prefix = prefix
+    
+    def describe(self) -> str:
+        scope = f"{self.fields[0]}:" if self.fields else ""
+        return f'{scope}"{self.text}"{"*" if self.prefix else ""}'
+
+
+class MetadataClause(QueryNode):
+    """
+    Filtro por trecho de um campo de metadados do catálogo.
+    
+    Attributes:
+        field: Nome do campo na consulta (orgao, tipo, secao)
+        column: Coluna do catálogo
+        value: Valor normalizado (fold_text)
+        mode: "contains" (trecho) ou "prefix" (início do valor)
+    """
+    
+    def __init__(self, field: str, value: str):
+        self.field = field
+        self.column, self.mode = METADATA_FIELDS[field]
+        self.value = value
+    
+    def describe(self) -> str:
+        return f'{self.field}:"{self.value}"'
+
+
+class DateClause(QueryNode):
+    """
+    Intervalo fechado de datas de publicação (AAAA-MM-DD).
+    
+    Attributes:
+        start: Data inicial ou None (sem limite)
+        end: Data final ou None (sem limite)
+    """
+    
+    def __init__(self, start: Optional[str], end: Optional[str]):
+        self.start = start
+        self.end = end
+    
+    def describe(self) -> str:
+        return f"{DATE_FIELD}:[{self.start or '*'}..{self.end or '*'}]"
+
+
+class AndNode(QueryNode):
+    """Todos os filhos devem ser satisfeitos."""
+    
+    def __init__(self, children: List[QueryNode]):
+        self.children = children
+    
+    def describe(self) -> str:
+        return "(" + " AND ".join(child.describe() for child in self.children) + ")"
+
+
+class OrNode(QueryNode):
+    """Ao menos um dos filhos deve ser satisfeito."""
+    
+    def __init__(self, children: List[QueryNode]):
+        self.children = children
+    
+    def describe(self) -> str:
+        return "(" + " OR ".join(child.describe() for child in self.children) + ")"
+
+
+class NotNode(QueryNode):
+    """O filho não deve ser satisfeito."""
+    
+    def __init__(self, child: QueryNode):
+        self.child = child
+    
+    def describe(self) -> str:
+        return f"NOT {self.child.describe()}"
+
+
+def _lex(query: str) -> List[Token]:
+    """Divide a consulta em tokens (tipo, valor)."""
+    
+    tokens: List[Token] = []
+    position = 0
+    query = query.strip()
+    
+    while position < len(query):
+        match = _LEX_RE.match(query, position)
+        if match is None or match.end() == position:
+            break
+        position = match.end()
+        
+        kind = match.lastgroup
+        value = match.group(kind)
+        
+        if kind == "phrase":
+            tokens.append(("phrase", value[1:-1] if value.endswith('"') and len(value) > 1 else value[1:]))
+        elif kind == "field":
+            name = fold_text(value)
+            if name in TEXT_FIELDS or name in METADATA_FIELDS or name == DATE_FIELD:
+                tokens.append(("field", name))
+            else:
+                # Não é um campo conhecido: os dois-pontos fazem parte do texto
+                tokens.append(("word", value + ":"))
+        elif kind == "word" and value in _OPERATORS:
+            tokens.append(("op", value))
+        else:
+            tokens.append((kind, value))
+    
+    return tokens
+
+
+def is_simple_query(query: str) -> bool:
+    """
+    Indica se a consulta é um texto simples, sem operadores, aspas ou campos.
+    
+    Args:
+        query: Texto da consulta
+    
+    Returns:
+        bool: True se a consulta deve usar a busca por trecho tradicional
+    """
+    return all(kind == "word" for kind, _ in _lex(query or ""))
+
+
+def _month_end(year: int, month: int) -> int:
+    """Último dia do mês."""
+    return calendar.monthrange(year, month)[1]
+
+
+def _date_bounds(value: str) -> Tuple[str, str]:
+    """Converte uma data completa ou parcial no intervalo que ela cobre."""
+    
+    br_match = _BR_DATE_RE.match(value)
+    if br_match:
+        day, month, year = br_match.groups()
+        value = f"{year}-{month}-{day}"
+    
+    match = _DATE_RE.match(value)
+    if not match:
+        raise QuerySyntaxError(f"Data inválida: {value} (use AAAA-MM-DD, AAAA-MM ou AAAA)")
+    
+    year, month, day = match.groups()
+    try:
+        if day:
+            iso = date(int(year), int(month), int(day)).isoformat()
+            return iso, iso
+        if month:
+            first = date(int(year), int(month), 1)
+            return first.isoformat(), first.replace(day=_month_end(first.year, first.month)).isoformat()
+        return f"{year}-01-01", f"{year}-12-31"
+    except ValueError:
+        raise QuerySyntaxError(f"Data inválida: {value}")
+
+
+def parse_date_term(value: str) -> DateClause:
+    """
+    Interpreta o valor de um termo data:.
+    
+    Args:
+        value: Data, mês ou ano; intervalo "a..b"; ou comparação (>=, >, <=, <)
+    
+    Returns:
+        DateClause: Intervalo correspondente
+    """
+    value = value.strip()
+    
+    if ".." in value:
+        start, end = value.split("..", 1)
+        return DateClause(
+            _date_bounds(start)[0] if start else None,
+            _date_bounds(end)[1] if end else None
+        )
+    
+    for operator in (">=", "<=", ">", "<"):
+        if value.startswith(operator):
+            first, last = _date_bounds(value[len(operator):])
+            if operator == ">=":
+                return DateClause(first, None)
+            if operator == "<=":
+                return DateClause(None, last)
+            if operator == ">":
+                return DateClause(_next_day(last), None)
+            return DateClause(None, _previous_day(first))
+    
+    return DateClause(*_date_bounds(value))
+
+
+def _next_day(iso: str) -> str:
+    """Dia seguinte a uma data AAAA-MM-DD."""
+    return date.fromordinal(date.fromisoformat(iso).toordinal() + 1).isoformat()
+
+
+def _previous_day(iso: str) -> str:
+    """Dia anterior a uma data AAAA-MM-DD."""
+    return date.fromordinal(date.fromisoformat(iso).toordinal() - 1).isoformat()
+
+
+def _leaf(field: Optional[str], text: str, quoted: bool) -> Optional[QueryNode]:
+    """Cria a cláusula de um trecho no contexto de um campo."""
+    
+    if field == DATE_FIELD:
+        return parse_date_term(text)
+    
+    folded = fold_text(text)
+    if not folded:
+        return None
+    
+    if field in METADATA_FIELDS:
+        # secao:1 equivale a secao:DO1
+        if field == "secao" and folded.isdigit():
+            folded = f"do{folded}"
+        return MetadataClause(field, folded)
+    
+    return TextClause(folded, (field,) if field else None, prefix=not quoted)
+
+
+class _Parser:
+    """Analisador descendente recursivo da linguagem de consulta."""
+    
+    def __init__(self, tokens: List[Token]):
+        self.tokens = tokens
+        self.position = 0
+    
+    def peek(self) -> Optional[Token]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+    
+    def take(self) -> Token:
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+    
+    def parse(self) -> Optional[QueryNode]:
+        node = self.parse_or(None)
+        if self.peek() is not None:
+            kind, value = self.peek()
+            raise QuerySyntaxError(f"Token inesperado: {value if kind != 'rparen' else ')'}")
+        return node
+    
+    def parse_or(self, field: Optional[str]) -> Optional[QueryNode]:
+        children = [self.parse_and(field)]
+        while self.peek() == ("op", "OR"):
+            self.take()
+            if self.peek() is None or self.peek()[0] == "rparen":
+                raise QuerySyntaxError("OR sem termo à direita")
+            children.append(self.parse_and(field))
+        return _combine(OrNode, children)
+    
+    def parse_and(self, field: Optional[str]) -> Optional[QueryNode]:
+        children = []
+        expecting = True
+        
+        while True:
+            token = self.peek()
+            if token is None or token[0] == "rparen" or token == ("op", "OR"):
+                break
+            if token == ("op", "AND"):
+                if expecting:
+                    raise QuerySyntaxError("AND sem termo à esquerda")
+                self.take()
+                expecting = True
+                continue
+            children.append(self.parse_unary(field))
+            expecting = False
+        
+        if expecting and children:
+            raise QuerySyntaxError("AND sem termo à direita")
+        if not children:
+            raise QuerySyntaxError("Expressão vazia")
+        return _combine(AndNode, children)
+    
+    def parse_unary(self, field: Optional[str]) -> Optional[QueryNode]:
+        token = self.peek()
+        if token == ("op", "NOT") or token[0] == "minus":
+            self.take()
+            if self.peek() is None:
+                raise QuerySyntaxError("NOT sem termo")
+            child = self.parse_unary(field)
+            return NotNode(child) if child is not None else None
+        return self.parse_primary(field)
+    
+    def parse_primary(self, field: Optional[str]) -> Optional[QueryNode]:
+        kind, value = self.take()
+        
+        if kind == "lparen":
+            node = self.parse_or(field)
+            if self.peek() is not None and self.peek()[0] == "rparen":
+                self.take()
+            return node
+        
+        if kind == "field":
+            if self.peek() is None:
+                raise QuerySyntaxError(f"Campo {value}: sem valor")
+            if self.peek()[0] == "lparen":
+                return self.parse_primary(value)
+            next_kind, next_value = self.take()
+            if next_kind not in ("word", "phrase"):
+                raise QuerySyntaxError(f"Valor inválido para {value}:")
+            return _leaf(value, next_value, quoted=next_kind == "phrase")
+        
+        if kind == "phrase":
+            return _leaf(field, value, quoted=True)
+        
+        if kind == "word":
+            # Palavras seguidas formam um único trecho; datas são termos isolados
+            words = [value]
+            while field != DATE_FIELD and self.peek() is not None and self.peek()[0] == "word":
+                words.append(self.take()[1])
+            return _leaf(field, " ".join(words), quoted=False)
+        
+        if kind == "rparen":
+            raise QuerySyntaxError("Parêntese ')' sem abertura")
+        raise QuerySyntaxError(f"Operador {value} sem termo")
+
+
+def _combine(node_type, children: List[Optional[QueryNode]]) -> Optional[QueryNode]:
+    """Cria um nó AND/OR, achatando filhos do mesmo tipo e ignorando vazios."""
+    
+    flat: List[QueryNode] = []
+    for child in children:
+        if child is None:
+            continue
+        if isinstance(child, node_type):
+            flat.extend(child.children)
+        else:
+            flat.append(child)
+    
+    if not flat:
+        return None
+    if len(flat) == 1:
+        return flat[0]
+    return node_type(flat)
+
+
+def parse_query(query: str) -> Optional[QueryNode]:
+    """
+    Converte o texto de uma consulta no plano de avaliação.
+    
+    Args:
+        query: Texto da consulta
+    
+    Returns:
+        Optional[QueryNode]: Raiz do plano, ou None se não houver critérios
+    
+    Raises:
+        QuerySyntaxError: Se a consulta for inválida
+    """
+    tokens = _lex(query or "")
+    if not tokens:
+        return None
+    return _Parser(tokens).parse()
+
+
+def with_filters(
+    plan: Optional[QueryNode],
+    publication_type: Optional[str] = None,
+    organ: Optional[str] = None
+) -> Optional[QueryNode]:
+    """
+    Acrescenta ao plano os filtros de tipo e órgão informados à parte.
+    
+    Args:
+        plan: Plano da consulta
+        publication_type: Trecho do tipo de publicação
+        organ: Trecho do órgão
+    
+    Returns:
+        Optional[QueryNode]: Plano combinado com AND
+    """
+    children = [plan]
+    if publication_type and fold_text(publication_type):
+        children.append(MetadataClause("tipo", fold_text(publication_type)))
+    if organ and fold_text(organ):
+        children.append(MetadataClause("orgao", fold_text(organ)))
+    return _combine(AndNode, children)
+
+
+def highlight_terms(node: Optional[QueryNode]) -> List[str]:
+    """
+    Trechos de texto fora de um NOT que podem ocorrer no campo texto.
+    
+    Args:
+        node: Plano de consulta
+    
+    Returns:
+        List[str]: Trechos normalizados (fold_text), na ordem da consulta
+    """
+    if isinstance(node, TextClause):
+        return [node.text] if node.fields is None or "texto" in node.fields else []
+    if isinstance(node, (AndNode, OrNode)):
+        return [text for child in node.children for text in highlight_terms(child)]
+    return []
+
+
+def has_positive_text(node: Optional[QueryNode]) -> bool:
+    """Indica se o plano tem cláusulas de texto fora de um NOT (ordenação por relevância)."""
+    
+    if isinstance(node, TextClause):
+        return True
+    if isinstance(node, (AndNode, OrNode)):
+        return any(has_positive_text(child) for child in node.children)
+    return False
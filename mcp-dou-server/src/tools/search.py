@@ -5,29 +5,233 @@ Este módulo implementa funcionalidades de busca no conteúdo
 dos arquivos do Diário Oficial da União.
 """
 
-import glob
+import asyncio
 import logging
-import re
 import time
-from datetime import datetime, date
+from collections import OrderedDict
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import Any, List, Dict, Optional, Tuple
 
 from mcp.server.fastmcp import FastMCP
 
 from ..config.settings import get_config
 from ..models.dou_models import DOUArticle, DOUSection
-from .parser import DOUXMLParser
+from .cache_manager import get_cache_manager, normalize_date
+from .index import get_search_index, tokenize
+from .metrics import instrument
+from .parser import DOUXMLParser, build_search_text
+from .query import (
+    QueryNode,
+    has_positive_text,
+    highlight_terms,
+    is_simple_query,
+    parse_query,
+    with_filters
+)
+from .text import fold_text, fold_text_with_offsets
+from .tracing import span, stage
 
 
 logger = logging.getLogger(__name__)
 
+# Chave de uma busca: critérios normalizados
+SearchKey = Tuple[Any, ...]
+
+# Estado em que um resultado foi calculado: geração do índice e assinatura
+# dos diretórios do cache
+SearchState = Tuple[int, Tuple[Tuple[str, float], ...]]
+
+
+def build_excerpt(texto: str, terms: List[str], context: int = 100) -> Optional[str]:
+    """
+    Recorta o texto em torno da primeira ocorrência de um dos trechos buscados.
+    
+    A localização usa a mesma normalização da busca (sem diferenciar
+    maiúsculas, acentos e espaços) e é mapeada de volta para o texto original.
+    
+    Args:
+        texto: Texto do artigo
+        terms: Trechos normalizados por fold_text
+        context: Caracteres exibidos antes e depois do trecho
+    
+    Returns:
+        Optional[str]: Trecho do texto original, ou None se nenhum ocorrer
+    """
+    folded, offsets = fold_text_with_offsets(texto)
+    
+    found = None
+    for term in terms:
+        position = folded.find(term) if term else -1
+        if position >= 0 and (found is None or position < found[0]):
+            found = (position, position + len(term))
+    if found is None:
+        return None
+    
+    match_start = offsets[found[0]]
+    match_end = offsets[found[1] - 1] + 1
+    start = max(0, match_start - context)
+    end = min(len(texto), match_end + context)
+    
+    excerpt = texto[start:end]
+    if start > 0:
+        excerpt = "..." + excerpt
+    if end < len(texto):
+        excerpt = excerpt + "..."
+    return excerpt
+
+
+class DOUSearchResultCache:
+    """
+    Cache LRU em memória dos resultados de search_content.
+    
+    Cada entrada guarda o estado em que foi calculada (geração do índice e
+    assinatura dos diretórios do cache) e os arquivos consultados; quando
+    arquivos são indexados, removidos ou copiados para o cache o estado
+    muda e as entradas antigas deixam de ser servidas.
+    """
+    
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[SearchKey, Tuple[SearchState, List[DOUArticle], Dict, List[Path]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def make_key(
+        query_key: str,
+        start_date: Optional[str],
+        end_date: Optional[str],
+        sections: Optional[List[str]],
+        publication_type: Optional[str],
+        organ: Optional[str],
+        max_results: int
+    ) -> SearchKey:
+        """
+        Normaliza os critérios de uma busca.
+        
+        Filtros são comparados sem diferenciar maiúsculas, acentos e espaços
+        extras, assim como a busca; seções são tratadas como conjunto.
+        
+        Args:
+            query_key: Consulta já normalizada (texto simples passado por
+                fold_text ou a forma canônica do plano)
+        
+        Returns:
+            SearchKey: Chave da busca
+        """
+        return (
+            query_key,
+            (start_date or "").strip(),
+            (end_date or "").strip(),
+            tuple(sorted({s.strip().upper() for s in sections or [] if s.strip()})),
+            fold_text(publication_type),
+            fold_text(organ),
+            max_results,
+        )
+    
+    def get(
+        self,
+        key: SearchKey,
+        state: SearchState
+    ) -> Optional[Tuple[List[DOUArticle], Dict, List[Path]]]:
+        """
+        Obtém o resultado de uma busca, se calculado no estado atual.
+        
+        Args:
+            key: Chave da busca
+            state: Geração atual do índice e assinatura do cache
+        
+        Returns:
+            Optional[Tuple[List[DOUArticle], Dict, List[Path]]]: Artigos,
+            estatísticas e arquivos consultados, ou None
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != state:
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return list(entry[1]), dict(entry[2], scores=list(entry[2].get('scores', []))), entry[3]
+    
+    def put(
+        self,
+        key: SearchKey,
+        state: SearchState,
+        articles: List[DOUArticle],
+        stats: Dict,
+        files: List[Path]
+    ) -> None:
+        """
+        Guarda o resultado de uma busca.
+        
+        Args:
+            key: Chave da busca
+            state: Estado lido antes de consultar o índice
+            articles: Artigos encontrados
+            stats: Estatísticas da busca
+            files: Arquivos consultados (para registrar os acessos nos acertos)
+        """
+        if self.max_entries <= 0:
+            return
+        
+        self._entries[key] = (state, list(articles), dict(stats), list(files))
+        self._entries.move_to_end(key)
+        
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Remove todas as entradas."""
+        
+        self._entries.clear()
+    
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Obtém estatísticas do cache.
+        
+        Returns:
+            Dict[str, int]: Entradas, capacidade, acertos e falhas
+        """
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+# Instância global do cache de resultados
+_result_cache_instance: Optional[DOUSearchResultCache] = None
+
+
+def get_search_result_cache() -> DOUSearchResultCache:
+    """
+    Obtém a instância global do cache de resultados de busca.
+    
+    Returns:
+        DOUSearchResultCache: Cache de resultados
+    """
+    global _result_cache_instance
+    
+    if _result_cache_instance is None:
+        _result_cache_instance = DOUSearchResultCache(get_config().search_cache_size)
+    
+    return _result_cache_instance
+
 
 class DOUSearchEngine:
-    """Motor de busca para conteúdo DOU."""
+    """Motor de busca para conteúdo DOU, apoiado no índice invertido."""
+    
+    # Quantidade de artigos carregados do índice por vez
+    LOAD_BATCH_SIZE = 200
     
     def __init__(self):
         self.parser = DOUXMLParser()
+        self.index = get_search_index()
+        self.result_cache = get_search_result_cache()
         self.config = get_config()
     
     async def search_content(
@@ -43,6 +247,20 @@ class DOUSearchEngine:
         """
         Busca no conteúdo com filtros.
         
+        Com texto de busca, os artigos vêm ordenados por relevância (BM25)
+        e stats['scores'] traz a pontuação de cada um; sem texto, vêm na
+        ordem dos arquivos.
+        
+        Consultas com operadores, aspas ou campos (ver módulo query) são
+        compiladas uma vez em um plano avaliado pelo índice; stats['plan'] e
+        stats['plan_steps'] descrevem a avaliação.
+        
+        Buscas repetidas com os mesmos critérios são respondidas pelo cache
+        de resultados, antes de localizar arquivos ou sincronizar o índice,
+        enquanto o índice e os diretórios do cache não mudarem
+        (stats['cache_hit']). Os acessos aos arquivos são registrados em
+        memória e gravados em lote pelo gerenciador de cache.
+        
         Args:
             query: Texto a ser buscado
             start_date: Data inicial (YYYY-MM-DD)
@@ -58,43 +276,259 @@ class DOUSearchEngine:
         found_articles = []
         stats = {
             'files_searched': 0,
+            'files_indexed': 0,
             'articles_processed': 0,
             'matches_found': 0,
+            'scores': [],
+            'cache_hit': False,
             'search_time_ms': 0
         }
         
         start_time = time.time()
+        # Zero ou negativo viraria LIMIT sem efeito no índice
+        max_results = max(1, int(max_results))
         
-        try:
-            # Encontra arquivos ZIP na estrutura de cache
-            zip_files = self._find_zip_files(start_date, end_date, sections)
-            
-            for zip_file in zip_files:
-                stats['files_searched'] += 1
+        with span("search_content", query=query, max_results=max_results) as current:
+            try:
+                # A consulta é interpretada uma única vez, antes de qualquer acesso ao índice
+                with span("search.parse_query"):
+                    plan = None if is_simple_query(query) else parse_query(query)
+                
+                # 2024-9-16 e 2024-09-16 são a mesma busca; datas inválidas viram erro
+                start_date = normalize_date(start_date)
+                end_date = normalize_date(end_date)
                 
-                # Parsea arquivo ZIP
-                articles = await self.parser.parse_zip_file(str(zip_file))
-                stats['articles_processed'] += len(articles)
+                cache_manager = get_cache_manager()
+                cache_key = self.result_cache.make_key(
+                    plan.describe() if plan is not None else fold_text(query),
+                    start_date, end_date, sections, publication_type, organ, max_results
+                )
+                
+                # O estado é lido antes de localizar os arquivos: se o índice ou o
+                # cache mudarem durante a busca, o resultado expira
+                signature = await asyncio.to_thread(cache_manager.get_signature)
+                cached = self.result_cache.get(cache_key, (self.index.generation, signature))
+                if cached is not None:
+                    found_articles, stats, zip_files = cached
+                    cache_manager.touch(zip_files)
+                    stats['cache_hit'] = True
+                    stats['files_indexed'] = 0
+                    stats['search_time_ms'] = (time.time() - start_time) * 1000
+                    current.set(cache_hit=True, matches=stats['matches_found'])
+                    return found_articles, stats
+                
+                # Encontra arquivos ZIP na estrutura de cache
+                with span("search.find_files") as step:
+                    zip_files = await asyncio.to_thread(
+                        self._find_zip_files, start_date, end_date, sections
+                    )
+                    step.set(files=len(zip_files))
+                stats['files_searched'] = len(zip_files)
+                cache_manager.touch(zip_files)
+                
+                # Indexa arquivos novos ou modificados antes de consultar
+                with span("search.index_sync") as step:
+                    stats['files_indexed'] = await self.index.sync(zip_files)
+                    step.set(files_indexed=stats['files_indexed'])
+                
+                if stats['files_indexed']:
+                    # Os sidecars gravados na indexação mudam os mtimes dos diretórios;
+                    # a nova assinatura só vale se os arquivos da busca não mudaram
+                    new_signature = await asyncio.to_thread(cache_manager.get_signature)
+                    current_files = await asyncio.to_thread(
+                        self._find_zip_files, start_date, end_date, sections
+                    )
+                    if current_files == zip_files:
+                        signature = new_signature
+                
+                # A geração é lida depois da sincronização e antes da consulta
+                state = (self.index.generation, signature)
+                
+                if plan is not None:
+                    await self._collect_planned(
+                        plan, zip_files, publication_type, organ, max_results,
+                        found_articles, stats
+                    )
+                elif tokenize(query or ""):
+                    await self._collect_ranked(
+                        query, zip_files, publication_type, organ, max_results,
+                        found_articles, stats
+                    )
+                else:
+                    # Sem texto, os filtros de metadados são resolvidos no catálogo
+                    with span("index.filter_keys"):
+                        keys = await asyncio.to_thread(
+                            self.index.filter_keys, zip_files, publication_type, organ, max_results
+                        )
+                    
+                    for i in range(0, len(keys), self.LOAD_BATCH_SIZE):
+                        batch = keys[i:i + self.LOAD_BATCH_SIZE]
+                        with span("index.load_articles", keys=len(batch)):
+                            articles = await asyncio.to_thread(self.index.load_articles, batch)
+                        found_articles.extend(articles)
+                    
+                    stats['articles_processed'] = len(found_articles)
+                    stats['matches_found'] = len(found_articles)
+                
+                stats['search_time_ms'] = (time.time() - start_time) * 1000
+                self.result_cache.put(cache_key, state, found_articles, stats, zip_files)
+                current.set(cache_hit=False, matches=stats['matches_found'])
+                
+            except Exception as e:
+                logger.error(f"Erro na busca: {e}")
+                stats['error'] = str(e)
+                current.set(error=str(e))
+        
+        return found_articles, stats
+    
+    async def _collect_planned(
+        self,
+        plan: QueryNode,
+        zip_files: List[Path],
+        publication_type: Optional[str],
+        organ: Optional[str],
+        max_results: int,
+        found_articles: List[DOUArticle],
+        stats: Dict
+    ) -> None:
+        """
+        Preenche found_articles com o resultado de um plano de consulta.
+        
+        Os filtros de tipo e órgão entram no plano como cláusulas; o plano é
+        avaliado por completo no índice, então não há verificação posterior.
+        """
+        plan = with_filters(plan, publication_type, organ)
+        with span("index.execute_plan", plan=plan.describe()) as step:
+            ranked, details = await asyncio.to_thread(
+                self.index.execute_plan, plan, zip_files, max_results
+            )
+            step.set(matches=details['matches'])
+        
+        stats['plan'] = plan.describe()
+        stats['plan_steps'] = details['steps']
+        stats['total_matches'] = details['matches']
+        ranked_by_relevance = has_positive_text(plan)
+        
+        for i in range(0, len(ranked), self.LOAD_BATCH_SIZE):
+            batch = ranked[i:i + self.LOAD_BATCH_SIZE]
+            with span("index.load_articles", keys=len(batch)):
+                articles = await asyncio.to_thread(
+                    self.index.load_article_map, [key for key, _ in batch]
+                )
+            
+            for key, score in batch:
+                article = articles.get(key)
+                if article is None:
+                    continue
+                found_articles.append(article)
+                if ranked_by_relevance:
+                    stats['scores'].append(score)
+        
+        stats['articles_processed'] = len(found_articles)
+        stats['matches_found'] = len(found_articles)
+    
+    async def _collect_ranked(
+        self,
+        query: str,
+        zip_files: List[Path],
+        publication_type: Optional[str],
+        organ: Optional[str],
+        max_results: int,
+        found_articles: List[DOUArticle],
+        stats: Dict
+    ) -> None:
+        """
+        Preenche found_articles com os artigos mais relevantes que passam nos filtros.
+        
+        Pede ao índice os max_results melhores (já filtrados por tipo e
+        órgão no catálogo); se a verificação final descartar parte deles,
+        pede os seguintes (dobrando a quantidade) até completar o limite ou
+        esgotar os candidatos.
+        """
+        seen: set = set()
+        limit = max_results
+        
+        # Critérios normalizados uma única vez por busca
+        folded_query = fold_text(query)
+        folded_type = fold_text(publication_type)
+        folded_organ = fold_text(organ)
+        
+        while len(found_articles) < max_results:
+            with span("index.top_k", limit=limit) as step:
+                ranked = await asyncio.to_thread(
+                    self.index.top_k, query, zip_files, limit, seen, publication_type, organ
+                )
+                step.set(candidates=len(ranked))
+            
+            for i in range(0, len(ranked), self.LOAD_BATCH_SIZE):
+                batch = ranked[i:i + self.LOAD_BATCH_SIZE]
+                with span("index.load_articles", keys=len(batch)):
+                    articles = await asyncio.to_thread(
+                        self.index.load_article_map, [key for key, _ in batch]
+                    )
                 
-                # Aplica filtros e busca
-                for article in articles:
-                    if self._matches_filters(article, query, publication_type, organ):
+                for key, score in batch:
+                    seen.add(key)
+                    article = articles.get(key)
+                    if article is None:
+                        continue
+                    
+                    stats['articles_processed'] += 1
+                    
+                    with stage("search.filter"):
+                        matched = self._matches_filters(
+                            article, folded_query, folded_type, folded_organ
+                        )
+                    
+                    if matched:
                         found_articles.append(article)
+                        stats['scores'].append(score)
                         stats['matches_found'] += 1
                         
                         if len(found_articles) >= max_results:
-                            break
-                
-                if len(found_articles) >= max_results:
-                    break
-            
-            stats['search_time_ms'] = (time.time() - start_time) * 1000
+                            return
             
-        except Exception as e:
-            logger.error(f"Erro na busca: {e}")
-            stats['error'] = str(e)
+            if len(ranked) < limit:
+                return
+            limit *= 2
+    
+    async def summarize_publications(
+        self,
+        date_str: str,
+        sections: Optional[List[str]] = None,
+        publication_type: Optional[str] = None,
+        organ: Optional[str] = None,
+        examples: int = 5
+    ) -> Tuple[Dict, List[DOUArticle], Dict]:
+        """
+        Conta as publicações de uma data pelo catálogo de metadados.
         
-        return found_articles, stats
+        Args:
+            date_str: Data no formato YYYY-MM-DD
+            sections: Lista de seções (DO1, DO2, DO3)
+            publication_type: Tipo de publicação
+            organ: Nome do órgão
+            examples: Quantidade de artigos de exemplo
+        
+        Returns:
+            Tuple[Dict, List[DOUArticle], Dict]: Contagens (ver
+            DOUSearchIndex.count_metadata), artigos de exemplo e estatísticas
+        """
+        zip_files = await asyncio.to_thread(self._find_zip_files, date_str, date_str, sections)
+        stats = {
+            'files_searched': len(zip_files),
+            'files_indexed': await self.index.sync(zip_files),
+        }
+        
+        counts = await asyncio.to_thread(
+            self.index.count_metadata, zip_files, publication_type, organ
+        )
+        keys = await asyncio.to_thread(
+            self.index.filter_keys, zip_files, publication_type, organ, examples
+        )
+        articles = await asyncio.to_thread(self.index.load_articles, keys)
+        
+        return counts, articles, stats
     
     def _find_zip_files(
         self,
@@ -102,94 +536,39 @@ class DOUSearchEngine:
         end_date: Optional[str] = None,
         sections: Optional[List[str]] = None
     ) -> List[Path]:
-        """Encontra arquivos ZIP baseado nos filtros de data e seção."""
-        
-        cache_dir = Path(self.config.cache_dir)
-        zip_files = []
-        
-        # Se não há filtros de data, busca todos os ZIPs
-        if not start_date and not end_date:
-            pattern = str(cache_dir / "**" / "*.zip")
-            zip_files = [Path(f) for f in glob.glob(pattern, recursive=True)]
-        else:
-            # Busca por intervalos de data
-            start_dt = datetime.strptime(start_date, "%Y-%m-%d").date() if start_date else date(2020, 1, 1)
-            end_dt = datetime.strptime(end_date, "%Y-%m-%d").date() if end_date else date.today()
-            
-            # Varre diretórios de ano/mês
-            for year_dir in cache_dir.iterdir():
-                if not year_dir.is_dir() or not year_dir.name.isdigit():
-                    continue
-                
-                year = int(year_dir.name)
-                
-                for month_dir in year_dir.iterdir():
-                    if not month_dir.is_dir() or not month_dir.name.isdigit():
-                        continue
-                    
-                    month = int(month_dir.name)
-                    
-                    # Busca ZIPs neste mês
-                    for zip_file in month_dir.glob("*.zip"):
-                        # Extrai data do nome do arquivo
-                        match = re.match(r'(\d{4}-\d{2}-\d{2})-', zip_file.name)
-                        if match:
-                            file_date = datetime.strptime(match.group(1), "%Y-%m-%d").date()
-                            
-                            if start_dt <= file_date <= end_dt:
-                                # Filtra por seção se especificado
-                                if sections:
-                                    for section in sections:
-                                        if section in zip_file.name:
-                                            zip_files.append(zip_file)
-                                            break
-                                else:
-                                    zip_files.append(zip_file)
-        
-        return sorted(zip_files)
+        """Encontra arquivos ZIP baseado nos filtros de data e seção (via manifesto do cache)."""
+        
+        return get_cache_manager().find_files(start_date, end_date, sections, file_format="xml")
     
     def _matches_filters(
         self,
         article: DOUArticle,
-        query: str,
-        publication_type: Optional[str] = None,
-        organ: Optional[str] = None
+        folded_query: str,
+        folded_type: str = "",
+        folded_organ: str = ""
     ) -> bool:
-        """Verifica se um artigo atende aos filtros de busca."""
+        """
+        Verifica se um artigo atende aos filtros de busca.
+        
+        Os critérios devem vir normalizados por fold_text; o texto do artigo
+        já é normalizado na extração (search_text), então a comparação não
+        diferencia maiúsculas nem acentos.
+        """
         
         # Filtro por tipo de publicação
-        if publication_type:
-            if not article.metadata.art_type:
-                return False
-            if publication_type.lower() not in article.metadata.art_type.lower():
-                return False
+        if folded_type and folded_type not in fold_text(article.metadata.art_type):
+            return False
         
         # Filtro por órgão
-        if organ:
-            if not article.metadata.art_category:
-                return False
-            if organ.lower() not in article.metadata.art_category.lower():
-                return False
+        if folded_organ and folded_organ not in fold_text(article.metadata.art_category):
+            return False
         
-        # Busca textual (case-insensitive)
-        if query:
-            query_lower = query.lower()
-            
-            # Busca em todos os campos de texto
-            search_fields = [
-                article.content.identifica or "",
-                article.content.ementa or "",
-                article.content.titulo or "",
-                article.content.subtitulo or "",
-                article.content.texto or "",
-                article.metadata.name or "",
-                article.metadata.art_category or ""
-            ]
-            
-            text_to_search = " ".join(search_fields).lower()
-            
-            # Busca simples por substring
-            if query_lower not in text_to_search:
+        # Busca textual por trecho, sobre o texto pré-normalizado
+        if folded_query:
+            search_text = article.search_text
+            if search_text is None:
+                search_text = build_search_text(article.metadata, article.content)
+            if folded_query not in search_text:
                 return False
         
         return True
@@ -201,6 +580,7 @@ def register_search_tools(mcp: FastMCP) -> None:
     search_engine = DOUSearchEngine()
     
     @mcp.tool()
+    @instrument()
     async def search_dou_content(
         query: str,
         start_date: str = "",
@@ -213,8 +593,17 @@ def register_search_tools(mcp: FastMCP) -> None:
         """
         Busca por conteúdo específico nos arquivos DOU baixados.
         
+        O texto simples é buscado por palavras inteiras, em sequência e sem
+        diferenciar acentos; a última palavra vale como prefixo ("licit"
+        encontra "licitação", mas "citação" não). Além dele, a consulta aceita AND, OR, NOT (ou "-"), parênteses, "trechos exatos"
+        e campos: identifica:, ementa:, titulo:, subtitulo:, texto:,
+        orgao:, tipo:, secao: e data: (2024-09-17, 2024-09,
+        2024-09-01..2024-09-30, >=2024-09-01). Palavras seguidas sem
+        operador formam um único trecho.
+        Ex: ementa:"dispensa de licitação" AND (orgao:saúde OR orgao:educação) NOT tipo:extrato
+        
         Args:
-            query: Texto a ser buscado (ex: "Receita Federal do Brasil")
+            query: Texto ou consulta a ser buscada (ex: "Receita Federal do Brasil")
             start_date: Data inicial (YYYY-MM-DD, opcional)
             end_date: Data final (YYYY-MM-DD, opcional)
             sections: Seções a serem pesquisadas (ex: "DO1 DO2 DO3")
@@ -240,11 +629,14 @@ def register_search_tools(mcp: FastMCP) -> None:
                 sections=sections_list,
                 publication_type=publication_type_param,
                 organ=organ_param,
-                max_results=max_results
+                max_results=max(1, max_results)
             )
             
             execution_time = (time.time() - start_time) * 1000
             
+            if stats.get('error'):
+                return f"❌ Erro na busca: {stats['error']}"
+            
             # Formata resultado
             result = []
             result.append(f"🔍 Busca DOU: \"{query}\"")
@@ -254,13 +646,23 @@ def register_search_tools(mcp: FastMCP) -> None:
                 result.append(f"📋 Tipo: {publication_type}")
             if organ:
                 result.append(f"🏛️ Órgão: {organ}")
+            if stats.get('plan'):
+                result.append(f"🧭 Plano: {stats['plan']}")
+                for step in stats.get('plan_steps', []):
+                    result.append(f"  • {step}")
             result.append("")
             
             result.append(f"📊 Estatísticas:")
             result.append(f"  Arquivos pesquisados: {stats['files_searched']}")
+            if stats.get('files_indexed'):
+                result.append(f"  Arquivos indexados nesta busca: {stats['files_indexed']}")
             result.append(f"  Artigos analisados: {stats['articles_processed']}")
             result.append(f"  Resultados encontrados: {stats['matches_found']}")
+            if 'total_matches' in stats:
+                result.append(f"  Artigos que atendem à consulta: {stats['total_matches']}")
             result.append(f"  Tempo de busca: {stats['search_time_ms']:.2f}ms")
+            if stats.get('cache_hit'):
+                result.append("  Resultado reaproveitado do cache de buscas")
             result.append(f"  Tempo total: {execution_time:.2f}ms")
             result.append("")
             
@@ -272,12 +674,22 @@ def register_search_tools(mcp: FastMCP) -> None:
                 result.append("  - Tente termos de busca mais simples")
                 result.append("  - Remova filtros muito restritivos")
             else:
-                result.append(f"✅ Mostrando {min(len(articles), 10)} primeiros resultados:")
+                scores = stats.get('scores') or []
+                ordering = " (por relevância)" if scores else ""
+                result.append(f"✅ Mostrando {min(len(articles), 10)} primeiros resultados{ordering}:")
                 result.append("")
                 
+                # Trechos destacados: os mesmos que a busca procurou
+                terms = (
+                    [fold_text(query)] if is_simple_query(query)
+                    else highlight_terms(parse_query(query))
+                )
+                
                 # Mostra os primeiros resultados
                 for i, article in enumerate(articles[:10]):
                     result.append(f"📄 Resultado {i+1}:")
+                    if i < len(scores):
+                        result.append(f"  Relevância: {scores[i]:.2f}")
                     result.append(f"  ID: {article.metadata.id}")
                     result.append(f"  Tipo: {article.metadata.art_type or 'Não informado'}")
                     result.append(f"  Data: {article.metadata.pub_date}")
@@ -289,18 +701,10 @@ def register_search_tools(mcp: FastMCP) -> None:
                     if article.content.ementa:
                         result.append(f"  Ementa: {article.content.ementa[:200]}...")
                     
-                    # Destaca termo buscado no texto
-                    if article.content.texto and query:
-                        texto = article.content.texto
-                        query_pos = texto.lower().find(query.lower())
-                        if query_pos >= 0:
-                            start = max(0, query_pos - 100)
-                            end = min(len(texto), query_pos + len(query) + 100)
-                            excerpt = texto[start:end]
-                            if start > 0:
-                                excerpt = "..." + excerpt
-                            if end < len(texto):
-                                excerpt = excerpt + "..."
+                    # Destaca o termo buscado no texto
+                    if article.content.texto and terms:
+                        excerpt = build_excerpt(article.content.texto, terms)
+                        if excerpt:
                             result.append(f"  Trecho: {excerpt}")
                     
                     result.append("")
@@ -315,6 +719,7 @@ def register_search_tools(mcp: FastMCP) -> None:
             return f"❌ Erro ao executar busca: {str(e)}"
     
     @mcp.tool()
+    @instrument()
     async def list_publications(
         date_str: str,
         publication_type: str = "",
@@ -333,20 +738,18 @@ def register_search_tools(mcp: FastMCP) -> None:
         start_time = time.time()
         
         try:
-            # Usa a busca sem query para listar tudo
+            # Contagens completas vêm do catálogo de metadados, sem limite
             sections_list = [s.strip() for s in sections.split()] if sections else None
             publication_type_param = publication_type if publication_type else None
             organ_param = organ if organ else None
             
-            articles, stats = await search_engine.search_content(
-                query="",  # Sem filtro de texto
-                start_date=date_str,
-                end_date=date_str,
+            counts, articles, stats = await search_engine.summarize_publications(
+                date_str=date_str,
                 sections=sections_list,
                 publication_type=publication_type_param,
-                organ=organ_param,
-                max_results=200
+                organ=organ_param
             )
+            total = counts['total']
             
             execution_time = (time.time() - start_time) * 1000
             
@@ -354,15 +757,15 @@ def register_search_tools(mcp: FastMCP) -> None:
             by_type = {}
             by_organ = {}
             
-            for article in articles:
-                # Por tipo
-                tipo = article.metadata.art_type or "Não informado"
-                by_type[tipo] = by_type.get(tipo, 0) + 1
-                
+            for tipo, count in counts['by_type'].items():
+                tipo = tipo or "Não informado"
+                by_type[tipo] = by_type.get(tipo, 0) + count
+            
+            for categoria, count in counts['by_category'].items():
                 # Por órgão (primeiro nível da categoria)
-                categoria = article.metadata.art_category or "Não informado"
+                categoria = categoria or "Não informado"
                 orgao = categoria.split('/')[0] if '/' in categoria else categoria
-                by_organ[orgao] = by_organ.get(orgao, 0) + 1
+                by_organ[orgao] = by_organ.get(orgao, 0) + count
             
             # Formata resultado
             result = []
@@ -375,12 +778,12 @@ def register_search_tools(mcp: FastMCP) -> None:
             result.append("")
             
             result.append(f"📊 Resumo:")
-            result.append(f"  Total de publicações: {len(articles)}")
+            result.append(f"  Total de publicações: {total}")
             result.append(f"  Arquivos analisados: {stats['files_searched']}")
             result.append(f"  Tempo de processamento: {execution_time:.2f}ms")
             result.append("")
             
-            if not articles:
+            if not total:
                 result.append("❌ Nenhuma publicação encontrada para esta data.")
             else:
                 # Distribuição por tipo
@@ -404,11 +807,39 @@ def register_search_tools(mcp: FastMCP) -> None:
                         result.append(f"     {article.content.ementa[:100]}...")
                     result.append("")
                 
-                if len(articles) > 5:
-                    result.append(f"... e mais {len(articles) - 5} publicações.")
+                if total > len(articles):
+                    result.append(f"... e mais {total - len(articles)} publicações.")
             
             return "\n".join(result)
             
         except Exception as e:
             logger.error(f"Erro na listagem: {e}")
-            return f"❌ Erro ao listar publicações: {str(e)}"
\ No newline at end of file
+            return f"❌ Erro ao listar publicações: {str(e)}"
+    
+    @mcp.tool()
+    @instrument()
+    async def rebuild_search_index() -> str:
+        """
+        Reconstrói o índice de busca a partir dos arquivos ZIP em cache.
+        
+        Útil após copiar arquivos manualmente para o diretório de cache
+        ou se o índice estiver inconsistente.
+        """
+        start_time = time.time()
+        
+        try:
+            # Registra no manifesto os arquivos copiados para o cache
+            await asyncio.to_thread(get_cache_manager().reconcile)
+            totals = await search_engine.index.rebuild()
+            execution_time = (time.time() - start_time) * 1000
+            
+            return (
+                f"🗂️ Índice de busca reconstruído\n\n"
+                f"📁 Arquivos indexados: {totals['segments']}\n"
+                f"📄 Artigos indexados: {totals['documents']}\n"
+                f"⏱️ Tempo de execução: {execution_time:.2f}ms"
+            )
+            
+        except Exception as e:
+            logger.error(f"Erro ao reconstruir índice: {e}")
+            return f"❌ Erro ao reconstruir índice: {str(e)}"
\ No newline at end of file
@@ -0,0 +1,182 @@
+"""
+Utilitários de texto para o conteúdo dos artigos do DOU.
+
+Inclui a conversão do HTML do elemento Texto em texto puro. O caminho
+rápido remove as tags com expressões regulares e produz o mesmo resultado
+de BeautifulSoup.get_text(separator=' ', strip=True); construções que ele
+não trata com segurança (comentários, script/style, entidades
+desconhecidas etc.) são delegadas ao BeautifulSoup, importado apenas quando necessário.
+
+Inclui também a normalização ("folding") usada na busca: minúsculas, sem
+acentos e com espaços normalizados, para que "licitacao" encontre
+"licitação".
+"""
+
+import html
+import re
+import unicodedata
+from html.entities import html5 as HTML5_ENTITIES
+from typing import Iterable, List, Optional, Tuple
+
+
+# Tags de abertura (aspas podem conter '>') e de fechamento
+_TAG_RE = re.compile(
+    r"<(?:[a-zA-Z][^<>\"']*(?:(?:\"[^\"<]*\"|'[^'<]*')[^<>\"']*)*|/[a-zA-Z][^<>]*)>"
+)
+
+# Construções que exigem o parser completo: '<' que não inicia uma tag
+# comum (comentários, CDATA, doctype, texto literal) e elementos cujo
+# conteúdo não é texto
+_UNSAFE_RE = re.compile(
+    r"<(?![a-zA-Z/])|</(?![a-zA-Z])|<(?:script|style|textarea|title|xmp|iframe|noscript|noembed|noframes|plaintext)\b",
+    re.IGNORECASE
+)
+
+# Referências nomeadas, com ou sem ';' final
+_ENTITY_RE = re.compile(r"&([a-zA-Z][a-zA-Z0-9]*)(;?)")
+
+# Sinais diacríticos separados pela decomposição NFD
+_COMBINING_RE = re.compile(r"[\u0300-\u036f]+")
+
+
+def html_to_text_reference(html_text: str) -> str:
+    """
+    Converte HTML em texto usando BeautifulSoup (implementação de referência).
+    
+    Args:
+        html_text: Fragmento HTML
+    
+    Returns:
+        str: Textos do documento, sem espaços nas pontas, separados por espaço
+    """
+    from bs4 import BeautifulSoup
+    
+    soup = BeautifulSoup(html_text, 'html.parser')
+    return soup.get_text(separator=' ', strip=True)
+
+
+def _is_fast_path_safe(html_text: str) -> bool:
+    """Indica se o HTML pode ser convertido pelo caminho rápido."""
+    
+    if _UNSAFE_RE.search(html_text):
+        return False
+    
+    # O BeautifulSoup trata entidades desconhecidas ou sem ';' de forma própria
+    if "&" in html_text:
+        for match in _ENTITY_RE.finditer(html_text):
+            if not match.group(2) or match.group(1) + ";" not in HTML5_ENTITIES:
+                return False
+    
+    return True
+
+
+def html_to_text(html_text: str) -> str:
+    """
+    Converte o HTML do Texto de um artigo em texto puro.
+    
+    Equivalente a html_to_text_reference, mas sem construir a árvore do
+    documento na grande maioria dos casos.
+    
+    Args:
+        html_text: Fragmento HTML
+    
+    Returns:
+        str: Textos do documento, sem espaços nas pontas, separados por espaço
+    """
+    if not _is_fast_path_safe(html_text):
+        return html_to_text_reference(html_text)
+    
+    parts = []
+    for piece in _TAG_RE.split(html_text):
+        if "<" in piece:
+            # Tag malformada que a expressão não reconheceu
+            return html_to_text_reference(html_text)
+        if "&" in piece:
+            piece = html.unescape(piece)
+        piece = piece.strip()
+        if piece:
+            parts.append(piece)
+    
+    return " ".join(parts)
+
+
+def fold_text(text: Optional[str]) -> str:
+    """
+    Normaliza um texto para comparação na busca.
+    
+    Converte para minúsculas, remove acentos (ç → c, ã → a) e reduz
+    sequências de espaços a um único espaço.
+    
+    Args:
+        text: Texto de entrada
+    
+    Returns:
+        str: Texto normalizado
+    """
+    if not text:
+        return ""
+    
+    folded = text.lower()
+    if not folded.isascii():
+        folded = _COMBINING_RE.sub("", unicodedata.normalize("NFD", folded))
+        folded = unicodedata.normalize("NFC", folded)
+    
+    return " ".join(folded.split())
+
+
+def fold_text_with_offsets(text: Optional[str]) -> Tuple[str, List[int]]:
+    """
+    Normaliza um texto como fold_text, guardando a origem de cada caractere.
+    
+    Permite localizar no texto original um trecho encontrado no texto
+    normalizado, por exemplo para exibir o trecho de um resultado de busca.
+    
+    Args:
+        text: Texto de entrada
+    
+    Returns:
+        Tuple[str, List[int]]: Texto normalizado (igual a fold_text(text)) e,
+        para cada caractere dele, a posição correspondente em text
+    """
+    if not text:
+        return "", []
+    
+    chars: List[str] = []
+    offsets: List[int] = []
+    pending_space = False
+    
+    for position, char in enumerate(text):
+        if char.isspace():
+            pending_space = bool(chars)
+            continue
+        
+        folded = char.lower()
+        if not folded.isascii():
+            folded = _COMBINING_RE.sub("", unicodedata.normalize("NFD", folded))
+            folded = unicodedata.normalize("NFC", folded)
+            # Acentos combinantes isolados desaparecem
+            if not folded:
+                continue
+        
+        if pending_space:
+            chars.append(" ")
+            offsets.append(position)
+            pending_space = False
+        
+        chars.extend(folded)
+        offsets.extend([position] * len(folded))
+    
+    return "".join(chars), offsets
+
+
+def fold_fields(values: Iterable[Optional[str]]) -> str:
+    """
+    Monta o texto de busca normalizado de um conjunto de campos.
+    
+    Args:
+        values: Valores dos campos (vazios são ignorados)
+    
+    Returns:
+        str: Campos normalizados, separados por espaço
+    """
+    return fold_text(" ".join(value for value in values if value))
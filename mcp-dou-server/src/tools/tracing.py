@@ -0,0 +1,371 @@
+"""
+Rastreamento (tracing) das etapas de download, parsing e busca.
+
+Spans são abertos com `with span("nome", atributo=valor):` e encadeados
+pelo contextvar do span corrente, que o asyncio propaga para tarefas e para
+asyncio.to_thread. Etapas executadas milhares de vezes numa operação (as
+de cada artigo, como lxml, extração do conteúdo e construção dos modelos)
+usam `stage("nome")`, que só acumula contagem e tempo no span corrente em
+vez de criar um span por chamada.
+
+Desativado (padrão), span() e stage() retornam um objeto nulo
+compartilhado. Com DOU_TRACE_ENABLED, cada árvore é gravada quando o span
+raiz termina, em JSON lines (uma árvore por linha) ou no formato Chrome
+trace (abrir em chrome://tracing ou ui.perfetto.dev), no diretório de logs.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, IO, List, Optional
+
+from ..config.settings import get_config
+
+
+logger = logging.getLogger(__name__)
+
+# Spans por árvore; os excedentes são apenas contados no span raiz
+MAX_SPANS_PER_TRACE = 5000
+
+# Formatos de exportação suportados
+TRACE_FORMATS = ("jsonl", "chrome")
+
+# Converte perf_counter_ns em horário de parede
+_EPOCH_OFFSET_NS = time.time_ns() - time.perf_counter_ns()
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("dou_current_span", default=None)
+
+
+class _NullSpan:
+    """Span sem efeito, usado quando o tracing está desativado."""
+    
+    __slots__ = ()
+    
+    def __enter__(self) -> "_NullSpan":
+        return self
+    
+    def __exit__(self, *exc_info) -> bool:
+        return False
+    
+    def set(self, **attributes: Any) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Trace:
+    """Estado compartilhado pelos spans de uma mesma árvore."""
+    
+    __slots__ = ("trace_id", "spans", "dropped", "lock")
+    
+    def __init__(self):
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.spans = 1
+        self.dropped = 0
+        self.lock = threading.Lock()
+
+
+class Span:
+    """Etapa medida, com atributos, etapas agregadas e spans filhos."""
+    
+    __slots__ = (
+        "name", "attributes", "parent", "trace", "children", "stages",
+        "start_ns", "end_ns", "thread_id", "error", "_token"
+    )
+    
+    def __init__(self, name: str, attributes: Dict[str, Any], parent: Optional["Span"]):
+        self.name = name
+        self.attributes = attributes
+        self.parent = parent
+        self.trace = parent.trace if parent is not None else _Trace()
+        self.children: List[Span] = []
+        self.stages: Dict[str, List[int]] = {}
+        self.start_ns = 0
+        self.end_ns = 0
+        self.thread_id = 0
+        self.error: Optional[str] = None
+        self._token = None
+    
+    def set(self, **attributes: Any) -> None:
+        """Adiciona atributos ao span."""
+        
+        self.attributes.update(attributes)
+    
+    def add_stage(self, name: str, duration_ns: int) -> None:
+        """Acumula uma execução da etapa name."""
+        
+        with self.trace.lock:
+            totals = self.stages.get(name)
+            if totals is None:
+                self.stages[name] = [1, duration_ns]
+            else:
+                totals[0] += 1
+                totals[1] += duration_ns
+    
+    def __enter__(self) -> "Span":
+        self.thread_id = threading.get_ident()
+        self._token = _current_span.set(self)
+        self.start_ns = time.perf_counter_ns()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.end_ns = time.perf_counter_ns()
+        _current_span.reset(self._token)
+        
+        if exc_type is not None:
+            self.error = f"{exc_type.__name__}: {exc}"
+        
+        if self.parent is None:
+            get_tracer().export(self)
+        else:
+            self.parent.children.append(self)
+        
+        return False
+    
+    @property
+    def duration_ms(self) -> float:
+        """Duração do span em milissegundos."""
+        
+        return (self.end_ns - self.start_ns) / 1e6
+    
+    def _stages_summary(self) -> Dict[str, Dict[str, float]]:
+        """Etapas agregadas (contagem e tempo total em ms)."""
+        
+        return {
+            name: {"count": count, "total_ms": round(total_ns / 1e6, 3)}
+            for name, (count, total_ns) in sorted(self.stages.items(), key=lambda item: -item[1][1])
+        }
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Converte o span e seus filhos numa árvore serializável.
+        
+        Returns:
+            Dict[str, Any]: Árvore de spans
+        """
+        data: Dict[str, Any] = {
+            "name": self.name,
+            "start": datetime.fromtimestamp((self.start_ns + _EPOCH_OFFSET_NS) / 1e9).isoformat(),
+            "duration_ms": round(self.duration_ms, 3),
+            "thread": self.thread_id,
+        }
+        if self.attributes:
+            data["attributes"] = self.attributes
+        if self.stages:
+            data["stages"] = self._stages_summary()
+        if self.error:
+            data["error"] = self.error
+        if self.children:
+            data["children"] = [
+                child.to_dict() for child in sorted(self.children, key=lambda s: s.start_ns)
+            ]
+        return data
+    
+    def to_chrome_events(self, pid: int) -> List[Dict[str, Any]]:
+        """
+        Converte o span e seus filhos em eventos "X" do formato Chrome trace.
+        
+        Args:
+            pid: Identificador do processo
+        
+        Returns:
+            List[Dict[str, Any]]: Eventos, um por span
+        """
+        args: Dict[str, Any] = dict(self.attributes)
+        for name, summary in self._stages_summary().items():
+            args[f"stage:{name}"] = f"{summary['count']}x {summary['total_ms']:.3f} ms"
+        if self.error:
+            args["error"] = self.error
+        
+        events = [{
+            "name": self.name,
+            "cat": "dou",
+            "ph": "X",
+            "ts": (self.start_ns + _EPOCH_OFFSET_NS) / 1000,
+            "dur": (self.end_ns - self.start_ns) / 1000,
+            "pid": pid,
+            "tid": self.thread_id,
+            "args": args,
+        }]
+        for child in self.children:
+            events.extend(child.to_chrome_events(pid))
+        return events
+
+
+class _Stage:
+    """Medição de uma etapa agregada no span corrente."""
+    
+    __slots__ = ("span", "name", "start_ns")
+    
+    def __init__(self, span: Span, name: str):
+        self.span = span
+        self.name = name
+        self.start_ns = 0
+    
+    def __enter__(self) -> "_Stage":
+        self.start_ns = time.perf_counter_ns()
+        return self
+    
+    def __exit__(self, *exc_info) -> bool:
+        self.span.add_stage(self.name, time.perf_counter_ns() - self.start_ns)
+        return False
+
+
+class DOUTracer:
+    """Configuração do tracing e exportação das árvores de spans."""
+    
+    def __init__(self):
+        config = get_config()
+        self.enabled = config.trace_enabled
+        self.format = config.trace_format.lower()
+        self.min_duration_ms = config.trace_min_duration_ms
+        
+        if self.format not in TRACE_FORMATS:
+            logger.warning(f"Formato de trace desconhecido '{config.trace_format}', usando jsonl")
+            self.format = "jsonl"
+        
+        if config.trace_dir:
+            self.directory = Path(config.trace_dir)
+        elif config.log_file:
+            self.directory = Path(config.log_file).parent
+        else:
+            self.directory = Path("logs")
+        
+        self.path: Optional[Path] = None
+        self.exported = 0
+        self._file: Optional[IO[str]] = None
+        self._lock = threading.Lock()
+    
+    def _open(self) -> IO[str]:
+        """Abre o arquivo de trace deste processo na primeira exportação."""
+        
+        self.directory.mkdir(parents=True, exist_ok=True)
+        suffix = "jsonl" if self.format == "jsonl" else "json"
+        self.path = self.directory / f"dou-trace-{datetime.now():%Y%m%d-%H%M%S}-{os.getpid()}.{suffix}"
+        trace_file = open(self.path, "a", encoding="utf-8")
+        
+        # O formato Chrome aceita o array JSON sem o "]" final
+        if self.format == "chrome":
+            trace_file.write("[\n")
+        
+        logger.info(f"Gravando traces em {self.path}")
+        return trace_file
+    
+    def export(self, root: Span) -> None:
+        """
+        Grava a árvore de um span raiz encerrado.
+        
+        Args:
+            root: Span raiz
+        """
+        if root.duration_ms < self.min_duration_ms:
+            return
+        
+        try:
+            if self.format == "jsonl":
+                tree = root.to_dict()
+                tree["trace_id"] = root.trace.trace_id
+                tree["spans"] = root.trace.spans
+                if root.trace.dropped:
+                    tree["dropped_spans"] = root.trace.dropped
+                payload = json.dumps(tree, ensure_ascii=False, default=str) + "\n"
+            else:
+                events = root.to_chrome_events(os.getpid())
+                events[0]["args"]["trace_id"] = root.trace.trace_id
+                payload = "".join(
+                    json.dumps(event, ensure_ascii=False, default=str) + ",\n" for event in events
+                )
+            
+            with self._lock:
+                if self._file is None:
+                    self._file = self._open()
+                self._file.write(payload)
+                self._file.flush()
+                self.exported += 1
+        
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Falha ao exportar trace de '{root.name}': {e}")
+    
+    def close(self) -> None:
+        """Fecha o arquivo de trace, se aberto."""
+        
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def span(name: str, **attributes: Any):
+    """
+    Abre um span filho do span corrente (ou a raiz de uma nova árvore).
+    
+    Args:
+        name: Nome da etapa
+        **attributes: Atributos registrados no span
+    
+    Returns:
+        Gerenciador de contexto do span (nulo se o tracing estiver desativado)
+    """
+    tracer = _tracer_instance or get_tracer()
+    if not tracer.enabled:
+        return _NULL_SPAN
+    
+    parent = _current_span.get()
+    if parent is not None:
+        trace = parent.trace
+        with trace.lock:
+            if trace.spans >= MAX_SPANS_PER_TRACE:
+                trace.dropped += 1
+                return _NULL_SPAN
+            trace.spans += 1
+    
+    return Span(name, attributes, parent)
+
+
+def stage(name: str):
+    """
+    Mede uma etapa repetitiva, acumulando o tempo no span corrente.
+    
+    Args:
+        name: Nome da etapa
+    
+    Returns:
+        Gerenciador de contexto (nulo fora de um span ou com o tracing desativado)
+    """
+    parent = _current_span.get()
+    if parent is None:
+        return _NULL_SPAN
+    return _Stage(parent, name)
+
+
+# Instância global do tracer
+_tracer_instance: Optional[DOUTracer] = None
+
+
+def get_tracer() -> DOUTracer:
+    """
+    Obtém a instância global do tracer.
+    
+    Returns:
+        DOUTracer: Tracer configurado
+    """
+    global _tracer_instance
+    
+    if _tracer_instance is None:
+        _tracer_instance = DOUTracer()
+    
+    return _tracer_instance
+
+
+def shutdown_tracer() -> None:
+    """Fecha o arquivo de trace do tracer global, se criado."""
+    
+    if _tracer_instance is not None:
+        _tracer_instance.close()
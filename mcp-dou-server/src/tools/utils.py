@@ -5,14 +5,20 @@ Este módulo implementa ferramentas auxiliares como configuração,
 estatísticas e informações sobre o sistema DOU.
 """
 
+import asyncio
 import logging
 import time
-from datetime import date
+from datetime import date, datetime
 from mcp.server.fastmcp import FastMCP
 
 from ..auth.inlabs_auth import get_auth_instance
 from ..config.settings import get_config
 from ..models.dou_models import DOUCredentials, DOUSection
+from .cache_manager import get_cache_manager
+from .http_client import get_http_client
+from .index import get_search_index
+from .metrics import get_metrics as get_metrics_registry, instrument
+from .search import get_search_result_cache
 
 
 logger = logging.getLogger(__name__)
@@ -22,6 +28,7 @@ def register_utility_tools(mcp: FastMCP) -> None:
     """Registra as ferramentas utilitárias no servidor MCP."""
     
     @mcp.tool()
+    @instrument()
     async def configure_credentials(email: str, password: str) -> str:
         """
         Configura credenciais para acesso ao sistema INLABS.
@@ -48,6 +55,7 @@ def register_utility_tools(mcp: FastMCP) -> None:
             return f"❌ Erro ao configurar credenciais: {str(e)}"
     
     @mcp.tool()
+    @instrument()
     async def test_connection() -> str:
         """
         Testa a conexão com o sistema INLABS usando as credenciais configuradas.
@@ -79,6 +87,7 @@ def register_utility_tools(mcp: FastMCP) -> None:
             return f"❌ Erro no teste de conexão: {str(e)}"
     
     @mcp.tool()
+    @instrument()
     async def list_available_sections() -> str:
         """
         Lista todas as seções disponíveis do DOU com descrições.
@@ -109,22 +118,29 @@ def register_utility_tools(mcp: FastMCP) -> None:
         return result
     
     @mcp.tool()
+    @instrument()
     async def get_server_info() -> str:
         """
         Obtém informações sobre o servidor MCP DOU.
         """
         config = get_config()
+        http_stats = get_http_client().get_stats()
         
         return (
             f"🖥️ **Servidor MCP DOU - Informações**\n\n"
             f"📛 Nome: {config.server_name}\n"
             f"🔢 Versão: {config.server_version}\n"
             f"📁 Diretório de cache: {config.cache_dir}\n"
-            f"💾 Tamanho máximo do cache: {config.max_cache_size} arquivos\n"
+            f"💾 Tamanho máximo do cache: {config.max_cache_size} arquivos"
+            f"{f' / {config.max_cache_mb} MB' if config.max_cache_mb else ''}\n"
             f"⏰ TTL do cache: {config.cache_ttl_hours} horas\n"
             f"🔄 Tentativas de retry: {config.retry_attempts}\n"
             f"⏱️ Timeout de download: {config.download_timeout}s\n"
             f"🎯 Downloads simultâneos: {config.max_concurrent_downloads}\n\n"
+            f"🌐 **Conexões HTTP (INLABS):**\n"
+            f"• Requisições: {http_stats['requests']}\n"
+            f"• Conexões abertas: {http_stats['connections_opened']}\n"
+            f"• Conexões reaproveitadas: {http_stats['connections_reused']}\n\n"
             f"📊 **Status:**\n"
             f"• Data atual: {date.today()}\n"
             f"• Servidor ativo: ✅\n"
@@ -132,26 +148,152 @@ def register_utility_tools(mcp: FastMCP) -> None:
         )
     
     @mcp.tool()
+    @instrument()
     async def get_dou_statistics() -> str:
         """
         Obtém estatísticas sobre o cache local e uso do sistema.
         """
-        # TODO: Implementar estatísticas reais do cache
-        config = get_config()
+        try:
+            config = get_config()
+            summary = await asyncio.to_thread(get_cache_manager().get_summary)
+            index_stats = await asyncio.to_thread(get_search_index().get_stats)
+            result_cache_stats = get_search_result_cache().get_stats()
+            
+            def mb(size: int) -> str:
+                return f"{(size or 0) / 1024 / 1024:.1f} MB"
+            
+            result = []
+            result.append("📈 **Estatísticas do Sistema DOU**")
+            result.append("")
+            result.append(f"📁 Diretório de cache: {config.cache_dir}")
+            result.append(f"📄 Total de arquivos em cache: {summary['files']}")
+            result.append(f"💾 Espaço dos arquivos XML/PDF: {mb(summary['bytes'])}")
+            result.append(f"🧾 Artigos processados (sidecars): {mb(summary['sidecar_bytes'])}")
+            result.append(f"🗂️ Manifesto e índice de busca (.state): {mb(summary['state_bytes'])}")
+            if summary['first_date']:
+                result.append(f"📅 Período coberto: {summary['first_date']} até {summary['last_date']}")
+            result.append(f"⬇️ Downloads nas últimas 24h: {summary['recent_downloads']}")
+            result.append(f"👁️ Acessos registrados: {summary['accesses']}")
+            result.append("")
+            
+            result.append("📦 Por formato:")
+            for file_format, (count, size) in summary['by_format'].items():
+                result.append(f"  {file_format.upper()}: {count} arquivos ({mb(size)})")
+            result.append("")
+            
+            result.append("📑 Por seção:")
+            for section, (count, size) in summary['by_section'].items():
+                result.append(f"  {section}: {count} arquivos ({mb(size)})")
+            result.append("")
+            
+            result.append("🔥 Arquivos mais acessados:")
+            if summary['hot_files']:
+                for item in summary['hot_files']:
+                    last_access = datetime.fromtimestamp(item['last_access'])
+                    result.append(
+                        f"  {item['name']}: {item['access_count']} acessos "
+                        f"(último em {last_access:%Y-%m-%d %H:%M})"
+                    )
+            else:
+                result.append("  Nenhum acesso registrado")
+            result.append("")
+            
+            result.append("🗂️ Índice de busca:")
+            result.append(f"  Arquivos indexados: {index_stats['segments']}")
+            result.append(f"  Artigos indexados: {index_stats['documents']}")
+            result.append("")
+            
+            lookups = result_cache_stats['hits'] + result_cache_stats['misses']
+            hit_rate = result_cache_stats['hits'] / lookups * 100 if lookups else 0.0
+            result.append("⚡ Cache de resultados de busca:")
+            result.append(
+                f"  Entradas: {result_cache_stats['entries']}/{result_cache_stats['max_entries']}"
+            )
+            result.append(
+                f"  Acertos: {result_cache_stats['hits']} | Falhas: {result_cache_stats['misses']} "
+                f"({hit_rate:.1f}% de acerto)"
+            )
+            
+            return "\n".join(result)
+            
+        except Exception as e:
+            logger.error(f"Erro ao obter estatísticas: {e}")
+            return f"❌ Erro ao obter estatísticas: {str(e)}"
+    
+    @mcp.tool()
+    @instrument()
+    async def get_metrics(format: str = "text") -> str:
+        """
+        Obtém métricas de desempenho: latência por ferramenta, volume de
+        downloads e de parsing e acertos dos caches.
         
-        return (
-            f"📈 **Estatísticas do Sistema DOU**\n\n"
-            f"📁 Diretório de cache: {config.cache_dir}\n"
-            f"📊 Funcionalidade em desenvolvimento...\n\n"
-            f"🔄 Em breve:\n"
-            f"• Total de arquivos em cache\n"
-            f"• Espaço utilizado em disco\n"
-            f"• Arquivos mais acessados\n"
-            f"• Estatísticas por seção\n"
-            f"• Histórico de downloads"
-        )
+        Args:
+            format: "text" (resumo) ou "prometheus" (formato texto do Prometheus)
+        """
+        try:
+            metrics = get_metrics_registry()
+            
+            if format.lower() == "prometheus":
+                return await asyncio.to_thread(metrics.render_prometheus)
+            
+            config = get_config()
+            tools = metrics.get_tool_stats()
+            counters = metrics.get_counters()
+            caches = await asyncio.to_thread(metrics.get_cache_stats)
+            
+            result = []
+            result.append("📊 **Métricas do Servidor DOU**")
+            result.append("")
+            result.append(f"⏱️ Em execução há: {metrics.get_uptime() / 60:.1f} min")
+            result.append("")
+            
+            result.append("🔧 Ferramentas (chamadas | erros | p50 / p95 / p99):")
+            if tools:
+                for name, stats in tools.items():
+                    result.append(
+                        f"  {name}: {stats['calls']} | {stats['errors']} | "
+                        f"{stats['p50_ms']:.1f} / {stats['p95_ms']:.1f} / {stats['p99_ms']:.1f} ms"
+                    )
+            else:
+                result.append("  Nenhuma chamada registrada")
+            result.append("")
+            
+            parse_seconds = counters['parse_seconds']
+            articles_rate = counters['articles_parsed'] / parse_seconds if parse_seconds else 0.0
+            result.append("📦 Trabalho realizado:")
+            result.append(
+                f"  Downloads: {counters['files_downloaded']:.0f} arquivos, "
+                f"{counters['bytes_downloaded'] / 1024 / 1024:.1f} MB "
+                f"({counters['files_not_modified']:.0f} revalidados sem mudança)"
+            )
+            result.append(
+                f"  Parsing: {counters['files_parsed']:.0f} arquivos, "
+                f"{counters['articles_parsed']:.0f} artigos ({articles_rate:,.0f} artigos/s)"
+            )
+            result.append("")
+            
+            result.append("💾 Caches (acertos | falhas):")
+            for name, stats in caches.items():
+                lookups = stats['hits'] + stats['misses']
+                hit_rate = stats['hits'] / lookups * 100 if lookups else 0.0
+                result.append(f"  {name}: {stats['hits']} | {stats['misses']} ({hit_rate:.1f}% de acerto)")
+            
+            if config.metrics_file or config.metrics_port:
+                result.append("")
+                result.append("📤 Exportação Prometheus:")
+                if config.metrics_file:
+                    result.append(f"  Arquivo: {config.metrics_file} (a cada {config.metrics_interval}s)")
+                if config.metrics_port:
+                    result.append(f"  Endpoint: http://{config.metrics_host}:{config.metrics_port}/metrics")
+            
+            return "\n".join(result)
+            
+        except Exception as e:
+            logger.error(f"Erro ao obter métricas: {e}")
+            return f"❌ Erro ao obter métricas: {str(e)}"
     
     @mcp.tool()
+    @instrument()
     async def validate_date_range(start_date: str, end_date: str) -> str:
         """
         Valida um intervalo de datas para consultas DOU.
@@ -0,0 +1,57 @@
+"""
+Fixtures compartilhadas dos testes.
+
+`dou_cache` aponta a configuração para um cache temporário e recria as
+instâncias globais que dependem dela (gerenciador de cache, índice de
+busca, cache de resultados, disponibilidade e backfill).
+"""
+
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from benchmarks.synthetic import generate_edition
+from src.config import settings
+from src.tools import availability, backfill, cache_manager, index, search
+
+
+@pytest.fixture
+def dou_cache(tmp_path, monkeypatch) -> Path:
+    """Diretório de cache vazio, usado por uma configuração nova."""
+    
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setenv("DOU_CACHE_DIR", str(cache_dir))
+    monkeypatch.setenv("LOG_FILE", str(tmp_path / "logs" / "dou.log"))
+    # Edições pequenas: o parsing fica no próprio processo
+    monkeypatch.setenv("DOU_PARSE_PARALLEL_MIN_MEMBERS", "1000000")
+    
+    for module, name in (
+        (settings, "_config_instance"),
+        (cache_manager, "_cache_manager_instance"),
+        (index, "_index_instance"),
+        (search, "_result_cache_instance"),
+        (availability, "_availability_instance"),
+        (backfill, "_scheduler_instance"),
+    ):
+        monkeypatch.setattr(module, name, None)
+    
+    settings.get_config()
+    return cache_dir
+
+
+@pytest.fixture
+def add_edition(dou_cache):
+    """Gera uma edição sintética em cache/AAAA/MM."""
+    
+    def add(pub_date: date, section: str = "DO3", articles: int = 20, **kwargs) -> Path:
+        zip_path = (
+            dou_cache / f"{pub_date:%Y}" / f"{pub_date:%m}" / f"{pub_date.isoformat()}-{section}.zip"
+        )
+        zip_path.parent.mkdir(parents=True, exist_ok=True)
+        return generate_edition(
+            zip_path, articles=articles, section=section, pub_date=pub_date,
+            seed=pub_date.toordinal(), **kwargs
+        )
+    
+    return add
@@ -0,0 +1,70 @@
+"""
+Cache de disponibilidade: 404 de datas passadas valem por muito mais tempo
+que os demais resultados, e respostas inconclusivas não são guardadas.
+"""
+
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from src.models.dou_models import DOUAvailability, DOUSection, FileFormat
+from src.tools.availability import DOUAvailabilityCache
+
+PAST = date(2024, 9, 16)
+
+
+@pytest.fixture
+def availability(dou_cache) -> DOUAvailabilityCache:
+    cache = DOUAvailabilityCache()
+    cache.config.availability_ttl = 60
+    cache.config.availability_negative_ttl = 86400
+    return cache
+
+
+def test_ttl_for(availability):
+    today = date.today()
+    
+    assert availability.ttl_for(PAST, available=False) == 86400
+    # Uma edição extra de hoje ainda pode aparecer
+    assert availability.ttl_for(today, available=False) == 60
+    assert availability.ttl_for(PAST, available=True) == 60
+
+
+def test_only_confirmed_404_is_known_missing(availability):
+    availability.record(PAST, DOUSection.DO1, FileFormat.XML, available=False)
+    availability.record(PAST, DOUSection.DO2, FileFormat.XML, available=True)
+    
+    assert availability.is_known_missing(PAST, DOUSection.DO1, FileFormat.XML)
+    assert not availability.is_known_missing(PAST, DOUSection.DO2, FileFormat.XML)
+    assert not availability.is_known_missing(PAST, DOUSection.DO3, FileFormat.XML)
+    assert not availability.is_known_missing(PAST, DOUSection.DO1, FileFormat.PDF)
+
+
+def test_inconclusive_results_are_not_cached(availability):
+    result = availability.put(DOUAvailability(
+        date=PAST, section=DOUSection.DO1, file_format=FileFormat.XML, status_code=503
+    ))
+    
+    assert result.expires_at is None
+    assert availability.get(PAST, DOUSection.DO1, FileFormat.XML) is None
+
+
+def test_expired_entries_are_dropped(availability):
+    availability.put(DOUAvailability(
+        date=PAST, section=DOUSection.DO1, file_format=FileFormat.XML, available=False,
+        checked_at=datetime.now() - timedelta(days=2)
+    ))
+    
+    assert not availability.is_known_missing(PAST, DOUSection.DO1, FileFormat.XML)
+    assert availability.get_stats()["entries"] == 0
+
+
+def test_entries_survive_restart(availability):
+    availability.record(PAST, DOUSection.DO1, FileFormat.XML, available=False)
+    availability.save()
+    
+    reloaded = DOUAvailabilityCache()
+    
+    assert reloaded.is_known_missing(PAST, DOUSection.DO1, FileFormat.XML)
+    cached = reloaded.get(PAST, DOUSection.DO1, FileFormat.XML)
+    assert cached.from_cache and cached.status_code == 404
@@ -0,0 +1,105 @@
+"""
+Backfill: classificação dos resultados e retomada de jobs.
+
+Só um 404 confirmado marca uma edição como indisponível; falhas
+transitórias (5xx, 429, timeouts, rede) ficam em failed e são refeitas ao
+retomar o job.
+"""
+
+from datetime import date
+
+import pytest
+
+from src.models.dou_models import BackfillJobStatus, DOUFileInfo, DOUSection, FileFormat
+from src.tools import backfill
+from src.tools.availability import get_availability_cache
+
+
+class FakeAuth:
+    async def authenticate(self) -> bool:
+        return True
+
+
+@pytest.fixture
+def fake_inlabs(dou_cache, monkeypatch):
+    """Substitui os downloads por respostas controladas pelo teste."""
+    
+    outcomes = {}
+    calls = []
+    
+    async def fake_download(base_date, section, file_format, force_download=False):
+        key = f"{base_date.isoformat()}:{section.value}"
+        calls.append(key)
+        outcome = outcomes[key].pop(0) if len(outcomes[key]) > 1 else outcomes[key][0]
+        
+        file_path = None
+        if outcome == "ok":
+            file_path = str(dou_cache / f"{base_date.isoformat()}-{section.value}.zip")
+        elif outcome == "404":
+            get_availability_cache().record(base_date, section, file_format, available=False)
+        
+        return DOUFileInfo(
+            filename=f"{base_date.isoformat()}-{section.value}.zip",
+            date=base_date,
+            section=section,
+            file_format=file_format,
+            file_path=file_path
+        )
+    
+    monkeypatch.setattr(backfill, "download_dou_file", fake_download)
+    monkeypatch.setattr(backfill, "get_auth_instance", FakeAuth)
+    return outcomes, calls
+
+
+async def _run_job(scheduler, job):
+    await scheduler._tasks[job.job_id]
+    return scheduler.jobs[job.job_id]
+
+
+async def test_transient_failure_is_retried_on_resume(fake_inlabs):
+    outcomes, calls = fake_inlabs
+    # 2024-09-16 é segunda-feira
+    outcomes["2024-09-16:DO1"] = ["ok"]
+    outcomes["2024-09-16:DO2"] = ["erro", "ok"]
+    outcomes["2024-09-16:DO3"] = ["404"]
+    sections = [DOUSection.DO1, DOUSection.DO2, DOUSection.DO3]
+    scheduler = backfill.DOUBackfillScheduler()
+    
+    job = await _run_job(
+        scheduler, scheduler.create_job(date(2024, 9, 16), date(2024, 9, 16), sections, FileFormat.XML)
+    )
+    
+    assert job.status == BackfillJobStatus.COMPLETED
+    assert job.completed == ["2024-09-16:DO1"]
+    assert job.missing == ["2024-09-16:DO3"]
+    assert list(job.failed) == ["2024-09-16:DO2"]
+    
+    job = await _run_job(scheduler, scheduler.resume_job(job.job_id))
+    
+    assert job.failed == {}
+    assert sorted(job.completed) == ["2024-09-16:DO1", "2024-09-16:DO2"]
+    assert job.missing == ["2024-09-16:DO3"]
+    # Apenas o arquivo com falha é baixado de novo
+    assert calls.count("2024-09-16:DO2") == 2
+    assert calls.count("2024-09-16:DO1") == calls.count("2024-09-16:DO3") == 1
+
+
+async def test_resume_after_restart_keeps_progress(fake_inlabs):
+    outcomes, calls = fake_inlabs
+    outcomes["2024-09-16:DO1"] = ["erro", "ok"]
+    scheduler = backfill.DOUBackfillScheduler()
+    job = await _run_job(
+        scheduler,
+        scheduler.create_job(date(2024, 9, 14), date(2024, 9, 16), [DOUSection.DO1], FileFormat.XML)
+    )
+    
+    # Fim de semana fora do plano; o job persistido é recarregado por um novo processo
+    assert job.planned == ["2024-09-16:DO1"]
+    restarted = backfill.DOUBackfillScheduler()
+    reloaded = restarted.jobs[job.job_id]
+    assert list(reloaded.failed) == ["2024-09-16:DO1"]
+    
+    job = await _run_job(restarted, restarted.resume_job(job.job_id))
+    
+    assert job.completed == ["2024-09-16:DO1"]
+    assert job.failed == {} and job.missing == []
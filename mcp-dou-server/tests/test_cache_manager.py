@@ -0,0 +1,119 @@
+"""
+Manifesto do cache: localização de arquivos por data e seção e limites
+de ocupação.
+"""
+
+import time
+from datetime import date, timedelta
+
+import pytest
+
+from src.tools.cache_manager import DOUCacheManager, normalize_date
+from src.tools.index import get_search_index
+
+
+@pytest.mark.parametrize("value, expected", [
+    (None, None),
+    ("", None),
+    ("2024-09-16", "2024-09-16"),
+    ("2024-9-6", "2024-09-06"),
+    (" 2024-09-16 ", "2024-09-16"),
+])
+def test_normalize_date(value, expected):
+    assert normalize_date(value) == expected
+
+
+@pytest.mark.parametrize("value", ["16/09/2024", "2024-13-01", "ontem"])
+def test_normalize_date_rejects_invalid_dates(value):
+    with pytest.raises(ValueError, match="AAAA-MM-DD"):
+        normalize_date(value)
+
+
+def test_find_files_accepts_non_padded_dates(add_edition):
+    add_edition(date(2024, 9, 6))
+    add_edition(date(2024, 9, 16))
+    add_edition(date(2024, 9, 16), section="DO1")
+    manager = DOUCacheManager()
+    
+    found = manager.find_files("2024-9-16", "2024-9-16")
+    
+    assert [path.name for path in found] == ["2024-09-16-DO1.zip", "2024-09-16-DO3.zip"]
+    assert [path.name for path in manager.find_files("2024-9-1", "2024-9-9", ["DO3"])] == [
+        "2024-09-06-DO3.zip"
+    ]
+
+
+def test_find_files_rejects_invalid_dates(add_edition):
+    add_edition(date(2024, 9, 16))
+    
+    with pytest.raises(ValueError):
+        DOUCacheManager().find_files("16/09/2024", None)
+
+
+async def test_space_limit_counts_the_search_index(add_edition):
+    zip_files = [add_edition(date(2024, 9, day), articles=150) for day in (16, 17, 18)]
+    await get_search_index().sync(zip_files)
+    manager = DOUCacheManager()
+    manager.reconcile()
+    manager.record_access(zip_files[-1:])
+    manager.config.max_cache_mb = 2
+    max_bytes = 2 * 1024 * 1024
+    
+    usage = manager.get_usage()
+    # Os ZIPs cabem no limite; o índice de busca não
+    assert usage["bytes"] - usage["index_bytes"] < max_bytes < usage["bytes"]
+    
+    removed = await manager.enforce_limits()
+    
+    assert removed["files"] == 2
+    assert [path.name for path in manager.find_files(None, None)] == ["2024-09-18-DO3.zip"]
+    assert list(get_search_index().get_segment_sizes()) == [str(zip_files[-1].absolute())]
+    assert manager.get_usage()["bytes"] <= max_bytes
+
+
+def _validated_hours_ago(manager: DOUCacheManager, zip_path, hours: float) -> None:
+    with manager._connection() as conn:
+        conn.execute(
+            "UPDATE files SET validated_at = ? WHERE path = ?",
+            (time.time() - hours * 3600, str(zip_path.absolute()))
+        )
+
+
+def test_only_recent_editions_are_revalidated(add_edition):
+    recent = add_edition(date.today() - timedelta(days=1))
+    old = add_edition(date(2024, 9, 16))
+    manager = DOUCacheManager()
+    manager.config.cache_ttl_hours = 24
+    manager.config.cache_revalidate_days = 3
+    for zip_path in (recent, old):
+        manager.record_download(zip_path)
+    
+    assert not manager.needs_revalidation(recent)
+    
+    for zip_path in (recent, old):
+        _validated_hours_ago(manager, zip_path, 25)
+    
+    assert manager.needs_revalidation(recent)
+    # Edições antigas não mudam mais: nunca geram requisições
+    assert not manager.needs_revalidation(old)
+    
+    manager.config.cache_ttl_hours = 0
+    assert not manager.needs_revalidation(recent)
+
+
+async def test_file_limit_evicts_least_recently_used(add_edition):
+    zip_files = [add_edition(date(2024, 9, day)) for day in (16, 17, 18)]
+    manager = DOUCacheManager()
+    for zip_path in zip_files:
+        manager.record_download(zip_path)
+    # A edição mais antiga foi a última consultada
+    manager.touch(zip_files[:1])
+    manager.config.max_cache_size = 2
+    
+    removed = await manager.enforce_limits()
+    
+    assert removed["files"] == 1
+    assert not zip_files[1].exists()
+    assert [path.name for path in manager.find_files(None, None)] == [
+        "2024-09-16-DO3.zip", "2024-09-18-DO3.zip"
+    ]
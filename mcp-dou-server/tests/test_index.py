@@ -0,0 +1,121 @@
+"""
+Semântica das buscas no índice invertido (src.tools.index).
+
+A busca é por palavras normalizadas (sem acentos nem maiúsculas), em
+sequência dentro de um mesmo campo, com a última palavra valendo como
+prefixo; o escopo é sempre o dos arquivos ZIP informados.
+"""
+
+import zipfile
+from datetime import date
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+from src.tools.index import get_search_index
+from src.tools.query import parse_query
+
+
+def _article_xml(article_id: int, pub_date: date, ementa: str, texto: str) -> str:
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        f'<xml><article id="{article_id}" name="Aviso {article_id}" pubName="DO3" '
+        f'artType="Aviso" pubDate="{pub_date:%d/%m/%Y}" artCategory="Ministério da Saúde">'
+        f"<body><Identifica><![CDATA[AVISO Nº {article_id}]]></Identifica>"
+        f"<Ementa><![CDATA[{ementa}]]></Ementa>"
+        f"<Texto><![CDATA[<p>{texto}</p>]]></Texto></body></article></xml>"
+    )
+
+
+@pytest.fixture
+def write_edition(dou_cache):
+    """Grava uma edição com matérias escritas à mão ({id: (ementa, texto)})."""
+    
+    def write(pub_date: date, articles: Dict[int, tuple]) -> Path:
+        zip_path = (
+            dou_cache / f"{pub_date:%Y}" / f"{pub_date:%m}" / f"{pub_date.isoformat()}-DO3.zip"
+        )
+        zip_path.parent.mkdir(parents=True, exist_ok=True)
+        with zipfile.ZipFile(zip_path, "w") as zip_file:
+            for article_id, (ementa, texto) in articles.items():
+                zip_file.writestr(
+                    f"{pub_date.isoformat()}-DO3-{article_id}.xml",
+                    _article_xml(article_id, pub_date, ementa, texto)
+                )
+        return zip_path
+    
+    return write
+
+
+@pytest.fixture
+async def edition(write_edition) -> List[Path]:
+    zip_files = [write_edition(date(2024, 9, 16), {
+        1: ("Dispensa de licitação", "Fica dispensada a licitação para aquisição de insumos."),
+        2: ("Citação por edital", "Citação do réu para apresentar defesa."),
+        3: ("Pregão eletrônico", "Licitação na modalidade pregão, dispensa não se aplica."),
+        4: ("Aviso de LICITAÇÃO", "Licitações abertas no período."),
+    })]
+    await get_search_index().sync(zip_files)
+    return zip_files
+
+
+def _ids(keys) -> List[str]:
+    return sorted(article.metadata.id for article in get_search_index().load_articles(keys))
+
+
+@pytest.mark.parametrize("query, expected", [
+    # Acentos e maiúsculas não diferenciam
+    ("licitação", ["1", "3", "4"]),
+    ("LICITACAO", ["1", "3", "4"]),
+    # A última palavra vale como prefixo
+    ("licit", ["1", "3", "4"]),
+    ("pregão eletr", ["3"]),
+    # Palavras inteiras: "citação" não casa com o meio de "licitação"
+    ("citação", ["2"]),
+    ("itação", []),
+    # Trecho: palavras consecutivas no mesmo campo
+    ("dispensa de licitação", ["1"]),
+    ("licitação dispensa", []),
+])
+async def test_find_candidates_semantics(edition, query, expected):
+    keys = get_search_index().find_candidates(query, edition)
+    
+    assert _ids(keys) == expected
+
+
+async def test_phrase_requires_same_field(write_edition):
+    # "licitação" termina a ementa e "aberta" começa o texto
+    zip_files = [write_edition(date(2024, 9, 16), {1: ("Aviso de licitação", "Aberta a sessão.")})]
+    await get_search_index().sync(zip_files)
+    
+    assert get_search_index().find_candidates("licitação aberta", zip_files) == []
+
+
+async def test_lookups_are_restricted_to_the_given_files(write_edition):
+    first = write_edition(date(2024, 9, 16), {1: ("Dispensa de licitação", "Texto.")})
+    second = write_edition(date(2024, 9, 17), {2: ("Dispensa de licitação", "Texto.")})
+    index = get_search_index()
+    await index.sync([first, second])
+    
+    assert _ids(index.find_candidates("licitação", [second])) == ["2"]
+    assert _ids(index.find_candidates("licit", [first])) == ["1"]
+    assert [key for key, _ in index.top_k("licitação", [second], 10)] == (
+        index.find_candidates("licitação", [second])
+    )
+    
+    results, details = index.execute_plan(parse_query('"dispensa de licitação"'), [first], 10)
+    assert details["matches"] == 1
+    assert _ids([key for key, _ in results]) == ["1"]
+
+
+
+@pytest.mark.parametrize("limit, expected", [(None, 4), (3, 3), (2, 2), (0, 0), (-1, 0)])
+async def test_filter_keys_limit_spans_files(write_edition, limit, expected):
+    zip_files = [
+        write_edition(date(2024, 9, 16), {1: ("Aviso", "Texto."), 2: ("Aviso", "Texto.")}),
+        write_edition(date(2024, 9, 17), {3: ("Aviso", "Texto."), 4: ("Aviso", "Texto.")}),
+    ]
+    await get_search_index().sync(zip_files)
+    
+    assert len(get_search_index().filter_keys(zip_files, limit=limit)) == expected
@@ -0,0 +1,79 @@
+"""
+Linguagem de consulta: do texto da busca ao plano avaliado pelo índice.
+
+A forma canônica (describe) também é a chave do cache de resultados, por
+isso consultas equivalentes devem produzir o mesmo plano.
+"""
+
+import pytest
+
+from src.tools.query import QuerySyntaxError, is_simple_query, parse_query, with_filters
+
+
+@pytest.mark.parametrize("query", ["receita federal", "Licitação nº 12/2024", "foo:bar", ""])
+def test_simple_queries(query):
+    assert is_simple_query(query)
+
+
+@pytest.mark.parametrize("query", [
+    '"dispensa de licitação"', "licitação AND pregão", "pregão -revogação",
+    "(a OR b)", "ementa:licitação", "data:2024-09",
+])
+def test_queries_with_operators_are_not_simple(query):
+    assert not is_simple_query(query)
+
+
+@pytest.mark.parametrize("query, plan", [
+    # Palavras soltas: trecho com a última palavra como prefixo
+    ("Receita Federal", '"receita federal"*'),
+    # Aspas: trecho exato
+    ('"Dispensa de Licitação"', '"dispensa de licitacao"'),
+    ("licitação AND pregão", '("licitacao"* AND "pregao"*)'),
+    ("licitação OR pregão", '("licitacao"* OR "pregao"*)'),
+    ("pregão -revogação", '("pregao"* AND NOT "revogacao"*)'),
+    ("pregão NOT revogação", '("pregao"* AND NOT "revogacao"*)'),
+    ("a (b OR c)", '("a"* AND ("b"* OR "c"*))'),
+    # Parêntese sem fechamento é tolerado
+    ("(a OR b", '("a"* OR "b"*)'),
+    # Campos de texto e de metadados
+    ('ementa:"Dispensa de Licitação"', 'ementa:"dispensa de licitacao"'),
+    ("orgao:(saúde OR educação)", '(orgao:"saude" OR orgao:"educacao")'),
+    ("tipo:Portaria", 'tipo:"portaria"'),
+    ("secao:1", 'secao:"do1"'),
+    (
+        "ementa:licitação AND (orgao:saúde OR orgao:educação) NOT tipo:extrato",
+        '(ementa:"licitacao"* AND (orgao:"saude" OR orgao:"educacao") AND NOT tipo:"extrato")',
+    ),
+])
+def test_parse_query(query, plan):
+    assert parse_query(query).describe() == plan
+
+
+@pytest.mark.parametrize("term, plan", [
+    ("data:2024-09-17", "data:[2024-09-17..2024-09-17]"),
+    ("data:17/09/2024", "data:[2024-09-17..2024-09-17]"),
+    ("data:2024-09", "data:[2024-09-01..2024-09-30]"),
+    ("data:2024-02", "data:[2024-02-01..2024-02-29]"),
+    ("data:2024", "data:[2024-01-01..2024-12-31]"),
+    ("data:2024-09-01..2024-09-30", "data:[2024-09-01..2024-09-30]"),
+    ("data:2024-09..", "data:[2024-09-01..*]"),
+    ("data:>=2024-09-01", "data:[2024-09-01..*]"),
+    ("data:>2024-09-30", "data:[2024-10-01..*]"),
+    ("data:<2024-10-01", "data:[*..2024-09-30]"),
+    ("data:<=2024-09", "data:[*..2024-09-30]"),
+])
+def test_date_terms(term, plan):
+    assert parse_query(term).describe() == plan
+
+
+@pytest.mark.parametrize("term", ["data:2024-13", "data:2024-02-30", "data:ontem"])
+def test_invalid_date_terms(term):
+    with pytest.raises(QuerySyntaxError, match="Data inválida"):
+        parse_query(term)
+
+
+def test_with_filters_adds_metadata_clauses():
+    plan = with_filters(parse_query("pregão"), "Portaria", "Saúde")
+    
+    assert plan.describe() == '("pregao"* AND tipo:"portaria" AND orgao:"saude")'
+    assert with_filters(None, "", None) is None
@@ -0,0 +1,123 @@
+"""
+Motor de busca: filtros de data e trechos exibidos nos resultados.
+
+O trecho deve ser localizado com a mesma normalização da busca (sem
+diferenciar maiúsculas, acentos e espaços), e não com str.lower().
+"""
+
+from datetime import date
+
+import pytest
+
+from src.tools.index import get_search_index
+from src.tools.query import highlight_terms, parse_query
+from src.tools.search import DOUSearchEngine, build_excerpt
+
+
+def test_excerpt_ignores_accents_and_case():
+    texto = "Fica autorizada a DISPENSA DE LICITAÇÃO para aquisição de insumos."
+    
+    assert build_excerpt(texto, ["dispensa de licitacao"], context=5) == (
+        "...da a DISPENSA DE LICITAÇÃO para..."
+    )
+
+
+def test_excerpt_maps_collapsed_spaces_back_to_original_text():
+    texto = "Art. 1º  Homologar\n\to   pregão eletrônico nº 10/2024."
+    
+    assert build_excerpt(texto, ["homologar o pregao"], context=0) == (
+        "...Homologar\n\to   pregão..."
+    )
+
+
+def test_excerpt_uses_earliest_term():
+    texto = "extrato de contrato; aditivo ao convênio"
+    
+    assert build_excerpt(texto, ["convenio", "contrato"], context=0) == "...contrato..."
+
+
+def test_excerpt_without_match():
+    assert build_excerpt("texto qualquer", ["licitacao"]) is None
+
+
+@pytest.mark.parametrize("query, terms", [
+    ('"dispensa de licitação" AND orgao:saúde', ["dispensa de licitacao"]),
+    ("pregão OR ementa:leilão -revogação", ["pregao"]),
+    ("texto:Contrato AND titulo:aditivo", ["contrato"]),
+    ("orgao:saúde data:2024-09", []),
+])
+def test_highlight_terms(query, terms):
+    assert highlight_terms(parse_query(query)) == terms
+
+
+async def test_search_accepts_non_padded_dates(add_edition):
+    add_edition(date(2024, 9, 16))
+    add_edition(date(2024, 9, 17))
+    engine = DOUSearchEngine()
+    
+    articles, stats = await engine.search_content("", start_date="2024-9-16", end_date="2024-9-16")
+    padded, _ = await engine.search_content("", start_date="2024-09-16", end_date="2024-09-16")
+    
+    assert 'error' not in stats
+    assert stats['files_searched'] == 1
+    assert articles and [a.metadata.id for a in articles] == [a.metadata.id for a in padded]
+    assert {a.metadata.pub_date for a in articles} == {"16/09/2024"}
+
+
+async def test_search_reports_invalid_dates(add_edition):
+    add_edition(date(2024, 9, 16))
+    
+    articles, stats = await DOUSearchEngine().search_content("", start_date="16/09/2024")
+    
+    assert articles == []
+    assert "Data inválida" in stats['error']
+
+
+@pytest.mark.parametrize("query", ["", "licitação", "licitação OR pregão"])
+async def test_search_clamps_non_positive_max_results(add_edition, query):
+    add_edition(date(2024, 9, 16))
+    add_edition(date(2024, 9, 17))
+    
+    articles, stats = await DOUSearchEngine().search_content(query, max_results=-1)
+    
+    assert 'error' not in stats
+    assert len(articles) == 1
+
+
+async def test_list_publications_rejects_invalid_date(add_edition):
+    add_edition(date(2024, 9, 16))
+    
+    with pytest.raises(ValueError):
+        await DOUSearchEngine().summarize_publications("16/09/2024")
+
+
+async def test_repeated_search_is_served_from_cache(add_edition):
+    add_edition(date(2024, 9, 16))
+    engine = DOUSearchEngine()
+    
+    first, stats = await engine.search_content("licitação")
+    again, cached = await engine.search_content("LICITACAO ")
+    
+    assert not stats['cache_hit'] and cached['cache_hit']
+    assert [a.metadata.id for a in again] == [a.metadata.id for a in first]
+
+
+async def test_new_files_invalidate_cached_results(add_edition, dou_cache):
+    add_edition(date(2024, 9, 16))
+    engine = DOUSearchEngine()
+    _, stats = await engine.search_content("", max_results=1000)
+    
+    # Arquivo copiado para o cache, sem passar pelo download
+    copied = add_edition(date(2024, 9, 17))
+    _, after_copy = await engine.search_content("", max_results=1000)
+    
+    assert not after_copy['cache_hit']
+    assert after_copy['files_searched'] == stats['files_searched'] + 1
+    
+    _, repeated = await engine.search_content("", max_results=1000)
+    assert repeated['cache_hit']
+    
+    # Remover um segmento muda a geração do índice
+    get_search_index().remove_zip(copied)
+    _, after_removal = await engine.search_content("", max_results=1000)
+    assert not after_removal['cache_hit']
@@ -0,0 +1,100 @@
+"""
+Paridade da conversão HTML -> texto (src.tools.text) com o BeautifulSoup.
+
+O caminho rápido de html_to_text deve produzir exatamente o mesmo texto
+que BeautifulSoup.get_text(separator=' ', strip=True); qualquer
+divergência altera o conteúdo indexado e os resultados de busca.
+"""
+
+import zipfile
+from datetime import date
+
+import pytest
+from lxml import etree
+
+from benchmarks.synthetic import generate_edition
+from src.tools.text import fold_text, fold_text_with_offsets, html_to_text, html_to_text_reference
+
+
+# Construções encontradas (ou possíveis) no HTML do elemento Texto
+PARITY_CASES = [
+    "",
+    "texto simples",
+    "<p>a &amp; b&nbsp;</p><p> c\n d </p>",
+    '<p class="identifica">PORTARIA Nº 1</p><p class="dou-paragraph">Art. 1º Fica...</p>',
+    "<table><tr><td colspan='2'>R$ 1.000,00</td></tr></table>",
+    'x<br/>y<br>z<img src="a.png"/>',
+    '<p title="a>b">t</p>',
+    "<P ALIGN=center>CAIXA ALTA</P>",
+    "<span\nstyle=\"x\">quebra</span>",
+    "<o:p></o:p>Word",
+    "&#150;&#233;&#x41;&lt;&gt;&quot;&copy;",
+    "&eacute sem ponto e vírgula",
+    "&desconhecida; entidade",
+    "a < b > c",
+    "<!-- comentário > --><p>x</p>",
+    "<script>var x = '<p>';</script><style>p{}</style>t",
+    "<![CDATA[zz]]>k",
+    "<!DOCTYPE html><html><body>w</body></html>",
+    "<?pi x?>q",
+    "<p>a</p  >b</x y='>'>",
+    "</3 c",
+    "\xa0  espaços \t\n",
+]
+
+
+@pytest.mark.parametrize("html_text", PARITY_CASES)
+def test_html_to_text_matches_beautifulsoup(html_text):
+    assert html_to_text(html_text) == html_to_text_reference(html_text)
+
+
+def test_html_to_text_matches_beautifulsoup_on_synthetic_edition(tmp_path):
+    zip_path = generate_edition(
+        tmp_path / "2024-09-17-DO3.zip", articles=200, pub_date=date(2024, 9, 17), table_ratio=0.3
+    )
+    with zipfile.ZipFile(zip_path) as zip_file:
+        textos = [
+            etree.fromstring(zip_file.read(name)).findtext(".//Texto") or ""
+            for name in zip_file.namelist()
+        ]
+    
+    mismatches = [
+        html_text for html_text in textos
+        if html_to_text(html_text) != html_to_text_reference(html_text)
+    ]
+    assert textos and not mismatches
+
+
+@pytest.mark.parametrize("text, folded", [
+    (None, ""),
+    ("Licitação", "licitacao"),
+    ("  PREGÃO\n\tELETRÔNICO ", "pregao eletronico"),
+    ("Ministério da Saúde", "ministerio da saude"),
+])
+def test_fold_text(text, folded):
+    assert fold_text(text) == folded
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    "  Dispensa   de LICITAÇÃO\n\tnº 12 ",
+    "Ação\xa0Civil Pública",
+    "coração decomposto: a\u0301gua",
+    "\u0301acento isolado",
+    "İstanbul ﬁm",
+])
+def test_fold_text_with_offsets_matches_fold_text(text):
+    folded, offsets = fold_text_with_offsets(text)
+    
+    assert folded == fold_text(text)
+    assert len(offsets) == len(folded)
+    assert offsets == sorted(offsets)
+    assert all(folded[i] == " " or not text[offset].isspace() for i, offset in enumerate(offsets))
+
+
+def test_fold_text_with_offsets_points_to_original_characters():
+    text = "Pregão  ELETRÔNICO"
+    folded, offsets = fold_text_with_offsets(text)
+    start = folded.find("eletronico")
+    
+    assert text[offsets[start]:offsets[start + len("eletronico") - 1] + 1] == "ELETRÔNICO"